@@ -28,7 +28,8 @@ SECRET_KEY = "django-insecure-qjgj-)=c88!*)$@8qbm7n4jc4#rsi1a_h@p8g8$g19oyq)q18-
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-ALLOWED_HOSTS = ["localhost", "backend", "0.0.0.0"]
+# "nginx" for requests made to the edge from inside the compose network, i.e. by benchmark_load.
+ALLOWED_HOSTS = ["localhost", "backend", "nginx", "0.0.0.0"]
 
 
 # Application definition
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     # Third Party Apps:
     "phonenumber_field",
     "rest_framework",
@@ -68,6 +70,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "payment.log.CorrelationIdMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -101,17 +104,55 @@ WSGI_APPLICATION = "app.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# https://docs.djangoproject.com/en/4.2/ref/databases/#persistent-connections
+#
+# DB_CONN_MAX_AGE keeps connections open across requests for that many
+# seconds (0 opens one per request, the development default, as runserver
+# starts a thread per request). Reused connections are health checked.
+# Keep it 0 under ASGI, which runs each sync view in a new thread, so that
+# persistent connections are never reused; pool with pgbouncer instead.
+# DB_PGBOUNCER makes connections safe behind pgbouncer in transaction
+# pooling mode, which cannot hold server-side cursors across transactions.
+
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 0))
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "").lower() in ("1", "true", "yes")
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "HOST": os.environ.get("DB_HOST"),
+        "PORT": os.environ.get("DB_PORT", ""),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": DB_CONN_MAX_AGE != 0,
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 10)),
+        },
+    }
+}
+
+
+# Cache
+# Local memory by default, which is per process; point CACHE_BACKEND/
+# CACHE_LOCATION to a shared backend (i.e. django.core.cache.backends.redis.
+# RedisCache, as docker-compose.prod.yml does) whenever several processes
+# serve requests, or invalidations only reach the process making them.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
+# Token authentication is cached only with a shared cache, as revoking a
+# token (logout, password reset, deactivation) must reach every process.
+AUTH_TOKEN_CACHE_ENABLED = os.environ.get(
+    "AUTH_TOKEN_CACHE_ENABLED", str(CACHES["default"]["BACKEND"] != "django.core.cache.backends.locmem.LocMemCache")
+).lower() in ("1", "true", "yes")
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -150,6 +191,29 @@ TIMEZONE = "America/Edmonton"
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = "static/"
+# Collected by `collectstatic`, and served by nginx in production.
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")
+# Name collected files by their content hash, so that nginx can cache them for good.
+STATIC_MANIFEST = os.environ.get("STATIC_MANIFEST", "").lower() in ("1", "true", "yes")
+
+# Uploaded images, served by nginx in production, and by runserver with DEBUG.
+MEDIA_URL = "media/"
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", BASE_DIR / "media")
+# Generate image renditions in a thread pool, rather than in the committing thread (see core.renditions).
+IMAGE_RENDITIONS_ASYNC = True
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+            if STATIC_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -164,7 +228,7 @@ AUTH_USER_MODEL = "user.User"
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "authentication.backends.CachedTokenAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "core.exceptions.django_error_handler",
@@ -229,11 +293,43 @@ CORS_ALLOWED_ORIGINS = [
 # Paypal
 PAYPAL_CLIENT_ID = os.environ.get("PAYPAL_CLIENT_ID")
 PAYPAL_SECRET_KEY = os.environ.get("PAYPAL_SECRET_KEY")
-PAYPAL_BASE_URL = os.environ.get("PAYPAL_BASE_URL")
+PAYPAL_BASE_URL = os.environ.get("PAYPAL_BASE_URL") or "https://api-m.sandbox.paypal.com"
 PAYPAL_MODE = os.environ.get("PAYPAL_MODE")
 PAYPAL_RECEIVER_EMAIL = ""
-PAYPAL_BASE_URL = "https://api-m.sandbox.paypal.com"
+# HTTP client, see payment.clients.PayPalClient
+PAYPAL_CONNECT_TIMEOUT = float(os.environ.get("PAYPAL_CONNECT_TIMEOUT", 5))
+PAYPAL_READ_TIMEOUT = float(os.environ.get("PAYPAL_READ_TIMEOUT", 30))
+PAYPAL_MAX_RETRIES = int(os.environ.get("PAYPAL_MAX_RETRIES", 2))
 
 # ---STRIPE
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY")
-STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "whsec_test_secret")
\ No newline at end of file
+STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "whsec_test_secret")
+# Logging
+# Payment logs are level gated by PAYMENT_LOG_LEVEL, tagged with the request's
+# correlation id, and written from a queue by a listener thread (see payment.log).
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "correlation_id": {"()": "payment.log.CorrelationIdFilter"},
+    },
+    "formatters": {
+        "payment": {
+            "format": "%(asctime)s %(levelname)s %(name)s correlation_id=%(correlation_id)s %(message)s",
+        },
+    },
+    "handlers": {
+        "payment_console": {
+            "class": "logging.StreamHandler",
+            "filters": ["correlation_id"],
+            "formatter": "payment",
+        },
+    },
+    "loggers": {
+        "payment": {
+            "handlers": ["payment_console"],
+            "level": os.environ.get("PAYMENT_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
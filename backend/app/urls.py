@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import (
@@ -30,6 +32,7 @@ urlpatterns = [
     path("api/", include("project.urls")),
     path("api/", include("campaign.urls")),
     path("api/", include("payment.urls")),
+    path("api/", include(("core.urls", "core"))),
     # DJANGO ADMIN:
     path("admin/", admin.site.urls),
     # DRF-SPECTACULAR:
@@ -46,3 +49,6 @@ urlpatterns = [
         name="redoc",
     ),
 ]
+
+# Uploaded images, with DEBUG only; nginx serves them in production.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
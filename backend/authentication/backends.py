@@ -0,0 +1,47 @@
+"""Authentication backends."""
+
+import hashlib
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core.cache import cache_get_or_set
+
+# Invalidated on logout, and whenever the user is saved, see authentication.signals.
+AUTH_TOKEN_CACHE = "auth_token"
+AUTH_TOKEN_CACHE_TIMEOUT = 60 * 5
+
+
+def auth_token_cache_key(key: str) -> str:
+    """Cache key of token, a digest so that keys are not stored in clear."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication, with tokens and their users cached for AUTH_TOKEN_CACHE_TIMEOUT.
+
+    Repeated requests with a token are authenticated without a query.
+    Hits and misses are reported under the "auth_token" namespace of
+    the cache stats. Off unless AUTH_TOKEN_CACHE_ENABLED, i.e. with a
+    per-process cache, which invalidations would not reach everywhere.
+    """
+
+    def authenticate_credentials(self, key):  # noqa
+        if not settings.AUTH_TOKEN_CACHE_ENABLED:
+            return super().authenticate_credentials(key)
+
+        # Invalid tokens and inactive users raise, and are not cached.
+        token = cache_get_or_set(
+            AUTH_TOKEN_CACHE,
+            auth_token_cache_key(key),
+            lambda: super(CachedTokenAuthentication, self).authenticate_credentials(key)[1],
+            timeout=AUTH_TOKEN_CACHE_TIMEOUT,
+        )
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
@@ -0,0 +1,12 @@
+"""Authentication services."""
+
+from typing import Iterable
+
+from core.cache import cache_invalidate
+
+from .backends import AUTH_TOKEN_CACHE, auth_token_cache_key
+
+
+def auth_tokens_invalidate(*, keys: Iterable[str]) -> None:
+    """Invalidate cached tokens, so that their next request is authenticated from the database."""
+    cache_invalidate(AUTH_TOKEN_CACHE, *(auth_token_cache_key(key) for key in keys))
@@ -0,0 +1,23 @@
+"""Authentication signals."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .services import auth_tokens_invalidate
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def auth_token_deleted(sender, instance, **kwargs):
+    """Invalidate token deleted, i.e. on logout."""
+    auth_tokens_invalidate(keys=[instance.key])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """Invalidate tokens of user saved, i.e. deactivated or with a new password."""
+    if not created:
+        auth_tokens_invalidate(keys=Token.objects.filter(user=instance).values_list("key", flat=True))
@@ -1 +1,92 @@
-# Create your tests here.
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from authentication.backends import AUTH_TOKEN_CACHE
+from authentication.models import PasswordResetToken
+from core.cache import cache_stats, cache_stats_reset
+
+User = get_user_model()
+
+
+@override_settings(AUTH_TOKEN_CACHE_ENABLED=True)
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="user@example.com", password="pass")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("rest_user_details")
+        cache_stats_reset()
+
+    def assertAuthenticated(self, expected=True):  # noqa
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK if expected else status.HTTP_401_UNAUTHORIZED)
+
+    def test_repeated_requests_are_authenticated_from_cache(self):
+        """Test only the first request with a token looks it up in the database."""
+        self.assertAuthenticated()
+
+        with self.assertNumQueries(0):
+            self.assertAuthenticated()
+
+        self.assertEqual(cache_stats()[AUTH_TOKEN_CACHE], {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_invalid_tokens_are_not_cached(self):
+        """Test unknown tokens are rejected on every request."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token unknown")
+
+        self.assertAuthenticated(False)
+        self.assertAuthenticated(False)
+        self.assertEqual(cache_stats()[AUTH_TOKEN_CACHE]["hits"], 0)
+
+    def test_logout_invalidates_token(self):
+        """Test a token is rejected once its user logged out."""
+        self.assertAuthenticated()
+
+        self.client.post(reverse("rest_logout"))
+
+        self.assertAuthenticated(False)
+
+    def test_deactivation_invalidates_token(self):
+        """Test a token is rejected once its user is deactivated."""
+        self.assertAuthenticated()
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertAuthenticated(False)
+
+    def test_password_reset_invalidates_token(self):
+        """Test a cached token is read again from the database after a password reset."""
+        self.assertAuthenticated()
+        reset_token = PasswordResetToken.objects.create(
+            user=self.user, token="reset", expires_at=timezone.now() + timedelta(minutes=15)
+        )
+
+        response = APIClient().post(
+            reverse("password_reset_confirm_custom"),
+            {"token": reset_token.token, "new_password1": "N3w-passw0rd!", "new_password2": "N3w-passw0rd!"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAuthenticated()
+        self.assertEqual(cache_stats()[AUTH_TOKEN_CACHE]["misses"], 2)
+
+    @override_settings(AUTH_TOKEN_CACHE_ENABLED=False)
+    def test_tokens_are_not_cached_when_disabled(self):
+        """Test tokens are looked up on every request without a shared cache."""
+        self.assertAuthenticated()
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        self.assertNotIn(AUTH_TOKEN_CACHE, cache_stats())
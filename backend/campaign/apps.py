@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CampaignConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "campaign"
+
+    def ready(self):
+        from core.renditions import renditions_register
+
+        from .models import Campaign
+
+        renditions_register(Campaign, "img")
@@ -2,12 +2,16 @@
 
 import django_filters
 
-from .models import Campaign, Comment
+from core.search import search
+
+from .models import CAMPAIGN_SEARCH_FIELDS, CAMPAIGN_SEARCH_VECTOR, Campaign, Comment
 
 
 class CampaignFilter(django_filters.FilterSet):
     """Campaign Filter."""
 
+    q = django_filters.CharFilter(method="filter_search")
+
     class Meta:  # noqa
         model = Campaign
         fields = (
@@ -20,6 +24,9 @@ class CampaignFilter(django_filters.FilterSet):
             "end_date",
         )
 
+    def filter_search(self, queryset, name, value):  # noqa
+        return search(queryset, value, vector=CAMPAIGN_SEARCH_VECTOR, fields=CAMPAIGN_SEARCH_FIELDS)
+
 
 class CommentFilter(django_filters.FilterSet):
     """Comment Filter."""
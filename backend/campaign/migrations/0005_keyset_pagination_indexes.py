@@ -0,0 +1,21 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0004_alter_campaign_options_alter_comment_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created', 'id'], name='comment_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['campaign', 'created', 'id'], name='comment_campaign_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:58
+
+from django.db import migrations
+
+from core.search import search_index, search_vector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        # PostgreSQL only, so not in the model's Meta.
+        search_index("campaign", "Campaign", "campaign_search_idx", search_vector(["title"], ["description"])),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0006_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='img_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='WebP thumbnails of img, by size (see core.renditions).'),
+        ),
+    ]
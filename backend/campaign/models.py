@@ -7,8 +7,14 @@ from djmoney.models.fields import MoneyField
 from djmoney.models.validators import MinMoneyValidator
 from model_utils.models import TimeStampedModel
 
+from core.search import search_vector
+
 User = get_user_model()
 
+# Full-text search of campaigns, see core.search; indexed by migration 0006_search_indexes.
+CAMPAIGN_SEARCH_FIELDS = ("title", "description")
+CAMPAIGN_SEARCH_VECTOR = search_vector(["title"], ["description"])
+
 
 # TODO:
 # what happens when Project is deleted?
@@ -37,6 +43,12 @@ class Campaign(TimeStampedModel):
         null=True,
         help_text="Optional main image representing the campaign.",
     )
+    img_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="WebP thumbnails of img, by size (see core.renditions).",
+    )
 
     def __str__(self):
         """Represent Campaign as string."""
@@ -88,3 +100,8 @@ class Comment(TimeStampedModel):
 
     class Meta:  # noqa
         ordering = ["-created"]
+        indexes = [
+            # Keyset pagination, see core.pagination.KeysetPagination.
+            models.Index(fields=["created", "id"], name="comment_created_id_idx"),
+            models.Index(fields=["campaign", "created", "id"], name="comment_campaign_created_idx"),
+        ]
@@ -2,28 +2,51 @@
 
 from typing import Optional
 
-from django.db.models import Sum
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 
 from campaign.filters import CampaignFilter
 from campaign.models import Campaign, Comment
 from core.services import Amount, to_money
 from core.utils import get_object
-from donation.models import Donation
+from donation.models import CampaignDonationSummary, Donation
 
 
-def campaign_get(campaign_id: int) -> Optional[Campaign]:
+def _campaign_queryset(*, annotate_donations: bool = False) -> QuerySet[Campaign]:
+    """
+    Campaign queryset.
+
+    With annotate_donations, every campaign is annotated with
+    `donations_count`, `donations_total` and `last_donation_at` from its
+    donation summary, in the same query as the campaign itself.
+    """
+    if not annotate_donations:
+        return Campaign.objects.select_related("donation_summary")
+
+    return Campaign.objects.select_related("project", "owner").annotate(
+        donations_count=Coalesce(F("donation_summary__donations_count"), Value(0)),
+        donations_total=Coalesce(
+            F("donation_summary__donations_total"),
+            Value(0),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+        last_donation_at=F("donation_summary__last_donation_at"),
+    )
+
+
+def campaign_get(campaign_id: int, *, annotate_donations: bool = False) -> Optional[Campaign]:
     """Retrieve campaign."""
-    c = get_object(Campaign, id=campaign_id)
+    c = get_object(_campaign_queryset(annotate_donations=annotate_donations), id=campaign_id)
 
     return c
 
 
 # TODO: filtering untested
-def campaign_list(*, filters=None) -> QuerySet[Campaign]:
+def campaign_list(*, filters=None, annotate_donations: bool = False) -> QuerySet[Campaign]:
     """Retrieve campaigns."""
     filters = filters or {}
-    qs = Campaign.objects.all()
+    qs = _campaign_queryset(annotate_donations=annotate_donations)
     return CampaignFilter(filters, qs).qs
 
 
@@ -32,11 +55,17 @@ def campaign_donations(campaign: Campaign) -> QuerySet[Donation]:
     return Donation.objects.filter(campaign=campaign)
 
 
+def campaign_donation_summary(campaign: Campaign) -> CampaignDonationSummary:
+    """Retrieve donation summary for a given Campaign, empty if it has no donations."""
+    try:
+        return campaign.donation_summary
+    except CampaignDonationSummary.DoesNotExist:
+        return CampaignDonationSummary(campaign=campaign)
+
+
 def campaign_donations_total(campaign: Campaign) -> Amount:
     """Total donations for campaign."""
-    total = campaign_donations(campaign).aggregate(total=Sum("amount"))["total"] or 0
-
-    return to_money(total)
+    return to_money(campaign_donation_summary(campaign).donations_total)
 
 
 def campaign_comments(
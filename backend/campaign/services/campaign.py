@@ -8,7 +8,9 @@ from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 
 from campaign.models import Campaign
+from core.conditional import CATALOG_CAMPAIGNS, catalog_invalidate
 from core.services import Amount, model_update, to_money
+from donation.services import project_donation_summary_refresh
 from project.models import Project
 
 User = get_user_model()
@@ -40,6 +42,8 @@ def campaign_create(
     campaign.full_clean()
     campaign.save()
 
+    catalog_invalidate(CATALOG_CAMPAIGNS)
+
     return campaign
 
 
@@ -56,6 +60,25 @@ def campaign_update(*, campaign: Campaign, data) -> Campaign:
         "img",
     ]
 
+    previous_project = campaign.project
+
     c, has_updated = model_update(instance=campaign, fields=non_side_effect_fields, data=data)
 
+    if c.project_id != previous_project.pk:
+        project_donation_summary_refresh(project=previous_project)
+        project_donation_summary_refresh(project=c.project)
+
+    if has_updated:
+        catalog_invalidate(CATALOG_CAMPAIGNS)
+
     return c
+
+
+@transaction.atomic
+def campaign_delete(*, campaign: Campaign) -> None:
+    """Delete Campaign, along with its donations."""
+    project = campaign.project
+    campaign.delete()
+
+    project_donation_summary_refresh(project=project)
+    catalog_invalidate(CATALOG_CAMPAIGNS)
@@ -1,6 +1,7 @@
 """Test Campaign & Comment JSON API."""
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.timezone import now
 from djmoney.money import Money
@@ -9,6 +10,7 @@ from rest_framework.test import APITestCase
 
 from campaign.models import Campaign, Comment
 from campaign.services import campaign_create, comment_create
+from donation.services import donation_create
 from project.services import project_create
 
 User = get_user_model()
@@ -19,6 +21,7 @@ class CampaignAPITestCase(APITestCase):
 
     def setUp(self):
         """Set up test data."""
+        cache.clear()
         self.user = User.objects.create_user(email="user@example.com", password="password123")
         self.client.force_authenticate(user=self.user)
 
@@ -96,9 +99,67 @@ class CampaignAPITestCase(APITestCase):
         response = self.client.get(reverse("campaigns:list-create"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertGreaterEqual(len(response.data), 1)
-        self.assertIn("title", response.data[0])
+        self.assertEqual(response.data["count"], 1)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
+        self.assertIn("title", response.data["results"][0])
+
+    def test_get_campaign_list_search(self):
+        """Test full-text search of campaigns, best match first."""
+        owner = User.objects.create_user(email="owner@example.com", password="password123")
+        campaign_create(
+            title="Electric Buses",
+            description="Replace buses running on diesel.",
+            project=self.project,
+            owner=owner,
+            target=Money(5000, "USD"),
+        )
+
+        response = self.client.get(reverse("campaigns:list-create"), {"q": "buses"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [campaign["title"] for campaign in response.data["results"]],
+            ["Electric Buses", "Eco Buses"],
+        )
+        self.assertEqual(self.client.get(reverse("campaigns:list-create"), {"q": "trains"}).data["count"], 0)
+
+    def test_get_campaign_list_donations(self):
+        """Test campaign list reports donations of each campaign."""
+        donation_create(donor=self.user, amount=Money(30, "USD"), campaign=self.campaign)
+        donation_create(donor=self.user, amount=Money(20, "USD"), campaign=self.campaign)
+
+        response = self.client.get(reverse("campaigns:list-create"))
+
+        campaign = response.data["results"][0]
+        self.assertEqual(campaign["donations_count"], 2)
+        self.assertEqual(campaign["donations_total"], {"amount": "50.00", "currency": "USD"})
+        self.assertIsNotNone(campaign["last_donation_at"])
+
+    def test_get_campaign_list_query_count(self):
+        """Test campaign list runs a constant number of queries."""
+        for i in range(5):
+            owner = User.objects.create_user(email=f"owner{i}@example.com", password="password123")
+            project = project_create(
+                name=f"Project {i}",
+                target=Money(1000, "USD"),
+                city="City",
+                country="Country",
+            )
+            campaign = campaign_create(
+                title=f"Campaign {i}",
+                description="Campaign",
+                project=project,
+                owner=owner,
+                target=Money(500, "USD"),
+            )
+            donation_create(donor=self.user, amount=Money(10, "USD"), campaign=campaign)
+
+        # catalog validators of campaigns and donations + count + page
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("campaigns:list-create"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 6)
 
     def test_get_campaign_detail(self):
         """Test retrieving a campaign by ID."""
@@ -203,9 +264,9 @@ class CommentAPITestCase(APITestCase):
         response = self.client.get(reverse("comments:list-create"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertGreaterEqual(len(response.data), 1)
-        self.assertIn("content", response.data[0])
+        self.assertIsInstance(response.data["results"], list)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
+        self.assertIn("content", response.data["results"][0])
 
     def test_get_comment_detail(self):
         """Test retrieving a comment by ID."""
@@ -277,9 +338,9 @@ class CampaignCommentsAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Ensure both comments are returned
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
         self.assertCountEqual(
-            map(lambda p: p["content"], response.data),
+            map(lambda p: p["content"], response.data["results"]),
             ["Great campaign!", "I support this initiative!"],
         )
 
@@ -3,7 +3,7 @@
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, extend_schema_serializer
-from rest_framework import permissions, serializers, status
+from rest_framework import permissions, serializers
 from rest_framework.decorators import api_view
 from rest_framework.generics import (
     ListCreateAPIView,
@@ -19,7 +19,6 @@ from campaign.selectors import (
     campaign_donations as campaign_donations_get,
 )
 from campaign.selectors import (
-    campaign_donations_total,
     campaign_get,
     campaign_list,
     comment_get,
@@ -27,10 +26,16 @@ from campaign.selectors import (
 )
 from campaign.services import (
     campaign_create,
+    campaign_delete,
     campaign_update,
     comment_create,
     comment_update,
 )
+from core.conditional import CATALOG_CAMPAIGNS, catalog_response
+from core.pagination import KeysetPagination, LimitOffsetPagination, get_paginated_response
+from core.services import to_money
+from donation.models import CampaignDonationSummary
+from donation.selectors import donation_summary_list
 
 from .serializers import DonationSerializer
 
@@ -63,8 +68,9 @@ class CampaignListCreateAPI(ListCreateAPIView):
     class CampaignOutputSerializer(serializers.ModelSerializer):
         """Campaign List Create Output Serializer."""
 
-        donations_count = serializers.SerializerMethodField()
+        donations_count = serializers.IntegerField(read_only=True)
         donations_total = serializers.SerializerMethodField()
+        last_donation_at = serializers.DateTimeField(read_only=True)
 
         class Meta:  # noqa
             model = Campaign
@@ -77,15 +83,25 @@ class CampaignListCreateAPI(ListCreateAPIView):
                 "end_date",
                 "donations_count",
                 "donations_total",
+                "last_donation_at",
             )
 
-        def get_donations_count(self, campaign):  # noqa
-            return campaign_donations_get(campaign).count()
-
         def get_donations_total(self, campaign):  # noqa
-            total = campaign_donations_total(campaign)
+            total = to_money(campaign.donations_total)
             return {"amount": str(total.amount), "currency": str(total.currency)}
 
+    class CampaignFilterSerializer(serializers.Serializer):  # noqa
+        q = serializers.CharField(
+            max_length=200,
+            required=False,
+            help_text="Full-text search of title and description, best match first.",
+        )
+
+    class Pagination(LimitOffsetPagination):  # noqa
+        pass
+
+    pagination_class = Pagination
+
     def get_permissions(self):
         """Get permissions by action."""
         return [permissions.AllowAny()]
@@ -96,6 +112,29 @@ class CampaignListCreateAPI(ListCreateAPIView):
             return self.CampaignInputSerializer
         return self.CampaignOutputSerializer
 
+    @extend_schema(parameters=[CampaignFilterSerializer])
+    def get(self, request, *args, **kwargs):  # noqa
+        filters_serializer = self.CampaignFilterSerializer(data=request.query_params)
+        filters_serializer.is_valid(raise_exception=True)
+
+        campaigns = campaign_list(filters=filters_serializer.validated_data, annotate_donations=True)
+
+        # Campaigns show their donations, so those are part of the catalog.
+        return catalog_response(
+            request,
+            catalog=CATALOG_CAMPAIGNS,
+            querysets=[Campaign.objects.all(), donation_summary_list(CampaignDonationSummary)],
+            data=lambda: (
+                get_paginated_response(
+                    pagination_class=self.pagination_class,
+                    serializer_class=self.CampaignOutputSerializer,
+                    queryset=campaigns,
+                    request=request,
+                    view=self,
+                ).data
+            ),
+        )
+
 
 @extend_schema_serializer(component_name="CampaignRetrieveUpdateDestroy")
 class CampaignRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
@@ -112,7 +151,7 @@ class CampaignRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
 
     @extend_schema(responses={200: CampaignListCreateAPI.CampaignOutputSerializer})
     def get(self, request, campaign_id):  # noqa
-        campaign = campaign_get(campaign_id)
+        campaign = campaign_get(campaign_id, annotate_donations=True)
 
         if not campaign:
             raise Http404
@@ -121,6 +160,9 @@ class CampaignRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
 
         return Response(data)
 
+    def perform_destroy(self, instance):  # noqa
+        campaign_delete(campaign=instance)
+
 
 @extend_schema_serializer(component_name="CommentListCreate")
 class CommentListCreateAPI(ListCreateAPIView):
@@ -161,6 +203,8 @@ class CommentListCreateAPI(ListCreateAPIView):
                 "created",
             )
 
+    pagination_class = KeysetPagination
+
     def get_permissions(self):
         """Get permissions by action."""
         return [permissions.AllowAny()]
@@ -210,11 +254,14 @@ class CommentRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
 def campaign_comments(request, campaign_id) -> Response:
     """Retrieve comments of campaign by campaign-id."""
     campaign = get_object_or_404(Campaign, id=campaign_id)
-    serializer = CommentListCreateAPI.CommentOutputSerializer(
-        campaign_comments_get(campaign),
-        many=True,
+
+    return get_paginated_response(
+        pagination_class=KeysetPagination,
+        serializer_class=CommentListCreateAPI.CommentOutputSerializer,
+        queryset=campaign_comments_get(campaign),
+        request=request,
+        view=None,
     )
-    return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @extend_schema(responses={200: DonationSerializer(many=True)})
@@ -222,8 +269,11 @@ def campaign_comments(request, campaign_id) -> Response:
 def campaign_donations(request, campaign_id) -> Response:
     """Retrieve donations of campaign by campaign-id."""
     campaign = get_object_or_404(Campaign, id=campaign_id)
-    serializer = DonationSerializer(
-        campaign_donations_get(campaign),
-        many=True,
+
+    return get_paginated_response(
+        pagination_class=KeysetPagination,
+        serializer_class=DonationSerializer,
+        queryset=campaign_donations_get(campaign),
+        request=request,
+        view=None,
     )
-    return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,428 @@
+"""
+Core benchmark.
+
+Seed datasets of increasing size, call every public GET endpoint under
+`/api/` and record query count, wall time and response size.
+
+An endpoint whose query count changes with the size of the dataset has
+an N+1 regression.
+
+Also measure throughput of an endpoint with and without persistent
+database connections, the cost of payment logging to callers, and
+latency percentiles of a running server under increasing concurrency.
+"""
+
+import contextlib
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from wsgiref.util import setup_testing_defaults
+
+import requests
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from djmoney.money import Money
+
+from campaign.models import Campaign, Comment
+from core.conditional import CATALOGS, catalog_invalidate
+from donation.models import Donation
+from donation.services import donation_summaries_rebuild
+from payment.log import queue_handlers
+from project.models import Cause, Project, ProjectAssignment
+from user.models import UserGroup
+
+User = get_user_model()
+
+BENCHMARK_SIZES = [10, 1_000, 100_000]
+
+# Main read endpoints, and concurrency levels, of the load test.
+LOAD_PATHS = [
+    "/api/projects/",
+    "/api/campaigns/",
+    "/api/causes/",
+    "/api/donations/",
+]
+LOAD_CONCURRENCY = [1, 4, 16, 64]
+
+# Endpoints that call external gateways, need credentials, or describe the API itself.
+EXCLUDED_PREFIXES = (
+    "/api/auth/",
+    "/api/cache/",
+    "/api/schema/",
+    "/api/paypal/",
+    "/api/stripe/",
+)
+
+URL_KWARG_MODELS = {
+    "project_id": Project,
+    "campaign_id": Campaign,
+    "cause_id": Cause,
+    "comment_id": Comment,
+    "donation_id": Donation,
+}
+
+
+def benchmark_seed(*, donations: int, batch_size: int = 1000) -> None:
+    """
+    Seed a dataset scaled by its number of donations.
+
+    Projects, campaigns, causes, donors, comments and beneficiaries grow
+    with the square root of the number of donations.
+    """
+    scale = max(2, math.isqrt(donations))
+
+    causes = Cause.objects.bulk_create(
+        [Cause(name=f"benchmark cause {i}") for i in range(scale)],
+        batch_size=batch_size,
+    )
+    projects = Project.objects.bulk_create(
+        [
+            Project(
+                name=f"Benchmark Project {i}",
+                target=Money(Decimal(10_000), "USD"),
+                city="Kampala",
+                country="Uganda",
+                status=Project.StatusChoices.ACTIVE,
+            )
+            for i in range(scale)
+        ],
+        batch_size=batch_size,
+    )
+    Project.causes.through.objects.bulk_create(
+        [
+            Project.causes.through(project_id=project.pk, cause_id=causes[(i + offset) % scale].pk)
+            for i, project in enumerate(projects)
+            for offset in range(2)
+        ],
+        batch_size=batch_size,
+    )
+
+    users = User.objects.bulk_create(
+        [User(email=f"benchmark{i}@example.com", password="!") for i in range(scale * 2)],
+        batch_size=batch_size,
+    )
+    groups = UserGroup.objects.bulk_create(
+        [UserGroup(name=f"Benchmark Group {i}") for i in range(scale)],
+        batch_size=batch_size,
+    )
+
+    campaigns = Campaign.objects.bulk_create(
+        [
+            Campaign(
+                title=f"Benchmark Campaign {i}",
+                description="Benchmark campaign.",
+                target=Money(Decimal(5_000), "USD"),
+                project=projects[i % scale],
+                owner=users[i],
+            )
+            for i in range(scale * 2)
+        ],
+        batch_size=batch_size,
+    )
+
+    Donation.objects.bulk_create(
+        [
+            Donation(
+                donor=users[i % len(users)],
+                amount=Money(Decimal(10 + i % 90), "USD"),
+                campaign=campaigns[i % len(campaigns)],
+            )
+            for i in range(donations)
+        ],
+        batch_size=batch_size,
+    )
+    donation_summaries_rebuild()
+
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                content=f"Benchmark comment {i}",
+                campaign=campaigns[i % len(campaigns)],
+                author=users[i % len(users)],
+            )
+            for i in range(scale * 2)
+        ],
+        batch_size=batch_size,
+    )
+
+    ProjectAssignment.objects.bulk_create(
+        [
+            ProjectAssignment(
+                project=project,
+                assignable_type="User" if i % 2 else "UserGroup",
+                assignable_id=users[i].pk if i % 2 else groups[i].pk,
+            )
+            for project in projects
+            for i in range(max(2, scale // 2))
+        ],
+        batch_size=batch_size,
+    )
+
+
+def _url_patterns(resolver: URLResolver, prefix: str = "") -> Iterable[tuple]:
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(pattern, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def _view_allows_get(pattern: URLPattern) -> bool:
+    view_class = getattr(pattern.callback, "cls", None) or getattr(pattern.callback, "view_class", None)
+    return view_class is not None and hasattr(view_class, "get")
+
+
+def benchmark_endpoints() -> List[str]:
+    """Resolve every public GET endpoint under `/api/` to a concrete path."""
+    endpoints = []
+
+    for route, pattern in _url_patterns(get_resolver()):
+        path = "/" + route
+
+        if not path.startswith("/api/") or path.startswith(EXCLUDED_PREFIXES):
+            continue
+
+        if not _view_allows_get(pattern):
+            continue
+
+        for kwarg, model in URL_KWARG_MODELS.items():
+            placeholder = f"<int:{kwarg}>"
+            if placeholder in path:
+                instance = model.objects.order_by("pk").first()
+                path = path.replace(placeholder, str(instance.pk if instance else 0))
+
+        if "<" in path:
+            continue
+
+        endpoints.append(path)
+
+    return endpoints
+
+
+def benchmark_endpoint(client: Client, path: str) -> Dict[str, Any]:
+    """Call endpoint and record its query count, wall time and response size."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "endpoint": path,
+        "status": response.status_code,
+        "queries": len(queries),
+        "time_ms": round(elapsed * 1000, 3),
+        "bytes": len(response.content),
+    }
+
+
+def benchmark_run(*, sizes: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Benchmark every endpoint against datasets of given sizes.
+
+    Every dataset is seeded in a transaction which is rolled back afterwards.
+    Catalogs are invalidated for every dataset, so that their lists are
+    queried rather than served from the cache of another dataset.
+    """
+    sizes = sizes or BENCHMARK_SIZES
+    client = Client(HTTP_HOST="localhost")
+    results = []
+
+    for size in sizes:
+        with transaction.atomic():
+            benchmark_seed(donations=size)
+            catalog_invalidate(*CATALOGS)
+
+            for path in benchmark_endpoints():
+                results.append({"donations": size, **benchmark_endpoint(client, path)})
+
+            transaction.set_rollback(True)
+
+    # Lists of the rolled back datasets are not served either.
+    catalog_invalidate(*CATALOGS)
+
+    return results
+
+
+def benchmark_regressions(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Endpoints whose query count changes with the size of the dataset."""
+    endpoint_queries: Dict[str, Dict[int, int]] = {}
+
+    for result in results:
+        endpoint = _endpoint_route(result["endpoint"])
+        endpoint_queries.setdefault(endpoint, {})[result["donations"]] = result["queries"]
+
+    return [
+        {"endpoint": endpoint, "queries": queries}
+        for endpoint, queries in endpoint_queries.items()
+        if len(set(queries.values())) > 1
+    ]
+
+
+def _endpoint_route(path: str) -> str:
+    """Replace ids in path, so that endpoints compare across datasets."""
+    return "/".join("<id>" if part.isdigit() else part for part in path.split("/"))
+
+
+def benchmark_throughput(
+    path: str,
+    *,
+    requests: int,
+    conn_max_age: int,
+    health_checks: bool = True,
+) -> Dict[str, Any]:
+    """
+    Requests per second of GET path, served one after another by Django's WSGI handler.
+
+    Unlike the test client, the WSGI handler closes database connections
+    at the end of requests as per CONN_MAX_AGE, as an application server does.
+    Must run outside of a transaction.
+    """
+    db = connections[DEFAULT_DB_ALIAS]
+    previous = {key: db.settings_dict[key] for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+    db.settings_dict.update(CONN_MAX_AGE=conn_max_age, CONN_HEALTH_CHECKS=health_checks)
+    db.close()
+
+    handler = WSGIHandler()
+    opened = []
+    statuses = set()
+
+    def count_connection(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    def start_response(status, headers, exc_info=None):
+        statuses.add(int(status.split()[0]))
+
+    connection_created.connect(count_connection)
+
+    try:
+        start = time.perf_counter()
+
+        for _ in range(requests):
+            environ = {"PATH_INFO": path, "HTTP_HOST": "localhost"}
+            setup_testing_defaults(environ)
+
+            response = handler(environ, start_response)
+            b"".join(response)
+            response.close()
+
+        elapsed = time.perf_counter() - start
+    finally:
+        connection_created.disconnect(count_connection)
+        db.settings_dict.update(previous)
+        db.close()
+
+    return {
+        "endpoint": path,
+        "conn_max_age": conn_max_age,
+        "health_checks": health_checks,
+        "requests": requests,
+        "statuses": sorted(statuses),
+        "connections": len(opened),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def benchmark_payment_logging(*, calls: int, stream) -> List[Dict[str, Any]]:
+    """
+    Seconds per call spent logging a Stripe payment creation, as seen by the caller.
+
+    "print" is the former path: debug prints and eagerly formatted logs,
+    written synchronously to stream. "queue" is the payment logger's: lazy
+    formatting, debug gated off by level, and records written to stream by
+    a listener thread. Pass an unbuffered stream, as stdout is in containers.
+    """
+    payer, amount, payment_intent_id = "user@example.com", Decimal("20.00"), "pi_3Nf0benchmark"
+
+    def print_path(logger):
+        with contextlib.redirect_stdout(stream):
+            print(f"DEBUG: payer type: {type(payer)}, payer: {payer}")
+            print(f"DEBUG: amount type: {type(amount)}, amount: {amount}")
+            print(f"DEBUG: Stripe PaymentIntent created successfully: {payment_intent_id}")
+        logger.info(f"Starting Stripe payment process: amount={amount}, currency=usd")
+        logger.info(f"Stripe PaymentIntent criado: id={payment_intent_id}, amount={amount}, currency=usd, user={payer}")
+
+    def queue_path(logger):
+        logger.debug("Stripe PaymentIntent %s created for user %s.", payment_intent_id, payer)
+        logger.info(
+            "Stripe PaymentIntent created: id=%s amount=%s currency=%s user=%s", payment_intent_id, amount, "usd", payer
+        )
+
+    results = []
+    for name, log in (("print", print_path), ("queue", queue_path)):
+        logger = logging.getLogger(f"benchmark.payment.{name}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(logging.StreamHandler(stream))
+        listener = queue_handlers(logger) if name == "queue" else None
+
+        try:
+            start = time.perf_counter()
+            for _ in range(calls):
+                log(logger)
+            elapsed = time.perf_counter() - start
+        finally:
+            if listener:
+                listener.stop()
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+
+        results.append(
+            {"path": name, "calls": calls, "seconds": round(elapsed, 3), "us_per_call": round(elapsed / calls * 1e6, 2)}
+        )
+
+    return results
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def benchmark_load(base_url: str, path: str, *, concurrency: int, requests_count: int) -> Dict[str, Any]:
+    """
+    Latency percentiles of GET path on a running server, with `concurrency` clients.
+
+    Every client keeps its connection alive, as a browser or nginx does.
+    Behind nginx, responses are counted by X-Cache-Status (HIT, MISS, ...).
+    """
+    local = threading.local()
+    url = base_url.rstrip("/") + path
+
+    def request(_) -> tuple:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+
+        start = time.perf_counter()
+        try:
+            response = local.session.get(url, timeout=60)
+            status, cache_status = response.status_code, response.headers.get("X-Cache-Status")
+        except requests.RequestException:
+            status, cache_status = 0, None
+        return time.perf_counter() - start, status, cache_status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(request, range(requests_count)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in results)
+    return {
+        "endpoint": path,
+        "concurrency": concurrency,
+        "requests": requests_count,
+        "errors": sum(1 for _, status, _ in results if not 200 <= status < 400),
+        "cache": dict(Counter(cache_status for _, _, cache_status in results if cache_status)),
+        "requests_per_second": round(requests_count / elapsed, 1),
+        **{f"p{percent}_ms": round(_percentile(latencies, percent) * 1000, 1) for percent in (50, 95, 99)},
+    }
@@ -0,0 +1,120 @@
+"""
+Core cache.
+
+Thin layer over Django's cache framework, which namespaces keys and
+counts hits and misses per namespace so that caches can be sized.
+
+Every key has a version, cached next to its value, and values are cached
+along with the version they were computed under. Invalidating a key
+deletes its version, so that a value computed from rows read before a
+write commits, and cached after it, is never served.
+
+The backend is configured with `CACHES` (local memory by default).
+Counters are kept in process, i.e. they are per worker.
+"""
+
+import threading
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+_stats_lock = threading.Lock()
+_hits: Counter = Counter()
+_misses: Counter = Counter()
+
+
+def cache_key(namespace: str, key: Hashable) -> str:
+    """Key of value in namespace."""
+    return f"{namespace}:{key}"
+
+
+def cache_get_or_set(namespace: str, key: Hashable, default: Callable[[], T], timeout=DEFAULT_TIMEOUT) -> T:
+    """
+    Retrieve cached value, or compute it with `default` and cache it.
+
+    Records a hit or a miss for namespace. `timeout` defaults to the
+    backend's, None caches forever.
+    """
+    full_key = cache_key(namespace, key)
+    version_key = _version_key(full_key)
+    cached = cache.get_many([full_key, version_key])
+    version = cached.get(version_key)
+    versioned = cached.get(full_key, _MISSING)
+    hit = version is not None and versioned is not _MISSING and versioned[0] == version
+
+    with _stats_lock:
+        if hit:
+            _hits[namespace] += 1
+        else:
+            _misses[namespace] += 1
+
+    if hit:
+        return versioned[1]
+
+    if version is None:
+        version = _version_new()
+        # Another process may have started a version meanwhile, which wins.
+        if not cache.add(version_key, version, timeout):
+            version = cache.get(version_key, version)
+
+    # The version is read before computing, so that a value read before an invalidation is cached under a stale one.
+    value = default()
+    cache.set(full_key, (version, value), timeout)
+
+    return value
+
+
+def cache_invalidate(namespace: str, *keys: Hashable) -> None:
+    """
+    Delete cached values of keys in namespace, along with their versions.
+
+    Values are deleted now, and again once the current transaction
+    commits. The next read starts a new version, so that a concurrent read
+    cannot serve a value from before the commit, even if it caches it after.
+    """
+    full_keys = [cache_key(namespace, key) for key in keys]
+    full_keys += [_version_key(full_key) for full_key in full_keys]
+
+    if not full_keys:
+        return
+
+    cache.delete_many(full_keys)
+    transaction.on_commit(lambda: cache.delete_many(full_keys))
+
+
+def _version_key(full_key: str) -> str:
+    return f"{full_key}:version"
+
+
+def _version_new() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hits, misses and hit ratio per namespace, since start or last reset."""
+    with _stats_lock:
+        namespaces = sorted(set(_hits) | set(_misses))
+
+        return {
+            namespace: {
+                "hits": _hits[namespace],
+                "misses": _misses[namespace],
+                "hit_ratio": round(_hits[namespace] / (_hits[namespace] + _misses[namespace]), 4),
+            }
+            for namespace in namespaces
+        }
+
+
+def cache_stats_reset() -> None:
+    """Reset hit and miss counters."""
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
@@ -0,0 +1,111 @@
+"""
+Core conditional responses.
+
+Public catalog lists (causes, projects, campaigns) are the same for every
+visitor. Their data is cached per URL, and served with an ETag and a
+Last-Modified computed from the rows they are made of, so that a client
+revalidating its copy gets a 304 without the list being queried or
+serialized.
+
+Each catalog has a version, part of its cache keys and ETags. Services
+writing to a catalog call `catalog_invalidate`, which starts a new
+version. Writes bypassing services, i.e. from the admin, show within
+CATALOG_CACHE_TIMEOUT.
+
+Browsers revalidate every time; shared caches (the nginx micro-cache)
+may serve a response for CATALOG_EDGE_MAX_AGE seconds before they do.
+
+Usage:
+return catalog_response(request, catalog=CATALOG_CAUSES, querysets=[Cause.objects.all()], data=lambda: ...)
+"""
+
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from core.cache import cache_get_or_set, cache_invalidate
+
+CATALOG_CACHE = "catalog"
+CATALOG_CACHE_TIMEOUT = 5 * 60
+CATALOG_EDGE_MAX_AGE = 5
+
+CATALOG_CAUSES = "causes"
+CATALOG_PROJECTS = "projects"
+CATALOG_CAMPAIGNS = "campaigns"
+CATALOGS = (CATALOG_CAUSES, CATALOG_PROJECTS, CATALOG_CAMPAIGNS)
+
+
+def catalog_version(catalog: str) -> str:
+    """Current version of catalog, a new one once invalidated or expired."""
+    return cache_get_or_set(CATALOG_CACHE, f"{catalog}:version", lambda: uuid.uuid4().hex, CATALOG_CACHE_TIMEOUT)
+
+
+def catalog_invalidate(*catalogs: str) -> None:
+    """Start new versions of catalogs, after they are written to."""
+    cache_invalidate(CATALOG_CACHE, *(f"{catalog}:version" for catalog in catalogs))
+
+
+def catalog_validators(catalog: str, version: str, querysets: Iterable[QuerySet]) -> Tuple[str, Optional[datetime]]:
+    """
+    Fingerprint and last modification of catalog version, cached.
+
+    Both are computed from the count and latest `modified` of the rows of
+    querysets, so that deleted rows change the fingerprint too. They are
+    aggregated on every new version, i.e. after every donation, so pass
+    small tables (donation summaries, not donations).
+    """
+
+    def compute():
+        parts, last_modified = [version], None
+
+        for queryset in querysets:
+            aggregate = queryset.order_by().aggregate(count=Count("pk"), latest=Max("modified"))
+            parts.append(f"{aggregate['count']}:{aggregate['latest'] and aggregate['latest'].isoformat()}")
+
+            if aggregate["latest"] and (last_modified is None or aggregate["latest"] > last_modified):
+                last_modified = aggregate["latest"]
+
+        return "|".join(parts), last_modified
+
+    return cache_get_or_set(CATALOG_CACHE, f"{catalog}:{version}:validators", compute, CATALOG_CACHE_TIMEOUT)
+
+
+def catalog_response(
+    request: HttpRequest, *, catalog: str, querysets: Iterable[QuerySet], data: Callable[[], Any]
+) -> HttpResponseBase:
+    """
+    Response of a catalog list, with its ETag and Last-Modified.
+
+    Answers 304 when the client's copy (If-None-Match, If-Modified-Since)
+    is current. Otherwise the data of the URL is cached, computed by
+    `data` on a miss.
+    """
+    version = catalog_version(catalog)
+    fingerprint, last_modified = catalog_validators(catalog, version, querysets)
+    url = request.build_absolute_uri()
+    # Representations differ by format (i.e. JSON or the browsable API), and so do their tags.
+    etag = hashlib.sha256(f"{fingerprint}|{request.accepted_renderer.format}|{url}".encode()).hexdigest()[:32]
+    etag = f'"{etag}"'
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    if response is None:
+        url_key = hashlib.sha256(url.encode()).hexdigest()
+        response = Response(
+            cache_get_or_set(CATALOG_CACHE, f"{catalog}:{version}:{url_key}", data, CATALOG_CACHE_TIMEOUT)
+        )
+
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    patch_cache_control(response, public=True, max_age=0, s_maxage=CATALOG_EDGE_MAX_AGE)
+
+    return response
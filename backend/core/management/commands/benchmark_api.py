@@ -0,0 +1,70 @@
+"""
+Django command to benchmark the JSON API
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import BENCHMARK_SIZES, benchmark_regressions, benchmark_run
+
+
+class Command(BaseCommand):
+    """Django command to record query count, time and size of every API endpoint"""
+
+    help = "Benchmark every public GET endpoint under /api/ against seeded datasets."
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=BENCHMARK_SIZES,
+            help="Number of donations of every seeded dataset.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Path of the JSON report.",
+        )
+        parser.add_argument(
+            "--label",
+            default="",
+            help="Label of the report, i.e. a commit hash.",
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        sizes = options["sizes"]
+        self.stdout.write(f"Benchmarking API with {sizes} donations...")
+
+        results = benchmark_run(sizes=sizes)
+        regressions = benchmark_regressions(results)
+
+        for result in results:
+            self.stdout.write(
+                "{donations:>8} {endpoint:<45} {status} {queries:>4} queries {time_ms:>10.3f} ms {bytes:>9} bytes".format(
+                    **result
+                )
+            )
+
+        with open(options["output"], "w") as report:
+            json.dump(
+                {
+                    "label": options["label"],
+                    "sizes": sizes,
+                    "results": results,
+                    "regressions": regressions,
+                },
+                report,
+                indent=2,
+            )
+        self.stdout.write(f"Report written to {options['output']}")
+
+        if regressions:
+            raise CommandError(
+                "Query count grows with dataset size: "
+                + ", ".join(f"{r['endpoint']} {r['queries']}" for r in regressions)
+            )
+
+        self.stdout.write(self.style.SUCCESS("No query count regressions!"))
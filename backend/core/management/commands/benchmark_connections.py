@@ -0,0 +1,47 @@
+"""
+Django command to benchmark persistent database connections
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.benchmark import benchmark_throughput
+
+
+class Command(BaseCommand):
+    """Django command to compare requests per second with and without persistent connections"""
+
+    help = (
+        "Serve an endpoint repeatedly with a new database connection per request "
+        "(CONN_MAX_AGE=0), then with persistent connections, and report requests per second."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--path", default="/api/donations/", help="Endpoint to request.")
+        parser.add_argument("--requests", type=int, default=500, help="Number of requests per run.")
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=60,
+            help="CONN_MAX_AGE of the persistent connections run.",
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        path, requests = options["path"], options["requests"]
+
+        # Warm up, so that neither run pays for imports and URL resolution.
+        benchmark_throughput(path, requests=min(requests, 20), conn_max_age=0)
+
+        results = [
+            benchmark_throughput(path, requests=requests, conn_max_age=0),
+            benchmark_throughput(path, requests=requests, conn_max_age=options["conn_max_age"]),
+        ]
+
+        for result in results:
+            self.stdout.write(
+                "CONN_MAX_AGE={conn_max_age:<4} {endpoint} {requests} requests, {connections} connections, "
+                "statuses {statuses}: {requests_per_second:>8.1f} req/s".format(**result)
+            )
+
+        speedup = results[1]["requests_per_second"] / results[0]["requests_per_second"]
+        self.stdout.write(self.style.SUCCESS(f"Persistent connections: {speedup:.2f}x requests per second"))
@@ -0,0 +1,40 @@
+"""
+Django command to load test a running server
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.benchmark import LOAD_CONCURRENCY, LOAD_PATHS, benchmark_load
+
+
+class Command(BaseCommand):
+    """Django command to report latency percentiles of the main read endpoints at increasing concurrency"""
+
+    help = (
+        "Send GET requests to the main read endpoints of a running server (i.e. gunicorn) "
+        "at increasing concurrency, and report p50/p95/p99 latency and requests per second."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the server.")
+        parser.add_argument("--paths", nargs="+", default=LOAD_PATHS, help="Endpoints to request.")
+        parser.add_argument(
+            "--concurrency", nargs="+", type=int, default=LOAD_CONCURRENCY, help="Concurrent clients of every run."
+        )
+        parser.add_argument("--requests", type=int, default=500, help="Number of requests per endpoint and run.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        for concurrency in options["concurrency"]:
+            for path in options["paths"]:
+                result = benchmark_load(
+                    options["url"], path, concurrency=concurrency, requests_count=options["requests"]
+                )
+                cache = " ".join(f"{status} {count}" for status, count in sorted(result["cache"].items()))
+                self.stdout.write(
+                    "{concurrency:>4} clients {endpoint:<25} {requests_per_second:>8.1f} req/s "
+                    "p50 {p50_ms:>8.1f} ms  p95 {p95_ms:>8.1f} ms  p99 {p99_ms:>8.1f} ms  {errors} errors".format(
+                        **result
+                    )
+                    + (f"  cache: {cache}" if cache else "")
+                )
@@ -0,0 +1,33 @@
+"""
+Django command to benchmark payment logging
+"""
+
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from core.benchmark import benchmark_payment_logging
+
+
+class Command(BaseCommand):
+    """Django command to compare the cost of payment logging to callers, with prints and with the queue"""
+
+    help = (
+        "Log a Stripe payment creation repeatedly, with the former prints and eager logs, then "
+        "with the payment logger's lazy, queued logs, writing to an unbuffered file."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--calls", type=int, default=10000, help="Number of payments logged per run.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        # Line buffered, i.e. a write per line as stdout with PYTHONUNBUFFERED.
+        with tempfile.TemporaryFile("w", buffering=1) as stream:
+            results = benchmark_payment_logging(calls=options["calls"], stream=stream)
+
+        for result in results:
+            self.stdout.write("{path:<6} {calls} calls: {us_per_call:>8.2f} us per call".format(**result))
+
+        speedup = results[0]["us_per_call"] / results[1]["us_per_call"]
+        self.stdout.write(self.style.SUCCESS(f"Queued payment logging: {speedup:.1f}x faster for callers"))
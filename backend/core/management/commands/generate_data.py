@@ -0,0 +1,398 @@
+"""
+Django command to generate a large synthetic dataset for load testing
+"""
+
+import csv
+import io
+import json
+import random
+import secrets
+import time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from djmoney.money import Money
+from faker import Faker
+
+from campaign.models import Campaign, Comment
+from donation.models import Donation
+from donation.services import donation_summaries_rebuild
+from payment.models import Payment
+from project.models import Cause, Project
+from user.models import User, UserGroup
+
+# Faker is slow per call; values are drawn from pools generated up front.
+POOL_SIZE = 1000
+TIMESTAMP_POOL_SIZE = 100_000
+
+
+class Command(BaseCommand):
+    """Django command to generate Users, Projects, Campaigns, Donations, ..."""
+
+    help = (
+        "Generate a synthetic dataset. Small tables are inserted with batched "
+        "bulk_create, large tables (users, donations, payments) with COPY on PostgreSQL."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--users", type=int, default=1_000)
+        parser.add_argument("--groups", type=int, default=50)
+        parser.add_argument("--causes", type=int, default=20)
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--campaigns", type=int, default=300)
+        parser.add_argument("--comments", type=int, default=3_000)
+        parser.add_argument("--donations", type=int, default=10_000)
+        parser.add_argument(
+            "--payments",
+            type=float,
+            default=1.0,
+            help="Fraction of donations backed by a completed payment.",
+        )
+        parser.add_argument(
+            "--donation-skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of donations per campaign; 0 spreads donations uniformly.",
+        )
+        parser.add_argument(
+            "--comment-depth",
+            type=int,
+            default=5,
+            help="Depth of comment threads; 1 generates top-level comments only.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible data.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        self.batch_size = options["batch_size"]
+        self.run = secrets.token_hex(4)
+        self.now = timezone.now()
+        self.use_copy = connection.vendor == "postgresql"
+
+        random.seed(options["seed"])
+        fake = Faker()
+        Faker.seed(options["seed"])
+        self.pools = {
+            "first_name": [fake.first_name() for _ in range(POOL_SIZE)],
+            "last_name": [fake.last_name() for _ in range(POOL_SIZE)],
+            "city": [fake.city() for _ in range(POOL_SIZE)],
+            "country": [fake.country() for _ in range(POOL_SIZE)],
+            "word": [fake.word() for _ in range(POOL_SIZE)],
+            "catch_phrase": [fake.catch_phrase() for _ in range(POOL_SIZE)],
+            "sentence": [fake.sentence() for _ in range(POOL_SIZE)],
+            "paragraph": [fake.paragraph() for _ in range(POOL_SIZE)],
+            # Formatted once, as rows of large tables are written as text.
+            "timestamp": [
+                (self.now - timedelta(seconds=random.randint(0, 365 * 24 * 3600))).isoformat()
+                for _ in range(TIMESTAMP_POOL_SIZE)
+            ],
+        }
+
+        group_ids = self._step("groups", self.generate_groups, options["groups"])
+        user_ids = self._step("users", self.generate_users, options["users"], group_ids)
+        cause_ids = self._step("causes", self.generate_causes, options["causes"])
+        project_ids = self._step("projects", self.generate_projects, options["projects"], cause_ids)
+        campaign_ids = self._step(
+            "campaigns",
+            self.generate_campaigns,
+            options["campaigns"],
+            project_ids,
+            user_ids,
+        )
+        self._step(
+            "comments",
+            self.generate_comments,
+            options["comments"],
+            options["comment_depth"],
+            campaign_ids,
+            user_ids,
+        )
+        self._step(
+            "donations",
+            self.generate_donations,
+            options["donations"],
+            options["payments"],
+            options["donation_skew"],
+            campaign_ids,
+            user_ids,
+        )
+        self._step("donation summaries", donation_summaries_rebuild)
+
+        self.stdout.write(self.style.SUCCESS("Data generated!"))
+
+    def _step(self, name, func, *args):
+        self.stdout.write(f"Generating {name}...")
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            result = func(*args)
+
+        self.stdout.write(f"Generated {name} in {time.perf_counter() - start:.1f}s")
+        return result
+
+    def _pick(self, pool):
+        return random.choice(self.pools[pool])
+
+    def _created(self):
+        return self._pick("timestamp")
+
+    def _bulk_create(self, model, objs):
+        return model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _insert(self, model, rows):
+        """Insert rows (dicts of column values) with COPY, or bulk_create off PostgreSQL."""
+        if not rows:
+            return
+
+        if not self.use_copy:
+            self._bulk_create(model, [model(**row) for row in rows])
+            return
+
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        # JSON columns are written as JSON text.
+        csv.writer(buffer).writerows(
+            [json.dumps(value) if isinstance(value, dict) else value for value in row.values()] for row in rows
+        )
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+                    connection.ops.quote_name(model._meta.db_table),
+                    ", ".join(connection.ops.quote_name(column) for column in columns),
+                ),
+                buffer,
+            )
+
+    def _reserve_ids(self, model, count):
+        """
+        Reserve a range of primary keys, so that rows can reference each other before insertion.
+
+        Assumes no concurrent writers to the table.
+        """
+        # setval() cannot go below the start of a fresh sequence.
+        if count == 0:
+            return range(0)
+
+        if not self.use_copy:
+            last = model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+            return range(last + 1, last + 1 + count)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+                [model._meta.db_table, model._meta.db_table, count],
+            )
+            last = cursor.fetchone()[0]
+
+        return range(last - count + 1, last + 1)
+
+    def _batches(self, count):
+        for start in range(0, count, self.batch_size):
+            yield range(start, min(count, start + self.batch_size))
+
+    def generate_groups(self, count):
+        """Generate user groups."""
+        groups = self._bulk_create(
+            UserGroup,
+            [
+                UserGroup(
+                    name=f"{self._pick('last_name')} {self._pick('word')} group",
+                    interest=self._pick("word"),
+                )
+                for _ in range(count)
+            ],
+        )
+        return [group.pk for group in groups]
+
+    def generate_users(self, count, group_ids):
+        """Generate users, a fifth of them members of a group."""
+        password = make_password("password")
+        domain = f"{self.run}.example.com"
+
+        def user(i):
+            group_id = random.choice(group_ids) if group_ids and i % 5 == 0 else None
+            return {
+                "password": password,
+                "is_superuser": False,
+                "first_name": self._pick("first_name"),
+                "last_name": self._pick("last_name"),
+                "is_staff": False,
+                "is_active": True,
+                "date_joined": self._created(),
+                "email": f"user{i}@{domain}",
+                "group_membership_id": group_id,
+                "is_group_leader": group_id is not None and i % 25 == 0,
+                "img_renditions": {},
+            }
+
+        for batch in self._batches(count):
+            self._insert(User, [user(i) for i in batch])
+
+        return list(User.objects.filter(email__endswith=f"@{domain}").order_by("pk").values_list("pk", flat=True))
+
+    def generate_causes(self, count):
+        """Generate causes."""
+        causes = self._bulk_create(
+            Cause,
+            [
+                Cause(name=f"{self._pick('word')} {self.run} {i}", description=self._pick("sentence"))
+                for i in range(count)
+            ],
+        )
+        return [cause.pk for cause in causes]
+
+    def generate_projects(self, count, cause_ids):
+        """Generate projects, each addressing up to three causes."""
+        statuses = [choice for choice, _ in Project.StatusChoices.choices]
+        projects = self._bulk_create(
+            Project,
+            [
+                Project(
+                    name=f"{self._pick('catch_phrase')} {self.run} {i}",
+                    description=self._pick("paragraph"),
+                    status=random.choices(statuses, weights=[1, 6, 1, 1, 1])[0],
+                    target=Money(Decimal(random.randrange(1_000, 100_000, 100)), "USD"),
+                    city=self._pick("city"),
+                    country=self._pick("country"),
+                )
+                for i in range(count)
+            ],
+        )
+
+        if cause_ids:
+            self._bulk_create(
+                Project.causes.through,
+                [
+                    Project.causes.through(project_id=project.pk, cause_id=cause_id)
+                    for project in projects
+                    for cause_id in random.sample(cause_ids, min(len(cause_ids), random.randint(1, 3)))
+                ],
+            )
+
+        return [project.pk for project in projects]
+
+    def generate_campaigns(self, count, project_ids, user_ids):
+        """Generate campaigns, spread over projects."""
+        campaigns = self._bulk_create(
+            Campaign,
+            [
+                Campaign(
+                    title=self._pick("catch_phrase"),
+                    description=self._pick("paragraph"),
+                    target=Money(Decimal(random.randrange(500, 50_000, 50)), "USD"),
+                    project_id=project_ids[i % len(project_ids)],
+                    owner_id=user_ids[i % len(user_ids)],
+                    end_date=self.now + timedelta(days=random.randint(-30, 365)),
+                )
+                for i in range(count)
+            ],
+        )
+        return [campaign.pk for campaign in campaigns]
+
+    def generate_comments(self, count, depth, campaign_ids, user_ids):
+        """
+        Generate comment threads of given depth.
+
+        Every level replies to comments of the level above it, so that
+        threads are `depth` comments deep.
+        """
+        depth = max(1, depth)
+        per_level = count // depth
+        parents = []
+
+        for level in range(depth):
+            level_count = per_level + (count % depth if level == 0 else 0)
+            ids = self._reserve_ids(Comment, level_count)
+            comments = []
+
+            for comment_id in ids:
+                created = self._created()
+                parent = random.choice(parents) if parents else None
+                comments.append(
+                    {
+                        "id": comment_id,
+                        "created": created,
+                        "modified": created,
+                        "content": self._pick("sentence"),
+                        "campaign_id": parent["campaign_id"] if parent else random.choice(campaign_ids),
+                        "author_id": random.choice(user_ids),
+                        "parent_id": parent["id"] if parent else None,
+                    }
+                )
+
+            for start in range(0, level_count, self.batch_size):
+                self._insert(Comment, comments[start : start + self.batch_size])
+
+            parents = comments
+
+    def generate_donations(self, count, payments, skew, campaign_ids, user_ids):
+        """
+        Generate donations, and completed payments backing them.
+
+        Donations per campaign follow a Zipf distribution of exponent
+        `skew`, so that a few campaigns receive most of the donations.
+        """
+        cum_weights = list(accumulate(1 / (rank**skew) for rank in range(1, len(campaign_ids) + 1)))
+        campaigns = random.sample(campaign_ids, len(campaign_ids))
+
+        platforms = [Payment.Platforms.PAYPAL, Payment.Platforms.STRIPE]
+        timestamps = self.pools["timestamp"]
+
+        for batch in self._batches(count):
+            # Draw random values a batch at a time, which is much cheaper than per row.
+            size = len(batch)
+            batch_campaigns = random.choices(campaigns, cum_weights=cum_weights, k=size)
+            batch_donors = random.choices(user_ids, k=size)
+            batch_created = random.choices(timestamps, k=size)
+            batch_platforms = random.choices(platforms, k=size)
+
+            batch_paid = [random.random() < payments for _ in batch]
+            payment_ids = iter(self._reserve_ids(Payment, sum(batch_paid)) if any(batch_paid) else ())
+
+            donations = []
+            payment_rows = []
+
+            for i, campaign_id, donor_id, created, platform, paid in zip(
+                batch, batch_campaigns, batch_donors, batch_created, batch_platforms, batch_paid
+            ):
+                amount = f"{max(1.0, random.lognormvariate(3, 1)):.2f}"
+                payment_id = next(payment_ids) if paid else None
+                donations.append(
+                    {
+                        "created": created,
+                        "modified": created,
+                        "donor_id": donor_id,
+                        "amount_currency": "USD",
+                        "amount": amount,
+                        "description": None,
+                        "campaign_id": campaign_id,
+                        "payment_id": payment_id,
+                    }
+                )
+
+                if paid:
+                    payment_rows.append(
+                        {
+                            "id": payment_id,
+                            "created": created,
+                            "modified": created,
+                            "user_id": donor_id,
+                            "campaign_id": campaign_id,
+                            "platform": platform,
+                            "gateway_payment_id": f"GEN-{self.run}-{i}",
+                            "amount_currency": "USD",
+                            "amount": amount,
+                            "status": Payment.Status.COMPLETED,
+                        }
+                    )
+
+            self._insert(Payment, payment_rows)
+            self._insert(Donation, donations)
@@ -0,0 +1,31 @@
+"""
+Django command to generate image renditions
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.renditions import renditions_generate, renditions_outdated, renditions_registered
+
+
+class Command(BaseCommand):
+    """Django command to generate missing or outdated image renditions"""
+
+    help = (
+        "Generate WebP renditions of images which have none, or were made from a former image, "
+        "i.e. images uploaded before renditions, or whose generation failed."
+    )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        for model, field, on_generated in renditions_registered():
+            images = model._default_manager.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+            generated = 0
+
+            for instance in images.order_by("pk").iterator(chunk_size=500):
+                if renditions_outdated(instance, field) and renditions_generate(model, instance.pk, field):
+                    generated += 1
+
+            if generated and on_generated:
+                on_generated()
+
+            self.stdout.write(f"{model._meta.label}.{field}: {generated} generated")
@@ -1,9 +1,17 @@
 """Core pagination."""
 
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from collections import OrderedDict
 
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
 from rest_framework.pagination import LimitOffsetPagination as _LimitOffsetPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 def get_paginated_response(*, pagination_class, serializer_class, queryset, request, view):
@@ -94,3 +102,208 @@ class LimitOffsetPagination(_LimitOffsetPagination):
                 "results": schema,
             },
         }
+
+
+def estimate_count(queryset):
+    """
+    Estimate number of rows of an unfiltered queryset from PostgreSQL's statistics.
+
+    Return None when no estimate is available, i.e. for filtered querysets,
+    other databases or tables which were never analyzed.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql" or queryset.query.where or queryset.query.is_sliced:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+
+    if row is None or row[0] < 0:
+        return None
+
+    return row[0]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset Pagination Class.
+
+    Pages through a queryset newest first, ordered on (created, id). A page
+    filters on the position of the last item of the page before it instead
+    of scanning an OFFSET, so that deep pages cost the same as the first
+    one, given an index on (created, id).
+    """
+
+    default_limit = 10
+    max_limit = 50
+    limit_query_param = "limit"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    # "exact" counts with COUNT(*), "estimate" uses PostgreSQL's estimate of
+    # the table size when the queryset is unfiltered, None skips counting.
+    count_mode = "estimate"
+    # Below this estimate, an exact count is cheap enough.
+    estimate_threshold = 10_000
+
+    def paginate_queryset(self, queryset, request, view=None):  # noqa
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.count = self.get_count(queryset)
+
+        cursor = self.decode_cursor(request)
+        self.reverse, position = cursor if cursor else (False, None)
+
+        if self.reverse:
+            queryset = queryset.order_by("created", "id")
+            if position:
+                created, pk = position
+                queryset = queryset.filter(created__gte=created).filter(Q(created__gt=created) | Q(id__gt=pk))
+        else:
+            queryset = queryset.order_by("-created", "-id")
+            if position:
+                created, pk = position
+                queryset = queryset.filter(created__lte=created).filter(Q(created__lt=created) | Q(id__lt=pk))
+
+        page = list(queryset[: self.limit + 1])
+        self.has_more = len(page) > self.limit
+        page = page[: self.limit]
+
+        if self.reverse:
+            page.reverse()
+
+        self.page = page
+        self.has_cursor = cursor is not None
+
+        return page
+
+    def get_limit(self, request):  # noqa
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_count(self, queryset):
+        """Count, estimate or skip counting items, as per `count_mode`."""
+        if self.count_mode is None:
+            return None
+
+        if self.count_mode == "estimate":
+            estimate = estimate_count(queryset)
+
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+
+        return queryset.count()
+
+    def decode_cursor(self, request):
+        """Decode cursor of request into (reverse, (created, id)), or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            reverse, created, pk = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii").split("|")
+            created = parse_datetime(created)
+            pk = int(pk)
+        except (binascii.Error, UnicodeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created is None or reverse not in ("0", "1"):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse == "1", (created, pk)
+
+    def encode_cursor(self, *, reverse, item):
+        """Link to the page after (or before, if reverse) item."""
+        cursor = f"{int(reverse)}|{item.created.isoformat()}|{item.pk}"
+        encoded = urlsafe_b64encode(cursor.encode("ascii")).decode("ascii")
+
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):  # noqa
+        if not self.page or not (self.reverse or self.has_more):
+            return None
+
+        return self.encode_cursor(reverse=False, item=self.page[-1])
+
+    def get_previous_link(self):  # noqa
+        if not self.page:
+            return None
+
+        if self.has_more if self.reverse else self.has_cursor:
+            return self.encode_cursor(reverse=True, item=self.page[0])
+
+        return None
+
+    def get_paginated_response(self, data):  # noqa
+        return Response(
+            OrderedDict(
+                [
+                    ("limit", self.limit),
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Return custom schema for paginated response."""
+
+        return {
+            "type": "object",
+            "properties": {
+                "count": {
+                    "type": "integer",
+                    "nullable": True,
+                    "example": 123,
+                },
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/example-entity/?cursor=cD00ODY%3D",
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/example-entity/?cursor=cj0xJnA9NDg3",
+                },
+                "limit": {
+                    "type": "integer",
+                    "example": 123,
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):  # noqa
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
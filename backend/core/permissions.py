@@ -2,9 +2,11 @@
 
 from rest_framework.permissions import BasePermission
 
+from user.selectors import user_has_role
+
 
 class IsAdminUser(BasePermission):
-    """Allow only users in 'admin' group."""
+    """Allow only users in 'admin' group, from their cached roles."""
 
     def has_permission(self, request, view):  # noqa
-        return request.user.groups.filter(name="admin").exists()
+        return user_has_role(request.user, "admin")
@@ -0,0 +1,154 @@
+"""
+Core image renditions.
+
+WebP thumbnails of uploaded images, at RENDITION_SIZES, so that lists do
+not send full-size images to clients. They are generated once the upload
+is committed, by a thread pool rather than the request thread, and stored
+under `renditions/` with names hashed from their content, so that their
+URLs can be cached for good.
+
+Renditions of an image field `img` are recorded in the `img_renditions`
+JSONField of the model, along with the name of the image they were made
+from, so that renditions of a replaced image are ignored until remade.
+
+Usage (in AppConfig.ready):
+renditions_register(Project, "img", on_generated=lambda: catalog_invalidate(CATALOG_PROJECTS))
+"""
+
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, models, transaction
+from django.db.models.signals import post_save
+
+logger = logging.getLogger(__name__)
+
+# Longest side of every rendition, in pixels. Smaller images are not upscaled.
+RENDITION_SIZES = {
+    "small": 256,
+    "medium": 768,
+}
+RENDITION_QUALITY = 80
+RENDITIONS_DIR = "renditions"
+
+_registry: List[Tuple[Type[models.Model], str, Optional[Callable[[], None]]]] = []
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="renditions")
+
+
+def renditions_register(
+    model: Type[models.Model], field: str, *, on_generated: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Generate renditions of image `field` of model whenever a new image is saved.
+
+    `on_generated` runs after renditions are recorded, i.e. to invalidate
+    caches of responses showing them.
+    """
+    _registry.append((model, field, on_generated))
+
+    def schedule(sender, instance, **kwargs):
+        if renditions_outdated(instance, field):
+            renditions_schedule(instance, field, on_generated=on_generated)
+
+    post_save.connect(schedule, sender=model, weak=False, dispatch_uid=f"renditions:{model._meta.label}.{field}")
+
+
+def renditions_registered() -> List[Tuple[Type[models.Model], str, Optional[Callable[[], None]]]]:
+    """Models and image fields renditions are generated for."""
+    return list(_registry)
+
+
+def renditions_outdated(instance: models.Model, field: str) -> bool:
+    """Whether instance has an image in field without renditions made from it."""
+    image = getattr(instance, field)
+    return bool(image) and getattr(instance, f"{field}_renditions").get("source") != image.name
+
+
+def renditions_schedule(
+    instance: models.Model, field: str, *, on_generated: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Generate renditions of instance's image once the current transaction commits.
+
+    With IMAGE_RENDITIONS_ASYNC (the default), by the thread pool.
+    """
+    model, pk = type(instance), instance.pk
+
+    def generate():
+        try:
+            if renditions_generate(model, pk, field) and on_generated:
+                on_generated()
+        except Exception:
+            logger.exception("Failed to generate renditions of %s %s %s.", model._meta.label, pk, field)
+        finally:
+            if settings.IMAGE_RENDITIONS_ASYNC:
+                connection.close()
+
+    if settings.IMAGE_RENDITIONS_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(generate))
+    else:
+        transaction.on_commit(generate)
+
+
+def renditions_generate(model: Type[models.Model], pk, field: str) -> Optional[Dict[str, str]]:
+    """
+    Generate and record renditions of the image in `field` of a model instance.
+
+    Returns the renditions, or None if the instance or its image is gone, or
+    was replaced meanwhile.
+    """
+    instance = model._default_manager.filter(pk=pk).first()
+    image = getattr(instance, field, None)
+
+    if not image:
+        return None
+
+    source = image.name
+    renditions = {"source": source}
+
+    with image.open("rb"), Image.open(image) as original:
+        # JPEGs are decoded at a reduced scale, still larger than the largest rendition.
+        original.draft("RGB", (max(RENDITION_SIZES.values()),) * 2)
+        original = ImageOps.exif_transpose(original)
+        rgb = original.convert("RGBA" if original.has_transparency_data else "RGB")
+
+        for name, size in RENDITION_SIZES.items():
+            rendition = rgb.copy()
+            rendition.thumbnail((size, size), Image.LANCZOS)
+            renditions[name] = _rendition_save(rendition)
+
+    # Only record renditions of the image still in place.
+    updated = model._default_manager.filter(pk=pk, **{field: source}).update(**{f"{field}_renditions": renditions})
+
+    return renditions if updated else None
+
+
+def renditions_urls(instance: models.Model, field: str) -> Dict[str, str]:
+    """URLs of renditions of instance's image by size, empty until they are generated."""
+    renditions = getattr(instance, f"{field}_renditions") or {}
+    image = getattr(instance, field)
+
+    if not image or renditions.get("source") != image.name:
+        return {}
+
+    return {name: default_storage.url(renditions[name]) for name in RENDITION_SIZES if name in renditions}
+
+
+def _rendition_save(rendition: Image.Image) -> str:
+    """Save rendition as WebP under a name hashed from its content, unless saved already."""
+    buffer = BytesIO()
+    rendition.save(buffer, "WEBP", quality=RENDITION_QUALITY, method=4)
+    content = buffer.getvalue()
+    name = f"{RENDITIONS_DIR}/{hashlib.sha256(content).hexdigest()[:32]}.webp"
+
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+
+    return name
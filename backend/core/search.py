@@ -0,0 +1,71 @@
+"""
+Core search.
+
+Full-text search on PostgreSQL, ranked best match first. A model declares
+its search vector once, and a migration indexes it, i.e.
+
+    operations = [search_index("project", "Project", "project_search_idx", search_vector(["name"]))]
+
+so that searching filters on the very expression of the index, and needs
+no column kept in sync on writes. The index is not in the model's Meta,
+as other databases cannot create it.
+
+Other databases (i.e. SQLite) fall back to `icontains` on the fields.
+"""
+
+from functools import reduce
+from operator import or_
+from typing import Iterable
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, migrations
+from django.db.models import Q, QuerySet
+
+SEARCH_CONFIG = "english"
+
+
+def search_vector(*weighted_fields: Iterable[str]) -> SearchVector:
+    """
+    Search vector of fields, weighted from "A" (most relevant) to "D".
+
+    Example:
+    search_vector(["title"], ["description"])
+    -> title weighs "A", description "B".
+    """
+    vectors = [
+        SearchVector(*fields, weight=weight, config=SEARCH_CONFIG) for fields, weight in zip(weighted_fields, "ABCD")
+    ]
+    return reduce(lambda a, b: a + b, vectors)
+
+
+def search_index(app_label: str, model_name: str, name: str, vector: SearchVector) -> migrations.RunPython:
+    """Migration operation creating a GIN index of search vector, on PostgreSQL only."""
+
+    def index(apps, schema_editor):
+        return apps.get_model(app_label, model_name), GinIndex(vector, name=name)
+
+    def add(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(*index(apps, schema_editor))
+
+    def remove(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.remove_index(*index(apps, schema_editor))
+
+    return migrations.RunPython(add, remove)
+
+
+def search(queryset: QuerySet, query: str, *, vector: SearchVector, fields: Iterable[str]) -> QuerySet:
+    """Filter queryset on search query, best match first."""
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.filter(reduce(or_, (Q(**{f"{field}__icontains": query}) for field in fields)))
+
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+
+    return (
+        queryset.alias(search_document=vector)
+        .filter(search_document=search_query)
+        .annotate(search_rank=SearchRank(vector, search_query))
+        .order_by("-search_rank", "-id")
+    )
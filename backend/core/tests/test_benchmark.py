@@ -0,0 +1,109 @@
+"""
+Test API query counts do not grow with the size of the dataset.
+"""
+
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import LiveServerTestCase, TestCase, TransactionTestCase
+
+from core.benchmark import (
+    benchmark_endpoints,
+    benchmark_load,
+    benchmark_payment_logging,
+    benchmark_regressions,
+    benchmark_run,
+    benchmark_throughput,
+)
+
+
+class BenchmarkTestCase(TestCase):
+    """Test API benchmark."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_query_counts_do_not_grow_with_dataset(self):
+        """Test no endpoint runs more queries on a bigger dataset."""
+        results = benchmark_run(sizes=[10, 100])
+
+        self.assertEqual(benchmark_regressions(results), [])
+        self.assertTrue(all(result["status"] == 200 for result in results))
+
+    def test_benchmark_regressions(self):
+        """Test endpoints whose query count changes are reported."""
+        results = [
+            {"donations": 10, "endpoint": "/api/projects/", "queries": 3},
+            {"donations": 100, "endpoint": "/api/projects/", "queries": 12},
+            {"donations": 10, "endpoint": "/api/projects/1/", "queries": 2},
+            {"donations": 100, "endpoint": "/api/projects/7/", "queries": 2},
+        ]
+
+        self.assertEqual(
+            benchmark_regressions(results),
+            [{"endpoint": "/api/projects/", "queries": {10: 3, 100: 12}}],
+        )
+
+    def test_benchmark_endpoints_excludes_payment_gateways(self):
+        """Test endpoints calling external gateways are not benchmarked."""
+        endpoints = benchmark_endpoints()
+
+        self.assertIn("/api/projects/", endpoints)
+        self.assertFalse(any(endpoint.startswith(("/api/paypal/", "/api/stripe/")) for endpoint in endpoints))
+
+    def test_benchmark_api_writes_report(self):
+        """Test benchmark_api command writes a JSON report."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "benchmark.json")
+
+            call_command("benchmark_api", sizes=[10], output=output, label="test", stdout=open(os.devnull, "w"))
+
+            with open(output) as report:
+                data = json.load(report)
+
+        self.assertEqual(data["label"], "test")
+        self.assertEqual(data["sizes"], [10])
+        self.assertEqual(data["regressions"], [])
+        self.assertIn("/api/campaigns/", [result["endpoint"] for result in data["results"]])
+
+    def test_benchmark_payment_logging(self):
+        """Test both logging paths are timed, and only the former one prints debug lines."""
+        with tempfile.TemporaryFile("w+") as stream:
+            results = benchmark_payment_logging(calls=10, stream=stream)
+            stream.seek(0)
+            lines = stream.read().splitlines()
+
+        self.assertEqual([result["path"] for result in results], ["print", "queue"])
+        self.assertEqual(len(lines), 60)
+        self.assertEqual(sum(line.startswith("DEBUG:") for line in lines), 30)
+
+
+class ThroughputBenchmarkTestCase(TransactionTestCase):
+    """Test throughput benchmark, which needs connections to be closed between requests."""
+
+    def test_persistent_connections_are_reused(self):
+        """Test one connection serves every request with CONN_MAX_AGE, one per request without."""
+        per_request = benchmark_throughput("/api/donations/", requests=5, conn_max_age=0)
+        persistent = benchmark_throughput("/api/donations/", requests=5, conn_max_age=60)
+
+        self.assertEqual(per_request["statuses"], [200])
+        self.assertEqual(per_request["connections"], 5)
+        self.assertEqual(persistent["connections"], 1)
+
+
+class LoadBenchmarkTestCase(LiveServerTestCase):
+    """Test load benchmark, against a live server."""
+
+    def test_latency_percentiles(self):
+        """Test every request is timed, and percentiles are ordered."""
+        result = benchmark_load(self.live_server_url, "/api/projects/", concurrency=2, requests_count=6)
+
+        self.assertEqual(result["errors"], 0)
+        self.assertEqual(result["requests"], 6)
+        # Not behind nginx, so no cache status.
+        self.assertEqual(result["cache"], {})
+        self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+        self.assertLessEqual(result["p95_ms"], result["p99_ms"])
@@ -0,0 +1,92 @@
+"""Test core cache."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import (
+    cache_get_or_set,
+    cache_invalidate,
+    cache_stats,
+    cache_stats_reset,
+)
+
+User = get_user_model()
+
+
+class CacheTestCase(TestCase):
+    """Test cache layer."""
+
+    def setUp(self):
+        cache.clear()
+        cache_stats_reset()
+
+    def test_cache_get_or_set_counts_hits_and_misses(self):
+        """Test value is computed once, then served from cache."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 42
+
+        self.assertEqual(cache_get_or_set("answer", 1, compute), 42)
+        self.assertEqual(cache_get_or_set("answer", 1, compute), 42)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache_stats()["answer"], {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_cache_get_or_set_caches_falsy_values(self):
+        """Test None and 0 count as cached values."""
+        cache_get_or_set("falsy", 1, lambda: 0)
+        cache_get_or_set("falsy", 1, lambda: 1)
+
+        self.assertEqual(cache_get_or_set("falsy", 1, lambda: 1), 0)
+        self.assertEqual(cache_stats()["falsy"]["hits"], 2)
+
+    def test_cache_invalidate(self):
+        """Test invalidated values are computed again, on commit too."""
+        cache_get_or_set("answer", 1, lambda: 42)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            cache_invalidate("answer", 1)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(cache_get_or_set("answer", 1, lambda: 43), 43)
+
+    def test_cache_invalidate_during_computation(self):
+        """Test a value computed before an invalidation, and cached after it, is not served."""
+
+        def compute_stale():
+            # A donation commits while the value is computed from rows read before it.
+            cache_invalidate("answer", 1)
+            return 42
+
+        self.assertEqual(cache_get_or_set("answer", 1, compute_stale), 42)
+        self.assertEqual(cache_get_or_set("answer", 1, lambda: 43), 43)
+        self.assertEqual(cache_get_or_set("answer", 1, lambda: 44), 43)
+
+    def test_cache_stats_api(self):
+        """Test admins can read cache stats."""
+        client = APIClient()
+        admin = User.objects.create_user(email="admin@example.com", password="adminpass")
+        admin.groups.add(Group.objects.get_or_create(name="admin")[0])
+        cache_get_or_set("answer", 1, lambda: 42)
+
+        client.force_authenticate(user=admin)
+        response = client.get(reverse("core:cache-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["answer"]["misses"], 1)
+
+    def test_cache_stats_api_forbidden(self):
+        """Test non-admins cannot read cache stats."""
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(email="user@example.com", password="userpass"))
+
+        response = client.get(reverse("core:cache-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -2,13 +2,20 @@
 Test custom Django management commands.
 """
 
+from io import StringIO
 from unittest.mock import patch
 
 from django.core.management import call_command
+from django.db.models import F, Sum
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 from psycopg2 import OperationalError as Psycopg2Error
 
+from campaign.models import Campaign, Comment
+from donation.models import CampaignDonationSummary, Donation
+from payment.models import Payment
+from user.models import User
+
 
 @patch("core.management.commands.wait_for_db.Command.check")
 class CommandsTestCase(SimpleTestCase):
@@ -31,3 +38,43 @@ class CommandsTestCase(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class GenerateDataTestCase(TestCase):
+    """Test generate_data command."""
+
+    def test_generate_data(self):
+        """Test generating a small dataset."""
+        call_command(
+            "generate_data",
+            users=20,
+            groups=2,
+            causes=3,
+            projects=3,
+            campaigns=5,
+            comments=12,
+            comment_depth=3,
+            donations=50,
+            batch_size=7,
+            seed=1,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Campaign.objects.count(), 5)
+        self.assertEqual(Donation.objects.count(), 50)
+        self.assertEqual(Payment.objects.filter(status=Payment.Status.COMPLETED).count(), 50)
+        self.assertEqual(Donation.objects.filter(payment__campaign=F("campaign")).count(), 50)
+        self.assertEqual(Comment.objects.count(), 12)
+        self.assertTrue(Comment.objects.filter(parent__parent__isnull=False).exists())
+        self.assertEqual(
+            CampaignDonationSummary.objects.aggregate(total=Sum("donations_count"))["total"],
+            50,
+        )
+
+    def test_generate_data_without_comments(self):
+        """Test generating a dataset without comments."""
+        call_command("generate_data", users=5, campaigns=2, comments=0, donations=5, seed=1, stdout=StringIO())
+
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(Donation.objects.count(), 5)
@@ -0,0 +1,129 @@
+"""
+Test keyset pagination.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from djmoney.money import Money
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from campaign.models import Campaign, Comment
+from core.pagination import KeysetPagination, estimate_count
+from project.models import Project
+
+User = get_user_model()
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Test keyset pagination."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(email="user@example.com", password="password123")
+        project = Project.objects.create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        self.campaign = Campaign.objects.create(
+            title="Wells",
+            description="Wells",
+            project=project,
+            owner=self.user,
+            target=Money(500, "USD"),
+        )
+
+        now = timezone.now()
+        # Comments share timestamps in threes, so that pages must break ties on id.
+        Comment.objects.bulk_create(
+            [
+                Comment(
+                    content=f"Comment {i}",
+                    campaign=self.campaign,
+                    author=self.user,
+                    created=now - timedelta(minutes=i // 3),
+                )
+                for i in range(25)
+            ]
+        )
+        self.ordered_ids = list(Comment.objects.order_by("-created", "-id").values_list("id", flat=True))
+
+    def paginate(self, url="/api/comments/", queryset=None, **attrs):
+        paginator = KeysetPagination()
+        for attr, value in attrs.items():
+            setattr(paginator, attr, value)
+
+        page = paginator.paginate_queryset(
+            Comment.objects.all() if queryset is None else queryset,
+            Request(self.factory.get(url)),
+        )
+        return paginator, [comment.id for comment in page]
+
+    def test_pages_forward_through_all_items(self):
+        """Test following next links returns every item once, newest first."""
+        ids = []
+        url = "/api/comments/?limit=10"
+
+        while url:
+            paginator, page = self.paginate(url)
+            ids += page
+            url = paginator.get_next_link()
+
+        self.assertEqual(ids, self.ordered_ids)
+
+    def test_pages_backward(self):
+        """Test previous link of a page returns the page before it."""
+        paginator, _ = self.paginate("/api/comments/?limit=10")
+        paginator, _ = self.paginate(paginator.get_next_link())
+        paginator, third_page = self.paginate(paginator.get_next_link())
+
+        paginator, page = self.paginate(paginator.get_previous_link())
+
+        self.assertEqual(third_page, self.ordered_ids[20:])
+        self.assertEqual(page, self.ordered_ids[10:20])
+        self.assertIsNotNone(paginator.get_previous_link())
+        self.assertEqual(self.paginate(paginator.get_next_link())[1], third_page)
+
+    def test_first_page_has_no_previous_link(self):
+        """Test there is nothing before the first page."""
+        paginator, page = self.paginate()
+
+        self.assertEqual(page, self.ordered_ids[:10])
+        self.assertIsNone(paginator.get_previous_link())
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor is not found."""
+        with self.assertRaises(NotFound):
+            self.paginate("/api/comments/?cursor=invalid")
+
+    def test_deep_page_query_count(self):
+        """Test a deep page runs the same queries as the first one."""
+        paginator, _ = self.paginate("/api/comments/?limit=5")
+        for _ in range(3):
+            paginator, _ = self.paginate(paginator.get_next_link())
+        deep_url = paginator.get_next_link()
+
+        with self.assertNumQueries(2):
+            self.paginate("/api/comments/?limit=5", count_mode="exact")
+
+        with self.assertNumQueries(2):
+            self.paginate(deep_url, count_mode="exact")
+
+    def test_count_modes(self):
+        """Test count is exact, estimated or skipped."""
+        self.assertEqual(self.paginate(count_mode="exact")[0].count, 25)
+        self.assertIsNone(self.paginate(count_mode=None)[0].count)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE campaign_comment")
+
+        self.assertEqual(self.paginate(count_mode="estimate", estimate_threshold=0)[0].count, 25)
+
+    def test_estimate_count_filtered(self):
+        """Test filtered querysets are not estimated, but counted."""
+        queryset = Comment.objects.filter(content="Comment 1")
+
+        self.assertIsNone(estimate_count(queryset))
+        self.assertEqual(self.paginate(queryset=queryset, estimate_threshold=0)[0].count, 1)
@@ -0,0 +1,121 @@
+"""Test core image renditions."""
+
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.renditions import renditions_generate, renditions_urls
+from project.models import Cause, Project
+from project.services import cause_create, project_create, project_update
+
+
+def image_upload(name="water.png", size=(1200, 600), color="blue"):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class RenditionsTestCase(TestCase):
+    """Test renditions are generated once uploads are committed, and served in lists."""
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_RENDITIONS_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def project_create(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = project_create(name="Water", target=1000, city="Gulu", country="Uganda", **kwargs)
+
+        project.refresh_from_db()
+        return project
+
+    def test_webp_renditions_are_generated_on_upload(self):
+        """Test each size is saved as WebP, fitting its box, under a content-hashed name."""
+        project = self.project_create(img=image_upload())
+
+        renditions = project.img_renditions
+        self.assertEqual(renditions["source"], project.img.name)
+
+        for name, expected_size in (("small", (256, 128)), ("medium", (768, 384))):
+            self.assertRegex(renditions[name], r"^renditions/[0-9a-f]{32}\.webp$")
+            with default_storage.open(renditions[name]) as file, Image.open(file) as rendition:
+                self.assertEqual(rendition.format, "WEBP")
+                self.assertEqual(rendition.size, expected_size)
+
+    def test_small_images_are_not_upscaled(self):
+        """Test images smaller than a size are kept at their size, and identical renditions stored once."""
+        project = self.project_create(img=image_upload(size=(100, 50)))
+
+        self.assertEqual(project.img_renditions["small"], project.img_renditions["medium"])
+        with default_storage.open(project.img_renditions["small"]) as file, Image.open(file) as rendition:
+            self.assertEqual(rendition.size, (100, 50))
+
+    def test_saves_without_new_image_do_not_regenerate(self):
+        """Test renditions are only generated for images they were not made from."""
+        project = self.project_create(img=image_upload())
+
+        with patch("core.renditions.renditions_generate") as generate:
+            with self.captureOnCommitCallbacks(execute=True):
+                project_update(project=project, data={"name": "Clean Water"})
+
+        generate.assert_not_called()
+
+    def test_renditions_of_replaced_images_are_ignored(self):
+        """Test renditions are ignored once the image is replaced, until remade."""
+        project = self.project_create(img=image_upload())
+        Project.objects.filter(pk=project.pk).update(img="projects/other.png")
+        project.refresh_from_db()
+
+        self.assertEqual(renditions_urls(project, "img"), {})
+
+    def test_generation_runs_off_the_committing_thread(self):
+        """Test renditions are handed to the thread pool, once the transaction commits."""
+        with override_settings(IMAGE_RENDITIONS_ASYNC=True), patch("core.renditions._executor") as executor:
+            with self.captureOnCommitCallbacks() as callbacks:
+                project = project_create(name="Water", target=1000, city="Gulu", country="Uganda", img=image_upload())
+
+            executor.submit.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        executor.submit.assert_called_once()
+        self.assertEqual(Project.objects.get(pk=project.pk).img_renditions, {})
+
+    def test_lists_show_rendition_urls(self):
+        """Test projects and their causes show rendition URLs."""
+        with self.captureOnCommitCallbacks(execute=True):
+            cause_create(name="water", icon=image_upload("drop.png"))
+        project = self.project_create(img=image_upload(), causes=["water"])
+
+        response = APIClient().get(reverse("projects:list-create"))
+
+        result = response.data["results"][0]
+        self.assertEqual(result["img_renditions"], renditions_urls(project, "img"))
+        self.assertTrue(result["img_renditions"]["small"].endswith(".webp"))
+        self.assertEqual(result["causes"][0]["icon_renditions"], renditions_urls(Cause.objects.get(), "icon"))
+        self.assertEqual(set(result["causes"][0]["icon_renditions"]), {"small", "medium"})
+
+    def test_command_generates_missing_renditions(self):
+        """Test images saved without renditions, i.e. before they existed, get them."""
+        project = self.project_create(img=image_upload())
+        Project.objects.filter(pk=project.pk).update(img_renditions={})
+
+        call_command("renditions_generate", stdout=StringIO())
+
+        project.refresh_from_db()
+        self.assertEqual(project.img_renditions["source"], project.img.name)
+        self.assertIsNone(renditions_generate(Project, 0, "img"))
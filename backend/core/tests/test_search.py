@@ -0,0 +1,53 @@
+"""
+Test full-text search.
+"""
+
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+
+from core.search import search
+from project.models import PROJECT_SEARCH_FIELDS, PROJECT_SEARCH_VECTOR, Project
+
+
+class SearchTestCase(TestCase):
+    """Test search."""
+
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Clean Water",
+            description="Wells for villages.",
+            target=5000,
+            city="Nairobi",
+            country="Kenya",
+        )
+        Project.objects.create(name="School Books", target=5000, city="Gulu", country="Uganda")
+
+    def search(self, query):
+        return list(search(Project.objects.all(), query, vector=PROJECT_SEARCH_VECTOR, fields=PROJECT_SEARCH_FIELDS))
+
+    def test_search_stems_words(self):
+        """Test search matches other forms of words."""
+        self.assertEqual(self.search("well"), [self.project])
+
+    def test_search_websearch_syntax(self):
+        """Test search supports quotes and exclusions."""
+        self.assertEqual(self.search('"clean water"'), [self.project])
+        self.assertEqual(self.search("water -kenya"), [])
+
+    @patch("core.search.connections")
+    def test_search_fallback(self, patched_connections):
+        """Test search falls back to icontains off PostgreSQL."""
+        patched_connections.__getitem__.return_value.vendor = "sqlite"
+
+        self.assertEqual(self.search("villag"), [self.project])
+        self.assertEqual(self.search("trains"), [])
+
+    def test_search_indexes(self):
+        """Test search vectors are indexed on PostgreSQL."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE indexname LIKE %s", ["%_search_idx"])
+            indexes = {row[0] for row in cursor.fetchall()}
+
+        self.assertEqual(indexes, {"project_search_idx", "campaign_search_idx"})
@@ -0,0 +1,9 @@
+"""Core urls."""
+
+from django.urls import path
+
+from .views import CacheStatsAPI
+
+urlpatterns = [
+    path("cache/stats/", CacheStatsAPI.as_view(), name="cache-stats"),
+]
@@ -1 +1,59 @@
-# Create your views here.
+"""Core Views."""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.cache import cache_stats
+from core.permissions import IsAdminUser
+
+
+class CacheStatsAPI(APIView):
+    """Cache hits and misses per namespace, of the worker serving the request."""
+
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+
+    def get(self, request):  # noqa
+        return Response(cache_stats())
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, i.e. waiting on payment gateways.
+
+    Served by ASGI, a request awaiting a slow external call holds no
+    thread, so that it does not starve other requests. Authentication,
+    permissions and throttling may query the database, so they run in a
+    thread, as handlers must for queries.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """As `APIView.dispatch`, awaiting the handler."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+
+            # OPTIONS, and methods not allowed, are answered synchronously.
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,17 @@
+"""
+Django command to rebuild donation summaries
+"""
+
+from django.core.management.base import BaseCommand
+
+from donation.services import donation_summaries_rebuild
+
+
+class Command(BaseCommand):
+    """Django command to rebuild campaign and project donation summaries"""
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        self.stdout.write("Rebuilding donation summaries...")
+        donation_summaries_rebuild()
+        self.stdout.write(self.style.SUCCESS("Donation summaries rebuilt!"))
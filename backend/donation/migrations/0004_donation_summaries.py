@@ -0,0 +1,87 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:28
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+import djmoney.models.fields
+
+
+def backfill_donation_summaries(apps, schema_editor):
+    Donation = apps.get_model("donation", "Donation")
+    CampaignDonationSummary = apps.get_model("donation", "CampaignDonationSummary")
+    ProjectDonationSummary = apps.get_model("donation", "ProjectDonationSummary")
+
+    def rollup(group_by):
+        return (
+            Donation.objects.order_by()
+            .values(group_by)
+            .annotate(
+                donations_count=models.Count("id"),
+                donations_total=models.Sum("amount"),
+                last_donation_at=models.Max("created"),
+            )
+        )
+
+    CampaignDonationSummary.objects.bulk_create(
+        [
+            CampaignDonationSummary(
+                campaign_id=row["campaign"],
+                donations_count=row["donations_count"],
+                donations_total=row["donations_total"],
+                last_donation_at=row["last_donation_at"],
+            )
+            for row in rollup("campaign")
+        ],
+        batch_size=500,
+    )
+    ProjectDonationSummary.objects.bulk_create(
+        [
+            ProjectDonationSummary(
+                project_id=row["campaign__project"],
+                donations_count=row["donations_count"],
+                donations_total=row["donations_total"],
+                last_donation_at=row["last_donation_at"],
+            )
+            for row in rollup("campaign__project")
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0004_alter_campaign_options_alter_comment_options'),
+        ('project', '0005_alter_cause_options_alter_project_options'),
+        ('donation', '0003_alter_donation_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignDonationSummary',
+            fields=[
+                ('donations_count', models.PositiveIntegerField(default=0, help_text='Number of donations received.')),
+                ('donations_total_currency', djmoney.models.fields.CurrencyField(choices=[('USD', 'USD')], default='USD', editable=False, max_length=3)),
+                ('donations_total', djmoney.models.fields.MoneyField(currency_choices=[('USD', 'USD')], decimal_places=2, default=Decimal('0'), default_currency='USD', help_text='Total amount of money donated.', max_digits=14)),
+                ('last_donation_at', models.DateTimeField(blank=True, help_text='Time of the most recent donation.', null=True)),
+                ('campaign', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='donation_summary', serialize=False, to='campaign.campaign')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectDonationSummary',
+            fields=[
+                ('donations_count', models.PositiveIntegerField(default=0, help_text='Number of donations received.')),
+                ('donations_total_currency', djmoney.models.fields.CurrencyField(choices=[('USD', 'USD')], default='USD', editable=False, max_length=3)),
+                ('donations_total', djmoney.models.fields.MoneyField(currency_choices=[('USD', 'USD')], decimal_places=2, default=Decimal('0'), default_currency='USD', help_text='Total amount of money donated.', max_digits=14)),
+                ('last_donation_at', models.DateTimeField(blank=True, help_text='Time of the most recent donation.', null=True)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='donation_summary', serialize=False, to='project.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(backfill_donation_summaries, migrations.RunPython.noop),
+    ]
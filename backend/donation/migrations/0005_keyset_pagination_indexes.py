@@ -0,0 +1,21 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0004_donation_summaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['created', 'id'], name='donation_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['campaign', 'created', 'id'], name='donation_campaign_created_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Link donations to the payments their reference matches, in one statement.
+BACKFILL_SQL = """
+UPDATE donation_donation AS donation
+SET payment_fk_id = payment.id
+FROM payment_payment AS payment
+WHERE payment.gateway_payment_id = donation.payment
+"""
+
+REVERSE_BACKFILL_SQL = """
+UPDATE donation_donation AS donation
+SET payment = payment.gateway_payment_id
+FROM payment_payment AS payment
+WHERE payment.id = donation.payment_fk_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0005_payment_campaign'),
+        ('donation', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='payment_fk',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='payment.payment'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, REVERSE_BACKFILL_SQL),
+        migrations.RemoveField(
+            model_name='donation',
+            name='payment',
+        ),
+        migrations.RenameField(
+            model_name='donation',
+            old_name='payment_fk',
+            new_name='payment',
+        ),
+        migrations.AlterField(
+            model_name='donation',
+            name='payment',
+            field=models.ForeignKey(blank=True, help_text='Payment transaction from PayPal/Stripe funding the donation', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='payment.payment'),
+        ),
+    ]
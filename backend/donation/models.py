@@ -8,6 +8,7 @@ from djmoney.models.validators import MinMoneyValidator
 from model_utils.models import TimeStampedModel
 
 from core.services import to_money
+from user.selectors import user_has_role
 
 User = get_user_model()
 
@@ -40,11 +41,13 @@ class Donation(TimeStampedModel):
         help_text="Campaign supported by donation.",
         related_name="donations",
     )
-    payment = models.CharField(
-        max_length=255,
+    payment = models.ForeignKey(
+        "payment.Payment",
+        on_delete=models.SET_NULL,
         blank=True,
         null=True,
-        help_text="Reference of the payment transaction from PayPal/Stripe",
+        related_name="donations",
+        help_text="Payment transaction from PayPal/Stripe funding the donation",
     )
 
     def __str__(self):
@@ -57,7 +60,7 @@ class Donation(TimeStampedModel):
 
         Ensure to use services, so that validation is performed.
         """
-        if self.donor.groups.filter(name="beneficiary").exists():
+        if user_has_role(self.donor, "beneficiary"):
             raise ValidationError({"donor": "Donor cannot be a beneficiary."})
 
         if self.amount <= to_money(0):
@@ -65,3 +68,68 @@ class Donation(TimeStampedModel):
 
     class Meta:  # noqa
         ordering = ["-created"]
+        indexes = [
+            # Keyset pagination, see core.pagination.KeysetPagination.
+            models.Index(fields=["created", "id"], name="donation_created_id_idx"),
+            models.Index(fields=["campaign", "created", "id"], name="donation_campaign_created_idx"),
+        ]
+
+
+class DonationSummary(models.Model):
+    """
+    Denormalized rollup of donations.
+
+    Maintained by donation services, so that totals can be read
+    without aggregating the Donation table.
+    """
+
+    donations_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of donations received.",
+    )
+    donations_total = MoneyField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        default_currency="USD",
+        currency_choices=[("USD", "USD")],
+        help_text="Total amount of money donated.",
+    )
+    last_donation_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Time of the most recent donation.",
+    )
+
+    class Meta:  # noqa
+        abstract = True
+
+
+class CampaignDonationSummary(DonationSummary):
+    """Donation rollup for a campaign."""
+
+    campaign = models.OneToOneField(
+        "campaign.Campaign",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="donation_summary",
+    )
+
+    def __str__(self):
+        """Represent CampaignDonationSummary as string."""
+        return f"CampaignDonationSummary: {self.donations_count} donations to campaign {self.campaign_id}."
+
+
+class ProjectDonationSummary(DonationSummary):
+    """Donation rollup for a project, across all of its campaigns."""
+
+    project = models.OneToOneField(
+        "project.Project",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="donation_summary",
+    )
+
+    def __str__(self):
+        """Represent ProjectDonationSummary as string."""
+        return f"ProjectDonationSummary: {self.donations_count} donations to project {self.project_id}."
@@ -1,13 +1,14 @@
 """Donation selectors."""
 
-from typing import Optional
+from typing import Optional, Type
 
+from django.db.models import F
 from django.db.models.query import QuerySet
 
 from core.utils import get_object
 
 from .filters import DonationFilter
-from .models import Donation
+from .models import Donation, DonationSummary
 
 
 def donation_get(donation_id) -> Optional[Donation]:
@@ -23,3 +24,14 @@ def donation_list(*, filters=None) -> QuerySet[Donation]:
     filters = filters or {}
     qs = Donation.objects.all()
     return DonationFilter(filters, qs).qs
+
+
+def donation_summary_list(model: Type[DonationSummary]) -> QuerySet[DonationSummary]:
+    """
+    Donation summaries of a kind, i.e. ProjectDonationSummary.
+
+    Their last donation is annotated as `modified`, so that catalogs are
+    validated against summaries (one row per project or campaign) rather
+    than the Donation table.
+    """
+    return model.objects.annotate(modified=F("last_donation_at"))
@@ -4,11 +4,16 @@ from typing import Optional
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count, F, Max, Sum
 
 from campaign.models import Campaign
+from core.conditional import CATALOG_CAMPAIGNS, CATALOG_PROJECTS, catalog_invalidate
 from core.services import Amount, to_money
+from payment.models import Payment
+from project.models import Project
+from project.services import project_donations_total_percentage_invalidate
 
-from .models import Donation
+from .models import CampaignDonationSummary, Donation, ProjectDonationSummary
 
 User = get_user_model()
 
@@ -20,16 +25,202 @@ def donation_create(
     amount: Amount,
     description: Optional[str] = None,
     campaign: Campaign,
+    payment: Optional[Payment] = None,
 ) -> Donation:
-    """Create Donation for Campaign."""
+    """Create Donation for Campaign, funded by payment if any."""
     amount = to_money(amount)
     donation = Donation(
         donor=donor,
         amount=amount,
         description=description,
         campaign=campaign,
+        payment=payment,
     )
     donation.full_clean()
     donation.save()
 
+    _donation_summaries_add(donation)
+
     return donation
+
+
+@transaction.atomic
+def donation_delete(*, donation: Donation) -> None:
+    """
+    Delete Donation, i.e. when it is refunded.
+
+    Donation summaries of the campaign and its project are recomputed.
+    """
+    campaign = donation.campaign
+    donation.delete()
+
+    campaign_donation_summary_refresh(campaign=campaign)
+    project_donation_summary_refresh(project=campaign.project)
+
+
+@transaction.atomic
+def donations_from_payments_create(*, payment_ids) -> int:
+    """
+    Create donations of completed payments to campaigns, in bulk.
+
+    Payments which fund a donation already are skipped. Donation summaries
+    of the campaigns and projects concerned are recomputed. Returns the
+    number of donations created.
+    """
+    payments = (
+        Payment.objects.filter(
+            id__in=payment_ids,
+            status=Payment.Status.COMPLETED,
+            campaign__isnull=False,
+            donations__isnull=True,
+        )
+        .select_related("campaign")
+        .order_by("id")
+    )
+    donations = Donation.objects.bulk_create(
+        [
+            Donation(donor_id=payment.user_id, amount=payment.amount, campaign=payment.campaign, payment=payment)
+            for payment in payments
+        ],
+        batch_size=500,
+    )
+
+    campaigns = {donation.campaign_id: donation.campaign for donation in donations}
+    for campaign in campaigns.values():
+        campaign_donation_summary_refresh(campaign=campaign)
+    for project in Project.objects.filter(campaigns__id__in=campaigns.keys()).distinct():
+        project_donation_summary_refresh(project=project)
+
+    return len(donations)
+
+
+@transaction.atomic
+def donations_from_payments_delete(*, payment_ids) -> int:
+    """
+    Delete donations funded by payments, i.e. refunded or put on hold.
+
+    Donation summaries of the campaigns and projects concerned are
+    recomputed. Returns the number of donations deleted.
+    """
+    donations = Donation.objects.filter(payment_id__in=payment_ids)
+    campaign_ids = set(donations.values_list("campaign_id", flat=True))
+
+    if not campaign_ids:
+        return 0
+
+    deleted, _ = donations.delete()
+
+    for campaign in Campaign.objects.filter(id__in=campaign_ids):
+        campaign_donation_summary_refresh(campaign=campaign)
+    for project in Project.objects.filter(campaigns__id__in=campaign_ids).distinct():
+        project_donation_summary_refresh(project=project)
+
+    return deleted
+
+
+def _donation_summaries_add(donation: Donation) -> None:
+    """Add donation to the summaries of its campaign and project."""
+    changes = {
+        "donations_count": F("donations_count") + 1,
+        "donations_total": F("donations_total") + donation.amount,
+        "last_donation_at": donation.created,
+    }
+
+    CampaignDonationSummary.objects.get_or_create(campaign_id=donation.campaign_id)
+    CampaignDonationSummary.objects.filter(campaign_id=donation.campaign_id).update(**changes)
+
+    project_id = donation.campaign.project_id
+    ProjectDonationSummary.objects.get_or_create(project_id=project_id)
+    ProjectDonationSummary.objects.filter(project_id=project_id).update(**changes)
+    project_donations_total_percentage_invalidate(project_ids=[project_id])
+    catalog_invalidate(CATALOG_PROJECTS, CATALOG_CAMPAIGNS)
+
+
+def _donation_summary_defaults(donations) -> dict:
+    """Aggregate donations into donation summary fields."""
+    aggregate = donations.aggregate(
+        donations_count=Count("id"),
+        donations_total=Sum("amount"),
+        last_donation_at=Max("created"),
+    )
+
+    return {
+        "donations_count": aggregate["donations_count"],
+        "donations_total": to_money(aggregate["donations_total"] or 0),
+        "last_donation_at": aggregate["last_donation_at"],
+    }
+
+
+@transaction.atomic
+def campaign_donation_summary_refresh(*, campaign: Campaign) -> CampaignDonationSummary:
+    """Recompute donation summary of campaign from its donations."""
+    summary, _ = CampaignDonationSummary.objects.update_or_create(
+        campaign=campaign,
+        defaults=_donation_summary_defaults(Donation.objects.filter(campaign=campaign)),
+    )
+    catalog_invalidate(CATALOG_CAMPAIGNS)
+
+    return summary
+
+
+@transaction.atomic
+def project_donation_summary_refresh(*, project: Project) -> ProjectDonationSummary:
+    """Recompute donation summary of project from the donations of its campaigns."""
+    summary, _ = ProjectDonationSummary.objects.update_or_create(
+        project=project,
+        defaults=_donation_summary_defaults(Donation.objects.filter(campaign__project=project)),
+    )
+    project_donations_total_percentage_invalidate(project_ids=[project.pk])
+    catalog_invalidate(CATALOG_PROJECTS)
+
+    return summary
+
+
+@transaction.atomic
+def donation_summaries_rebuild() -> None:
+    """
+    Rebuild all donation summaries from the Donation table.
+
+    Use after loading donations without services, i.e. from fixtures.
+    """
+
+    def rollup(group_by: str):
+        return (
+            Donation.objects.order_by()
+            .values(group_by)
+            .annotate(
+                donations_count=Count("id"),
+                donations_total=Sum("amount"),
+                last_donation_at=Max("created"),
+            )
+        )
+
+    CampaignDonationSummary.objects.all().delete()
+    CampaignDonationSummary.objects.bulk_create(
+        [
+            CampaignDonationSummary(
+                campaign_id=row["campaign"],
+                donations_count=row["donations_count"],
+                donations_total=to_money(row["donations_total"]),
+                last_donation_at=row["last_donation_at"],
+            )
+            for row in rollup("campaign")
+        ],
+        batch_size=500,
+    )
+
+    ProjectDonationSummary.objects.all().delete()
+    ProjectDonationSummary.objects.bulk_create(
+        [
+            ProjectDonationSummary(
+                project_id=row["campaign__project"],
+                donations_count=row["donations_count"],
+                donations_total=to_money(row["donations_total"]),
+                last_donation_at=row["last_donation_at"],
+            )
+            for row in rollup("campaign__project")
+        ],
+        batch_size=500,
+    )
+    project_donations_total_percentage_invalidate(project_ids=Project.objects.values_list("pk", flat=True))
+    catalog_invalidate(CATALOG_PROJECTS, CATALOG_CAMPAIGNS)
@@ -50,8 +50,8 @@ class DonationAPITestCase(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.donation.id)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.donation.id)
 
     def test_retrieve_donation_detail(self):
         """Test retrieving a specific donation."""
@@ -5,10 +5,11 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 from djmoney.money import Money
 
-from campaign.services import campaign_create
-from donation.models import Donation
+from campaign.services import campaign_create, campaign_delete, campaign_update
+from donation.models import CampaignDonationSummary, Donation, ProjectDonationSummary
 from donation.selectors import donation_get, donation_list
-from donation.services import donation_create
+from donation.services import donation_create, donation_delete, donations_from_payments_delete
+from payment.models import Payment
 from project.services import project_create
 
 User = get_user_model()
@@ -212,3 +213,113 @@ class DonationSelectorTest(TestCase):
 
         self.assertEqual(donations_for_campaign_1.count(), 2)
         self.assertNotIn(extra_donation, donations_for_campaign_1)
+
+
+class DonationSummaryTest(TestCase):
+    """Test suite for the donation summaries maintained by Donation services."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(email="donor@example.com", password="testpass")
+        self.owner = User.objects.create_user(email="owner@example.com", password="testpass")
+
+        self.project1 = project_create(
+            name="Project A",
+            target=Money(10000, "USD"),
+            city="City",
+            country="Country",
+        )
+        self.project2 = project_create(
+            name="Project B",
+            target=Money(20000, "USD"),
+            city="City",
+            country="Country",
+        )
+
+        self.campaign1 = campaign_create(
+            title="Education for All",
+            description="Education for All",
+            project=self.project1,
+            owner=self.user,
+            target=Money(5000, "USD"),
+        )
+        self.campaign2 = campaign_create(
+            title="Clean Water Initiative",
+            description="Clean Water Initiative",
+            project=self.project1,
+            owner=self.owner,
+            target=Money(8000, "USD"),
+        )
+
+    def test_donation_create_updates_summaries(self):
+        """Test that creating donations accumulates campaign and project summaries."""
+        donation_create(donor=self.user, amount=100, campaign=self.campaign1)
+        donation = donation_create(donor=self.user, amount=50, campaign=self.campaign2)
+
+        campaign_summary = CampaignDonationSummary.objects.get(campaign=self.campaign1)
+        self.assertEqual(campaign_summary.donations_count, 1)
+        self.assertEqual(campaign_summary.donations_total, Money(100, "USD"))
+
+        project_summary = ProjectDonationSummary.objects.get(project=self.project1)
+        self.assertEqual(project_summary.donations_count, 2)
+        self.assertEqual(project_summary.donations_total, Money(150, "USD"))
+        self.assertEqual(project_summary.last_donation_at, donation.created)
+
+    def test_donation_delete_updates_summaries(self):
+        """Test that deleting a donation removes it from the summaries."""
+        first = donation_create(donor=self.user, amount=100, campaign=self.campaign1)
+        second = donation_create(donor=self.user, amount=40, campaign=self.campaign1)
+
+        donation_delete(donation=second)
+
+        campaign_summary = CampaignDonationSummary.objects.get(campaign=self.campaign1)
+        self.assertEqual(campaign_summary.donations_count, 1)
+        self.assertEqual(campaign_summary.donations_total, Money(100, "USD"))
+        self.assertEqual(campaign_summary.last_donation_at, first.created)
+
+        project_summary = ProjectDonationSummary.objects.get(project=self.project1)
+        self.assertEqual(project_summary.donations_count, 1)
+        self.assertEqual(project_summary.donations_total, Money(100, "USD"))
+
+    def test_campaign_reassignment_moves_project_summary(self):
+        """Test that moving a campaign between projects moves its donations between project summaries."""
+        donation_create(donor=self.user, amount=100, campaign=self.campaign1)
+        donation_create(donor=self.user, amount=25, campaign=self.campaign2)
+
+        campaign_update(campaign=self.campaign2, data={"project": self.project2})
+
+        self.assertEqual(
+            ProjectDonationSummary.objects.get(project=self.project1).donations_total,
+            Money(100, "USD"),
+        )
+        self.assertEqual(
+            ProjectDonationSummary.objects.get(project=self.project2).donations_total,
+            Money(25, "USD"),
+        )
+
+    def test_campaign_delete_updates_project_summary(self):
+        """Test that deleting a campaign removes its donations from the project summary."""
+        donation_create(donor=self.user, amount=100, campaign=self.campaign1)
+        donation_create(donor=self.user, amount=25, campaign=self.campaign2)
+
+        campaign_delete(campaign=self.campaign2)
+
+        project_summary = ProjectDonationSummary.objects.get(project=self.project1)
+        self.assertEqual(project_summary.donations_count, 1)
+        self.assertEqual(project_summary.donations_total, Money(100, "USD"))
+
+    def test_donations_from_payments_delete_updates_summaries(self):
+        """Test that deleting the donations of refunded payments removes them from the summaries."""
+        payment = Payment.objects.create(
+            user=self.user, platform=Payment.Platforms.STRIPE, gateway_payment_id="pi_1", amount=40
+        )
+        donation_create(donor=self.user, amount=100, campaign=self.campaign1)
+        donation_create(donor=self.user, amount=40, campaign=self.campaign2, payment=payment)
+
+        self.assertEqual(donations_from_payments_delete(payment_ids=[payment.id]), 1)
+        self.assertEqual(donations_from_payments_delete(payment_ids=[payment.id]), 0)
+
+        self.assertEqual(CampaignDonationSummary.objects.get(campaign=self.campaign2).donations_count, 0)
+        project_summary = ProjectDonationSummary.objects.get(project=self.project1)
+        self.assertEqual(project_summary.donations_count, 1)
+        self.assertEqual(project_summary.donations_total, Money(100, "USD"))
@@ -4,6 +4,8 @@ from django.contrib.auth import get_user_model
 from rest_framework import permissions, serializers
 from rest_framework.generics import ListCreateAPIView, RetrieveAPIView
 
+from core.pagination import KeysetPagination
+
 from .models import Donation
 from .selectors import donation_list
 from .services import donation_create
@@ -48,6 +50,8 @@ class DonationListCreateAPI(ListCreateAPIView):
             model = Donation
             fields = ("id", "donor", "amount", "campaign", "payment")
 
+    pagination_class = KeysetPagination
+
     def get_permissions(self):
         """Get permissions by action."""
         if self.request.method == "GET":
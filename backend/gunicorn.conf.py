@@ -0,0 +1,50 @@
+"""
+Gunicorn settings of the production serving mode.
+
+gunicorn reads this file from the working directory:
+gunicorn app.wsgi:application
+or, with GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker:
+gunicorn app.asgi:application
+
+Every setting can be overridden with an environment variable, i.e.
+GUNICORN_WORKERS=8. Send HUP to the master to reload workers gracefully,
+TTIN/TTOU to add or remove a worker.
+"""
+
+import multiprocessing
+import os
+
+
+def _cpu_count() -> int:
+    """CPUs this process may run on, which a container may limit below the host's."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests are mostly waiting on the database, so two workers per core,
+# each with a few threads, keep every core busy.
+workers = int(os.environ.get("GUNICORN_WORKERS", 2 * _cpu_count() + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+# Threads of gthread workers; uvicorn workers run an event loop instead.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Workers silent for longer are killed and replaced, as a request timeout.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+# Time workers have to finish their requests on reload or shutdown.
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Longer than nginx's upstream keepalive, so that nginx closes connections first.
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 75))
+
+# Recycle workers now and then, staggered, to bound memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+# Heartbeats on tmpfs, as /tmp may be on a slow overlay filesystem in containers.
+worker_tmp_dir = os.environ.get("GUNICORN_WORKER_TMP_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
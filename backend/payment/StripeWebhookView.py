@@ -1,3 +1,4 @@
+import json
 import logging
 
 import stripe
@@ -8,9 +9,7 @@ from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import extend_schema
 from rest_framework.views import APIView
 
-from .models import Payment
-from .selectors import payment_get
-from .services.stripe import stripe_payment_capture
+from .services.stripe import stripe_webhook_event_create
 
 logger = logging.getLogger("payment")
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -19,7 +18,7 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 @extend_schema(exclude=True)
 @method_decorator(csrf_exempt, name="dispatch")
 class StripeWebhookView(APIView):
-    """Handle Stripe Webhook events."""
+    """Verify Stripe Webhook events, and queue them for processing."""
 
     def post(self, request, *args, **kwargs):
         payload = request.body
@@ -27,44 +26,17 @@ class StripeWebhookView(APIView):
         endpoint_secret = settings.STRIPE_WEBHOOK_SECRET
 
         try:
-            event = stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
+            stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
         except stripe.error.SignatureVerificationError as e:
-            logger.error(f"Stripe webhook signature verification failed: {e}")
+            logger.error("Stripe webhook signature verification failed: %s", e)
             return HttpResponse(status=400)
 
-        event_type = event["type"]
-        data = event["data"]["object"]
-
-        if event_type == "payment_intent.succeeded":
-            payment_id = data["id"]
-            stripe_payment_capture(
-                payment_id=payment_id,
-                capture_payment_func=lambda user, amount: logger.info(f"Credited {amount} to {user}"),
-            )
-            logger.info(f"PaymentIntent {payment_id} succeeded.")
-
-        elif event_type == "payment_intent.payment_failed":
-            payment_id = data["id"]
-            error_msg = data["last_payment_error"]["message"] if data.get("last_payment_error") else "Unknown error"
-            payment = payment_get(gateway_payment_id=payment_id)
-            if payment:
-                payment.status = Payment.Status.FAILED
-                payment.save(update_fields=["status"])
-                logger.warning(f"PaymentIntent {payment_id} failed: {error_msg}")
-            else:
-                logger.warning(f"PaymentIntent {payment_id} failed but not found in DB.")
-
-        elif event_type == "charge.refunded":
-            charge_id = data["id"]
-            payment = payment_get(gateway_payment_id=charge_id)
-            if payment:
-                payment.status = Payment.Status.REFUNDED
-                payment.save(update_fields=["status"])
-                logger.info(f"Charge {charge_id} refunded.")
-            else:
-                logger.warning(f"Refund event for charge {charge_id} not found in DB.")
+        # Processed by `webhook_events_process` workers, so that Stripe is answered fast.
+        webhook_event, created = stripe_webhook_event_create(payload=json.loads(payload))
 
+        if created:
+            logger.info("Stripe event %s (%s) received.", webhook_event.event_id, webhook_event.event_type)
         else:
-            logger.debug(f"Unhandled Stripe event: {event_type}")
+            logger.info("Stripe event %s redelivered, skipped.", webhook_event.event_id)
 
         return JsonResponse({"status": "ok"})
@@ -1,9 +1,10 @@
 """Payment admin."""
 
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .models import Payment
+from .models import Payment, Payout, PayoutItem, WebhookEvent
 
 
 @admin.register(Payment)
@@ -54,3 +55,65 @@ class PaymentAdmin(admin.ModelAdmin):
     @admin.action(description="Mark selected payments as Failed")
     def mark_as_failed(self, request, queryset):
         queryset.update(status=Payment.Status.FAILED)
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "event_id",
+        "provider",
+        "event_type",
+        "status",
+        "attempts",
+        "created",
+        "processed_at",
+        "processing_latency",
+    )
+    list_filter = (
+        "provider",
+        "status",
+        "event_type",
+    )
+    search_fields = (
+        "event_id",
+        "ordering_key",
+    )
+    readonly_fields = ("created", "modified", "processed_at", "processing_latency")
+    ordering = ("-created",)
+
+    actions = ["retry_now"]
+
+    @admin.action(description="Retry selected events now")
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=WebhookEvent.Status.PROCESSED).update(
+            status=WebhookEvent.Status.PENDING,
+            next_attempt_at=timezone.now(),
+        )
+
+
+class PayoutItemInline(admin.TabularInline):
+    model = PayoutItem
+    fields = ("bank_account", "amount", "status", "sender_item_id", "payout_item_id")
+    readonly_fields = fields
+    raw_id_fields = ("bank_account",)
+    extra = 0
+    can_delete = False
+
+
+@admin.register(Payout)
+class PayoutAdmin(admin.ModelAdmin):
+    list_display = (
+        "sender_batch_id",
+        "payout_batch_id",
+        "status",
+        "period_end",
+        "created",
+    )
+    list_filter = ("status",)
+    search_fields = (
+        "sender_batch_id",
+        "payout_batch_id",
+    )
+    readonly_fields = ("created", "modified")
+    ordering = ("-created",)
+    inlines = [PayoutItemInline]
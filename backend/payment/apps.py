@@ -1,6 +1,14 @@
+import logging
+
 from django.apps import AppConfig
 
 
 class PaymentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "payment"
+
+    def ready(self):
+        from .log import queue_handlers
+
+        # Write payment logs off the request thread.
+        queue_handlers(logging.getLogger("payment"))
@@ -0,0 +1,342 @@
+"""Payment gateway clients."""
+
+import asyncio
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+import stripe
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PayPalClient:
+    """
+    PayPal REST API client.
+
+    Requests share one pooled `requests.Session`, so that connections to
+    PayPal are kept alive. The OAuth access token is cached until shortly
+    before it expires, and refreshed by one thread at a time.
+
+    Failed connections, 429 and 5xx responses are retried with backoff.
+    Every call sends a `PayPal-Request-Id`, so that PayPal processes a
+    retried POST only once. Callers pass their own `request_id` to have a
+    POST sent again later answered with the first response.
+    """
+
+    # Refresh tokens this many seconds before they expire.
+    TOKEN_EXPIRY_MARGIN = 60
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        client_id: Optional[str],
+        secret: Optional[str],
+        timeout: Tuple[float, float] = (5, 30),
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id
+        self.secret = secret
+        self.timeout = timeout
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=pool_maxsize)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+    def access_token(self) -> str:
+        """OAuth access token, cached until shortly before it expires."""
+        token = self._token
+
+        if token and time.monotonic() < self._token_expires_at:
+            return token
+
+        with self._token_lock:
+            # Another thread may have refreshed the token meanwhile.
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            response = self.session.post(
+                f"{self.base_url}/v1/oauth2/token",
+                auth=(self.client_id, self.secret),
+                data={"grant_type": "client_credentials"},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            self._token = data.get("access_token", "")
+            self._token_expires_at = time.monotonic() + int(data.get("expires_in", 0)) - self.TOKEN_EXPIRY_MARGIN
+
+            return self._token
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop cached token, unless it was refreshed already."""
+        with self._token_lock:
+            if self._token == token:
+                self._token = None
+
+    def get(self, path: str, *, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET from PayPal API and return its JSON response."""
+        return self._request("GET", path, params=params)
+
+    def post(
+        self, path: str, *, json: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """POST to PayPal API and return its JSON response."""
+        return self._request("POST", path, json=json, request_id=request_id)
+
+    def _request(self, method: str, path: str, *, request_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Send request to PayPal API and return its JSON response.
+
+        A request rejected with 401 is retried once with a new token, i.e.
+        when the token was revoked before it expired.
+        """
+        request_id = request_id or str(uuid.uuid4())
+
+        for attempt in range(2):
+            token = self.access_token()
+            response = self.session.request(
+                method,
+                f"{self.base_url}{path}",
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {token}",
+                    "PayPal-Request-Id": request_id,
+                },
+                timeout=self.timeout,
+                **kwargs,
+            )
+
+            if response.status_code == 401 and attempt == 0:
+                self.invalidate_token(token)
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+
+_paypal_client: Optional[PayPalClient] = None
+_paypal_client_lock = threading.Lock()
+
+
+def paypal_client() -> PayPalClient:
+    """PayPal client of the process, configured from settings."""
+    global _paypal_client
+
+    if _paypal_client is None:
+        with _paypal_client_lock:
+            if _paypal_client is None:
+                _paypal_client = PayPalClient(
+                    base_url=settings.PAYPAL_BASE_URL,
+                    client_id=settings.PAYPAL_CLIENT_ID,
+                    secret=settings.PAYPAL_SECRET_KEY,
+                    timeout=(settings.PAYPAL_CONNECT_TIMEOUT, settings.PAYPAL_READ_TIMEOUT),
+                    max_retries=settings.PAYPAL_MAX_RETRIES,
+                )
+
+    return _paypal_client
+
+
+class AsyncPayPalClient:
+    """
+    PayPal REST API client for coroutines, i.e. of async views.
+
+    As PayPalClient, over a pooled `httpx.AsyncClient`, so that a request
+    waiting on PayPal holds no thread. Pooled connections belong to the
+    event loop they were opened on, see `async_paypal_client`.
+    """
+
+    TOKEN_EXPIRY_MARGIN = PayPalClient.TOKEN_EXPIRY_MARGIN
+    RETRY_STATUSES = PayPalClient.RETRY_STATUSES
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        client_id: Optional[str],
+        secret: Optional[str],
+        timeout: Tuple[float, float] = (5, 30),
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 50,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id
+        self.secret = secret
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        self.http = httpx.AsyncClient(
+            # Failed connections are retried by the transport, statuses by `_send`.
+            transport=httpx.AsyncHTTPTransport(retries=max_retries, limits=limits),
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+        )
+
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def access_token(self) -> str:
+        """OAuth access token, cached until shortly before it expires."""
+        if self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+
+        async with self._token_lock:
+            # Another request may have refreshed the token meanwhile.
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            response = await self._send(
+                "POST",
+                "/v1/oauth2/token",
+                auth=(self.client_id or "", self.secret or ""),
+                data={"grant_type": "client_credentials"},
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            self._token = data.get("access_token", "")
+            self._token_expires_at = time.monotonic() + int(data.get("expires_in", 0)) - self.TOKEN_EXPIRY_MARGIN
+
+            return self._token
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop cached token, unless it was refreshed already."""
+        if self._token == token:
+            self._token = None
+
+    async def get(self, path: str, *, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET from PayPal API and return its JSON response."""
+        return await self._request("GET", path, params=params)
+
+    async def post(self, path: str, *, json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """POST to PayPal API and return its JSON response."""
+        return await self._request("POST", path, json=json)
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send request to PayPal API and return its JSON response.
+
+        A request rejected with 401 is retried once with a new token.
+        """
+        request_id = str(uuid.uuid4())
+
+        for attempt in range(2):
+            token = await self.access_token()
+            response = await self._send(
+                method,
+                path,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {token}",
+                    "PayPal-Request-Id": request_id,
+                },
+                **kwargs,
+            )
+
+            if response.status_code == 401 and attempt == 0:
+                self.invalidate_token(token)
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send request, retrying 429 and 5xx responses with backoff."""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
+
+            response = await self.http.request(method, f"{self.base_url}{path}", **kwargs)
+
+            if response.status_code not in self.RETRY_STATUSES:
+                break
+
+        return response
+
+
+_async_paypal_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPayPalClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_stripe_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[tuple, stripe.StripeClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def async_paypal_client() -> AsyncPayPalClient:
+    """
+    PayPal client of the running event loop, configured from settings.
+
+    Under ASGI, a worker runs one loop, so its requests share a pool.
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop not in _async_paypal_clients:
+        _async_paypal_clients[loop] = AsyncPayPalClient(
+            base_url=settings.PAYPAL_BASE_URL,
+            client_id=settings.PAYPAL_CLIENT_ID,
+            secret=settings.PAYPAL_SECRET_KEY,
+            timeout=(settings.PAYPAL_CONNECT_TIMEOUT, settings.PAYPAL_READ_TIMEOUT),
+            max_retries=settings.PAYPAL_MAX_RETRIES,
+        )
+
+    return _async_paypal_clients[loop]
+
+
+def async_stripe_client() -> stripe.StripeClient:
+    """
+    Stripe client of the running event loop, over a pooled `httpx.AsyncClient`.
+
+    Configured from the `stripe` module, as the synchronous calls are.
+    """
+    loop = asyncio.get_running_loop()
+    config = (stripe.api_key, stripe.api_base)
+    config_client = _async_stripe_clients.get(loop)
+
+    if config_client is None or config_client[0] != config:
+        client = stripe.StripeClient(
+            api_key=stripe.api_key or "",
+            base_addresses={"api": stripe.api_base},
+            http_client=stripe.HTTPXClient(),
+            max_network_retries=stripe.max_network_retries,
+        )
+        config_client = _async_stripe_clients[loop] = (config, client)
+
+    return config_client[1]
+
+
+@receiver(setting_changed)
+def _paypal_client_reset(*, setting, **kwargs):
+    """Configure new clients when PayPal settings change, i.e. in tests."""
+    global _paypal_client
+
+    if setting.startswith("PAYPAL_"):
+        _paypal_client = None
+        _async_paypal_clients.clear()
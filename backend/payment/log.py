@@ -0,0 +1,135 @@
+"""
+Payment logging.
+
+Records of the "payment" logger are put on a queue by the calling thread,
+and written by a listener thread, so that requests do not block on stdout.
+Every record carries the correlation id of the request (or webhook event)
+it was logged for.
+
+Usage:
+logger = logging.getLogger("payment")
+logger.info("Payment %s captured.", payment_id)
+"""
+
+import atexit
+import logging
+import queue
+import re
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+CORRELATION_ID_HEADER = "X-Request-ID"
+# Ids accepted from clients/proxies: written to every log line, so no control characters or newlines.
+CORRELATION_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+_correlation_id: ContextVar[str] = ContextVar("correlation_id", default="-")
+
+
+def correlation_id_get() -> str:
+    """Correlation id of the current request, "-" outside of one."""
+    return _correlation_id.get()
+
+
+def correlation_id_set(correlation_id: Optional[str] = None):
+    """Set correlation id of the current context (a new one by default), returns a token to reset it."""
+    return _correlation_id.set(correlation_id or uuid.uuid4().hex)
+
+
+def correlation_id_reset(token) -> None:
+    """Restore correlation id from before `correlation_id_set`."""
+    _correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Add `correlation_id` to records, unless set already (i.e. before being queued)."""
+
+    def filter(self, record):  # noqa
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = _correlation_id.get()
+        return True
+
+
+class CorrelationIdMiddleware:
+    """
+    Tag logs of a request with its X-Request-ID header, or a new id.
+
+    The id is returned in the X-Request-ID header of the response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        # Served by ASGI, stay async, so that async views run on the event loop.
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = correlation_id_set(self._request_correlation_id(request))
+
+        try:
+            response = self.get_response(request)
+            response[CORRELATION_ID_HEADER] = _correlation_id.get()
+            return response
+        finally:
+            correlation_id_reset(token)
+
+    async def __acall__(self, request):
+        token = correlation_id_set(self._request_correlation_id(request))
+
+        try:
+            response = await self.get_response(request)
+            response[CORRELATION_ID_HEADER] = _correlation_id.get()
+            return response
+        finally:
+            correlation_id_reset(token)
+
+    @staticmethod
+    def _request_correlation_id(request) -> Optional[str]:
+        correlation_id = request.headers.get(CORRELATION_ID_HEADER, "")
+        return correlation_id if CORRELATION_ID_PATTERN.fullmatch(correlation_id) else None
+
+
+class _QueueListener(QueueListener):
+    """Queue listener which may be stopped more than once, i.e. before exit."""
+
+    def stop(self):  # noqa
+        if self._thread is not None:
+            super().stop()
+
+
+def queue_handlers(logger: logging.Logger) -> Optional[QueueListener]:
+    """
+    Move handlers of logger behind a queue, written to by a listener thread.
+
+    The correlation id is read when the record is queued, in the thread
+    which logged it. Returns the started listener, stopped (and flushed)
+    at exit.
+    """
+    handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+
+    if not handlers:
+        return None
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(CorrelationIdFilter())
+    listener = _QueueListener(records, *handlers, respect_handler_level=True)
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    return listener
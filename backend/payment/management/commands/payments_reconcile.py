@@ -0,0 +1,39 @@
+"""
+Django command to reconcile pending payments
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from payment.services import payments_reconcile
+
+
+class Command(BaseCommand):
+    """Django command to reconcile pending payments with Stripe and PayPal"""
+
+    help = (
+        "Look up pending payments on their gateway, in chunks, and update those "
+        "completed, failed, cancelled or refunded meanwhile. Meant to run periodically, i.e. hourly."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=60,
+            help="Reconcile payments pending for more than this many minutes.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500, help="Payments per chunk.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        updated = payments_reconcile(
+            older_than=timedelta(minutes=options["older_than"]),
+            chunk_size=options["chunk_size"],
+        )
+
+        for status, count in sorted(updated.items()):
+            self.stdout.write(f"{status}: {count}")
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {sum(updated.values())} pending payments."))
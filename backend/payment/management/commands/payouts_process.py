@@ -0,0 +1,30 @@
+"""
+Django command to pay out beneficiaries
+"""
+
+from django.core.management.base import BaseCommand
+
+from payment.services import payouts_create, payouts_process
+
+
+class Command(BaseCommand):
+    """Django command to create, send and poll PayPal payout batches"""
+
+    help = (
+        "Send new PayPal payout batches and poll unfinished ones. With --create, first batch up "
+        "what beneficiaries are owed from donations since their last payout."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--create", action="store_true", help="Create payout batches of amounts owed now.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        if options["create"]:
+            payouts = payouts_create()
+            self.stdout.write(f"Created {len(payouts)} payout batches.")
+
+        counts = payouts_process()
+        self.stdout.write(
+            self.style.SUCCESS(f"Submitted {counts['submitted']} and polled {counts['polled']} payout batches.")
+        )
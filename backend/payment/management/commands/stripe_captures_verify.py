@@ -0,0 +1,31 @@
+"""
+Django command to verify Stripe captures
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from payment.services import stripe_captures_verify
+
+
+class Command(BaseCommand):
+    """Django command to verify recently completed Stripe payments against Stripe"""
+
+    help = (
+        "Verify Stripe payments completed from webhook events against Stripe, "
+        "and put those not succeeded on Stripe on hold. Meant to run periodically, i.e. hourly."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--hours", type=int, default=24, help="Verify payments created in the last hours.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        unverified_ids = stripe_captures_verify(since=timezone.now() - timedelta(hours=options["hours"]))
+
+        if unverified_ids:
+            self.stdout.write(self.style.WARNING(f"Put on hold: {', '.join(unverified_ids)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All Stripe captures verified."))
@@ -0,0 +1,50 @@
+"""
+Django command to process received webhook events
+"""
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from payment.services import webhook_events_process
+
+
+class Command(BaseCommand):
+    """Django command to process webhook events with a pool of workers"""
+
+    help = (
+        "Process pending webhook events with a pool of worker threads. "
+        "Events of the same payment are processed in order, failed events are retried with backoff."
+    )
+
+    def add_arguments(self, parser):  # noqa
+        parser.add_argument("--workers", type=int, default=4, help="Number of worker threads.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when no event is due.")
+        parser.add_argument("--once", action="store_true", help="Exit once no event is due.")
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        processed = []
+
+        def work():
+            try:
+                while True:
+                    processed.append(webhook_events_process())
+
+                    if options["once"]:
+                        return
+
+                    time.sleep(options["poll_interval"])
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=work, daemon=True) for _ in range(options["workers"])]
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {sum(processed)} webhook events."))
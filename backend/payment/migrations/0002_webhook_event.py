@@ -0,0 +1,76 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:07
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payment", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "provider",
+                    models.CharField(
+                        choices=[("PAYPAL", "PayPal"), ("STRIPE", "Stripe"), ("OTHER", "Other")], max_length=20
+                    ),
+                ),
+                ("event_id", models.CharField(db_index=True, help_text="Event id of the platform.", max_length=255)),
+                ("event_type", models.CharField(max_length=255)),
+                (
+                    "ordering_key",
+                    models.CharField(
+                        blank=True, help_text="Events with the same key are processed in order.", max_length=255
+                    ),
+                ),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("PENDING", "Pending"), ("PROCESSED", "Processed"), ("FAILED", "Failed")],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Webhook Event",
+                "verbose_name_plural": "Webhook Events",
+                "ordering": ["created", "id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "PENDING")),
+                        fields=["next_attempt_at", "id"],
+                        name="webhook_event_due_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("status", "PENDING")),
+                        fields=["ordering_key", "created", "id"],
+                        name="webhook_event_ordering_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
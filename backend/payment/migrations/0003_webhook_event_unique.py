@@ -0,0 +1,53 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+def delete_duplicate_events(apps, schema_editor):
+    WebhookEvent = apps.get_model("payment", "WebhookEvent")
+
+    duplicates = (
+        WebhookEvent.objects.order_by()
+        .values("provider", "event_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        events = WebhookEvent.objects.filter(provider=duplicate["provider"], event_id=duplicate["event_id"])
+        # Keep the processed event if any, the earliest otherwise.
+        keep = events.order_by(models.Case(models.When(status="PROCESSED", then=0), default=1), "id").first()
+        events.exclude(id=keep.id).delete()
+
+
+def set_processing_latency(apps, schema_editor):
+    WebhookEvent = apps.get_model("payment", "WebhookEvent")
+    WebhookEvent.objects.filter(processed_at__isnull=False).update(
+        processing_latency=models.F("processed_at") - models.F("created")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_webhook_event'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_events, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='processing_latency',
+            field=models.DurationField(blank=True, help_text='Time from receipt until processed.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='webhookevent',
+            name='event_id',
+            field=models.CharField(help_text='Event id of the platform.', max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='webhookevent',
+            constraint=models.UniqueConstraint(fields=('provider', 'event_id'), name='unique_webhook_event'),
+        ),
+        migrations.RunPython(set_processing_latency, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0003_webhook_event_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['id'], name='payment_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0006_search_indexes'),
+        ('payment', '0004_payment_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='campaign',
+            field=models.ForeignKey(blank=True, help_text='Campaign to donate the payment to, once captured.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='campaign.campaign'),
+        ),
+    ]
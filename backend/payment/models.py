@@ -3,6 +3,7 @@
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from djmoney.models.fields import MoneyField
 from djmoney.money import Money
@@ -42,6 +43,14 @@ class Payment(TimeStampedModel):
         choices=Platforms.choices,
         help_text="The external payment platform used.",
     )
+    campaign = models.ForeignKey(
+        "campaign.Campaign",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="payments",
+        help_text="Campaign to donate the payment to, once captured.",
+    )
     gateway_payment_id = models.CharField(max_length=255, unique=True)
     amount = MoneyField(
         max_digits=14,
@@ -60,6 +69,10 @@ class Payment(TimeStampedModel):
         verbose_name = "Payment"
         verbose_name_plural = "Payments"
         ordering = ["-created"]
+        indexes = [
+            # Reconciliation walks pending payments by id.
+            models.Index(fields=["id"], name="payment_pending_idx", condition=models.Q(status="PENDING")),
+        ]
 
     def __str__(self):  # noqa
         return "Payment: %s payment by %s - %s" % (
@@ -67,3 +80,130 @@ class Payment(TimeStampedModel):
             self.user,
             self.gateway_payment_id,
         )
+
+
+class WebhookEvent(TimeStampedModel):
+    """
+    Represent a webhook event received from a payment platform.
+
+    Events are persisted on receipt, once per event id, and processed by
+    workers later on, so that webhooks are acknowledged fast. Events sharing an ordering key,
+    i.e. the gateway payment id, are processed in the order received.
+    """
+
+    class Status(models.TextChoices):
+        """Status choices."""
+
+        PENDING = "PENDING", _("Pending")
+        PROCESSED = "PROCESSED", _("Processed")
+        FAILED = "FAILED", _("Failed")  # Retries exhausted
+
+    provider = models.CharField(max_length=20, choices=Payment.Platforms.choices)
+    event_id = models.CharField(max_length=255, help_text="Event id of the platform.")
+    event_type = models.CharField(max_length=255)
+    ordering_key = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Events with the same key are processed in order.",
+    )
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    processing_latency = models.DurationField(
+        null=True,
+        blank=True,
+        help_text="Time from receipt until processed.",
+    )
+
+    class Meta:  # noqa
+        verbose_name = "Webhook Event"
+        verbose_name_plural = "Webhook Events"
+        ordering = ["created", "id"]
+        constraints = [
+            # Platforms deliver events at least once.
+            models.UniqueConstraint(fields=["provider", "event_id"], name="unique_webhook_event"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                name="webhook_event_due_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+            models.Index(
+                fields=["ordering_key", "created", "id"],
+                name="webhook_event_ordering_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
+
+    def __str__(self):  # noqa
+        return "%s event %s (%s)" % (self.provider, self.event_id, self.event_type)
+
+
+class Payout(TimeStampedModel):
+    """
+    Represent a PayPal payout batch to beneficiaries.
+
+    Pays what beneficiaries are owed from donations up to `period_end`.
+    """
+
+    class Status(models.TextChoices):
+        """Status choices, PayPal batch statuses once sent."""
+
+        NEW = "NEW", _("New")  # Not sent to PayPal yet
+        PENDING = "PENDING", _("Pending")
+        PROCESSING = "PROCESSING", _("Processing")
+        SUCCESS = "SUCCESS", _("Success")
+        DENIED = "DENIED", _("Denied")
+        CANCELED = "CANCELED", _("Canceled")
+
+    sender_batch_id = models.CharField(max_length=255, unique=True, help_text="Our id of the batch, sent to PayPal.")
+    payout_batch_id = models.CharField(max_length=255, blank=True, help_text="PayPal id of the batch.")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.NEW)
+    period_end = models.DateTimeField(help_text="Donations up to this time are paid out.")
+
+    class Meta:  # noqa
+        verbose_name = "Payout"
+        verbose_name_plural = "Payouts"
+        ordering = ["-created"]
+
+    def __str__(self):  # noqa
+        return "Payout: %s (%s)" % (self.sender_batch_id, self.status)
+
+
+class PayoutItem(models.Model):
+    """Represent the payment of a beneficiary's bank account in a payout batch."""
+
+    class Status(models.TextChoices):
+        """Status choices, PayPal item transaction statuses."""
+
+        PENDING = "PENDING", _("Pending")
+        SUCCESS = "SUCCESS", _("Success")
+        FAILED = "FAILED", _("Failed")
+        UNCLAIMED = "UNCLAIMED", _("Unclaimed")
+        RETURNED = "RETURNED", _("Returned")
+        ONHOLD = "ONHOLD", _("On Hold")
+        BLOCKED = "BLOCKED", _("Blocked")
+        REFUNDED = "REFUNDED", _("Refunded")
+        REVERSED = "REVERSED", _("Reversed")
+
+    payout = models.ForeignKey(Payout, on_delete=models.CASCADE, related_name="items")
+    bank_account = models.ForeignKey(
+        "user.BankAccount",
+        on_delete=models.PROTECT,
+        related_name="payout_items",
+    )
+    sender_item_id = models.CharField(max_length=255, unique=True)
+    payout_item_id = models.CharField(max_length=255, blank=True, help_text="PayPal id of the item.")
+    amount = MoneyField(max_digits=14, decimal_places=2, default_currency="USD")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+
+    class Meta:  # noqa
+        verbose_name = "Payout Item"
+        verbose_name_plural = "Payout Items"
+
+    def __str__(self):  # noqa
+        return "PayoutItem: %s to %s (%s)" % (self.amount, self.bank_account, self.status)
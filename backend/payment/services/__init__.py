@@ -2,4 +2,10 @@
 
 from .paypal import *  # noqa
 
+from .payout import *  # noqa
+
+from .reconcile import *  # noqa
+
 from .stripe import *  # noqa
+
+from .webhook import *  # noqa
@@ -5,7 +5,9 @@ from typing import Any, Callable, Optional
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from campaign.models import Campaign
 from core.services import Amount, to_money
+from donation.services import donation_create
 from payment.models import Payment
 
 User = get_user_model()
@@ -18,11 +20,13 @@ def external_payment_create(
     amount: Amount,
     platform: Optional[Payment.Platforms] = Payment.Platforms.PAYPAL,
     status: Optional[Payment.Status] = Payment.Status.PENDING,
+    campaign: Optional[Campaign] = None,
 ) -> Payment:
-    """Create payment."""
+    """Create payment, to be donated to campaign if any."""
     amount = to_money(float(amount))
     payment = Payment(
         user=payer,
+        campaign=campaign,
         gateway_payment_id=gateway_payment_id,
         amount=amount,
         platform=platform,
@@ -39,10 +43,24 @@ def external_payment_capture(
     payment: Payment,
     capture_payment_func: Callable[[User, Amount], Any],
 ) -> Payment:
-    """Capture payment."""
+    """
+    Capture payment, and create its donation in the same transaction.
+
+    The payment is locked, so that concurrent captures of it (i.e. by the
+    return URL and a webhook) complete it, and donate it, once.
+    """
+    payment = Payment.objects.select_for_update(of=("self",)).select_related("user", "campaign").get(pk=payment.pk)
+
+    if payment.status == Payment.Status.COMPLETED:
+        return payment
+
     payment.status = Payment.Status.COMPLETED
-    # TODO: capture_payment_func(payment.user, payment.amount)
     payment.full_clean()
     payment.save()
 
+    if payment.campaign is not None:
+        donation_create(donor=payment.user, amount=payment.amount, campaign=payment.campaign, payment=payment)
+
+    capture_payment_func(payment.user, payment.amount)
+
     return payment
@@ -0,0 +1,249 @@
+"""Payout services."""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from decimal import ROUND_DOWN, Decimal
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.services import to_money
+from donation.models import Donation
+from project.models import ProjectAssignment
+from user.models import BankAccount, User, UserGroup
+
+from ..clients import paypal_client
+from ..models import Payment, Payout, PayoutItem
+
+logger = logging.getLogger("payment")
+
+# Most items PayPal accepts in one payout batch.
+PAYPAL_PAYOUT_BATCH_LIMIT = 15000
+# Items listed per page when polling a batch.
+PAYPAL_PAYOUT_PAGE_SIZE = 1000
+# Statuses of items which may still be paid, so their accounts are not owed more meanwhile.
+PAYOUT_ITEM_UNSETTLED = (PayoutItem.Status.PENDING, PayoutItem.Status.ONHOLD, PayoutItem.Status.UNCLAIMED)
+PAYOUT_UNFINISHED = (Payout.Status.NEW, Payout.Status.PENDING, Payout.Status.PROCESSING)
+
+BENEFICIARY_MODELS = {
+    "User": User,
+    "UserGroup": UserGroup,
+}
+
+
+def payouts_owed(*, until: datetime) -> Dict[BankAccount, Decimal]:
+    """
+    Amounts owed to beneficiaries' bank accounts, from donations up to `until`.
+
+    Only donations of completed payments count, not those without a payment
+    or whose payment was refunded or held. Donations to a project since an account's last payout are split evenly
+    between the project's beneficiaries. Only verified accounts without
+    unsettled payout items are owed; accounts whose items failed are owed
+    again. Donations are summed per project with one query per distinct
+    `last_payout`, which accounts paid together share.
+    """
+    assignments = list(ProjectAssignment.objects.values_list("project_id", "assignable_type", "assignable_id"))
+    beneficiaries_count = defaultdict(int)
+    projects_by_beneficiary = defaultdict(set)
+
+    for project_id, assignable_type, assignable_id in assignments:
+        beneficiaries_count[project_id] += 1
+        projects_by_beneficiary[(assignable_type, assignable_id)].add(project_id)
+
+    payable = (
+        BankAccount.objects.filter(
+            account_status=BankAccount.AccountStatus.VERIFIED, bank_account_token_id__isnull=False
+        )
+        .exclude(bank_account_token_id="")
+        .exclude(payout_items__status__in=PAYOUT_ITEM_UNSETTLED)
+    )
+    projects_by_account = defaultdict(set)
+    accounts = {}
+
+    for assignable_type, model in BENEFICIARY_MODELS.items():
+        ids = [assignable_id for (type_, assignable_id) in projects_by_beneficiary if type_ == assignable_type]
+        beneficiaries = model.objects.filter(id__in=ids, bank_account__in=payable).select_related("bank_account")
+
+        for beneficiary in beneficiaries:
+            account = beneficiary.bank_account
+            accounts[account.id] = account
+            projects_by_account[account.id] |= projects_by_beneficiary[(assignable_type, beneficiary.id)]
+
+    accounts_by_since = defaultdict(list)
+    for account in accounts.values():
+        accounts_by_since[account.last_payout].append(account)
+
+    owed = {}
+    for since, since_accounts in accounts_by_since.items():
+        project_ids = set().union(*(projects_by_account[account.id] for account in since_accounts))
+        totals = dict(
+            Donation.objects.filter(
+                campaign__project__in=project_ids,
+                created__gt=since,
+                created__lte=until,
+                payment__status=Payment.Status.COMPLETED,
+            )
+            .order_by()
+            .values("campaign__project")
+            .annotate(total=Sum("amount"))
+            .values_list("campaign__project", "total")
+        )
+
+        for account in since_accounts:
+            amount = sum(
+                (
+                    Decimal(totals[project_id]) / beneficiaries_count[project_id]
+                    for project_id in projects_by_account[account.id]
+                    if totals.get(project_id)
+                ),
+                Decimal(0),
+            ).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+
+            if amount > 0:
+                owed[account] = amount
+
+    return owed
+
+
+@transaction.atomic
+def payouts_create(*, until: Optional[datetime] = None) -> List[Payout]:
+    """
+    Create payout batches of amounts owed up to `until` (now by default).
+
+    Accounts are grouped into batches of PAYPAL_PAYOUT_BATCH_LIMIT items.
+    Batches are sent with `payout_submit`.
+    """
+    until = until or timezone.now()
+    owed = sorted(payouts_owed(until=until).items(), key=lambda item: item[0].id)
+    payouts = []
+
+    for start in range(0, len(owed), PAYPAL_PAYOUT_BATCH_LIMIT):
+        payout = Payout.objects.create(sender_batch_id=f"payout-{uuid.uuid4().hex}", period_end=until)
+        PayoutItem.objects.bulk_create(
+            [
+                PayoutItem(
+                    payout=payout,
+                    bank_account=account,
+                    sender_item_id=f"{payout.sender_batch_id}-{account.id}",
+                    amount=to_money(amount),
+                )
+                for account, amount in owed[start : start + PAYPAL_PAYOUT_BATCH_LIMIT]
+            ],
+            batch_size=1000,
+        )
+        payouts.append(payout)
+
+    return payouts
+
+
+def payout_submit(payout: Payout) -> Payout:
+    """
+    Send payout batch to PayPal.
+
+    The batch is sent with its sender_batch_id as `PayPal-Request-Id`. A
+    batch whose response was lost stays NEW and is sent again; PayPal then
+    answers with the batch it created already, instead of rejecting the
+    sender_batch_id it has seen, so that the batch is paid once and updated.
+    """
+    items = payout.items.select_related("bank_account").order_by("id")
+    response = _payout_create(
+        sender_batch_id=payout.sender_batch_id,
+        items=[
+            {
+                "recipient_type": "PAYPAL_ID",
+                "amount": {"value": str(item.amount.amount), "currency": str(item.amount.currency)},
+                "receiver": item.bank_account.bank_account_token_id,
+                "note": "Donations to your projects.",
+                "sender_item_id": item.sender_item_id,
+            }
+            for item in items
+        ],
+    )
+    batch_header = response["batch_header"]
+
+    payout.payout_batch_id = batch_header["payout_batch_id"]
+    payout.status = batch_header["batch_status"]
+    payout.save(update_fields=["payout_batch_id", "status", "modified"])
+    logger.info("Sent payout batch %s (%s) of %d items.", payout.sender_batch_id, payout.payout_batch_id, len(items))
+
+    return payout
+
+
+def payout_poll(payout: Payout) -> Payout:
+    """
+    Update payout batch, and its items, from PayPal.
+
+    Items are listed PAYPAL_PAYOUT_PAGE_SIZE per request, and updated in
+    bulk. Accounts paid have `last_payout` moved to the batch's period end,
+    with one UPDATE.
+    """
+    items = {item.sender_item_id: item for item in payout.items.all()}
+    changed = []
+    page, total_pages = 1, 1
+
+    while page <= total_pages:
+        response = _payout_get(payout.payout_batch_id, page=page)
+
+        for paypal_item in response.get("items", []):
+            item = items.get(paypal_item["payout_item"]["sender_item_id"])
+
+            if item is not None and item.status != paypal_item["transaction_status"]:
+                item.status = paypal_item["transaction_status"]
+                item.payout_item_id = paypal_item["payout_item_id"]
+                changed.append(item)
+
+        total_pages = response.get("total_pages", 1)
+        page += 1
+
+    with transaction.atomic():
+        PayoutItem.objects.bulk_update(changed, ["status", "payout_item_id"], batch_size=1000)
+        BankAccount.objects.filter(
+            id__in=[item.bank_account_id for item in changed if item.status == PayoutItem.Status.SUCCESS]
+        ).update(last_payout=payout.period_end)
+
+        payout.status = response["batch_header"]["batch_status"]
+        payout.save(update_fields=["status", "modified"])
+
+    return payout
+
+
+def payouts_process() -> Dict[str, int]:
+    """Send new payout batches, and poll those PayPal has not finished."""
+    counts = {"submitted": 0, "polled": 0}
+
+    for payout in Payout.objects.filter(status__in=PAYOUT_UNFINISHED).order_by("id"):
+        if payout.status == Payout.Status.NEW:
+            payout_submit(payout)
+            counts["submitted"] += 1
+        else:
+            payout_poll(payout)
+            counts["polled"] += 1
+
+    return counts
+
+
+def _payout_create(*, sender_batch_id: str, items: List[Dict]) -> Dict:
+    """Create payout batch with PayPal Payouts API."""
+    # https://developer.paypal.com/docs/api/payments.payouts-batch/v1/#payouts_post
+    payload = {
+        "sender_batch_header": {
+            "sender_batch_id": sender_batch_id,
+            "email_subject": "You have a payout!",
+        },
+        "items": items,
+    }
+
+    return paypal_client().post("/v1/payments/payouts", json=payload, request_id=sender_batch_id)
+
+
+def _payout_get(payout_batch_id: str, *, page: int = 1) -> Dict:
+    """Retrieve a page of payout batch with PayPal Payouts API."""
+    # https://developer.paypal.com/docs/api/payments.payouts-batch/v1/#payouts_get
+    return paypal_client().get(
+        f"/v1/payments/payouts/{payout_batch_id}",
+        params={"page": page, "page_size": PAYPAL_PAYOUT_PAGE_SIZE, "total_required": "true"},
+    )
@@ -1,21 +1,24 @@
 """Paypal services."""
 
-from typing import Any, Callable, Dict, Optional
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, Optional
 
-import requests
-from django.conf import settings
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from requests.auth import HTTPBasicAuth
 
+from campaign.models import Campaign
 from core.services import Amount
 
+from ..clients import async_paypal_client, paypal_client
 from ..models import Payment
 from ..selectors import payment_get
 from .common import external_payment_capture, external_payment_create
 
 User = get_user_model()
 
+PAYPAL_SEARCH_MAX_RANGE = timedelta(days=31)
+
 
 def paypal_payment_create(
     *,
@@ -24,14 +27,40 @@ def paypal_payment_create(
     currency: str = "USD",
     return_url: Optional[str] = None,
     cancel_url: Optional[str] = None,
+    campaign: Optional[Campaign] = None,
 ) -> Dict[str, Any]:
-    """Create Paypal payment and commit to database."""
+    """Create Paypal payment, donated to campaign once captured, and commit to database."""
     payment_response = _payment_create(amount, currency, return_url, cancel_url)
 
     external_payment_create(
         payer=payer,
         amount=amount,
         gateway_payment_id=payment_response.get("id"),
+        campaign=campaign,
+    )
+
+    return payment_response
+
+
+async def paypal_payment_create_async(
+    *,
+    payer: User,
+    amount: str,
+    currency: str = "USD",
+    return_url: Optional[str] = None,
+    cancel_url: Optional[str] = None,
+    campaign: Optional[Campaign] = None,
+) -> Dict[str, Any]:
+    """As `paypal_payment_create`, without holding a thread while PayPal responds."""
+    payment_response = await async_paypal_client().post(
+        "/v2/checkout/orders", json=_payment_create_payload(amount, currency, return_url, cancel_url)
+    )
+
+    await sync_to_async(external_payment_create)(
+        payer=payer,
+        amount=amount,
+        gateway_payment_id=payment_response.get("id"),
+        campaign=campaign,
     )
 
     return payment_response
@@ -45,16 +74,20 @@ def paypal_payment_capture(
     """Capture Paypal payment and commit to database."""
     payment_response = _payment_capture(payment_id)
 
-    external_payment = payment_get(gateway_payment_id=payment_id)
+    _payment_captured(payment_id=payment_id, capture_payment_func=capture_payment_func)
 
-    if external_payment:
-        external_payment_capture(
-            payment=external_payment,
-            capture_payment_func=capture_payment_func,
-        )
+    return payment_response
 
-    else:
-        raise ValueError("Payment not found for the given payment ID.")
+
+async def paypal_payment_capture_async(
+    *,
+    payment_id: str,
+    capture_payment_func: Callable[[User, Amount], Any],
+) -> Dict[str, Any]:
+    """As `paypal_payment_capture`, without holding a thread while PayPal responds."""
+    payment_response = await async_paypal_client().post(f"/v2/checkout/orders/{payment_id}/capture")
+
+    await sync_to_async(_payment_captured)(payment_id=payment_id, capture_payment_func=capture_payment_func)
 
     return payment_response
 
@@ -71,19 +104,38 @@ def paypal_payment_cancel(payment_id: str) -> None:
         raise ValidationError("Payment %s not found." % payment_id)
 
 
-def _get_access_token() -> str:
-    """Get access token for MCF."""
-    response = requests.post(
-        f"{settings.PAYPAL_BASE_URL}/v1/oauth2/token",
-        auth=HTTPBasicAuth(
-            settings.PAYPAL_CLIENT_ID,
-            settings.PAYPAL_SECRET_KEY,
-        ),
-        data={"grant_type": "client_credentials"},
-    )
+def paypal_transactions_list(*, start: datetime, end: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    PayPal transactions between start and end, following pages.
+
+    Transactions appear in the transaction search up to 3 hours after they
+    happen. Searches span PAYPAL_SEARCH_MAX_RANGE at most, so longer ranges
+    are searched in windows.
+    """
+    # https://developer.paypal.com/docs/api/transaction-search/v1/#search_get
+    window_start = start
+
+    while window_start < end:
+        window_end = min(window_start + PAYPAL_SEARCH_MAX_RANGE, end)
+        page, total_pages = 1, 1
+
+        while page <= total_pages:
+            response = paypal_client().get(
+                "/v1/reporting/transactions",
+                params={
+                    "start_date": window_start.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "end_date": window_end.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "fields": "transaction_info",
+                    "page_size": 500,
+                    "page": page,
+                },
+            )
+            yield from response.get("transaction_details", [])
+
+            total_pages = response.get("total_pages", 1)
+            page += 1
 
-    response.raise_for_status()
-    return response.json().get("access_token", "")
+        window_start = window_end
 
 
 def _payment_create(
@@ -94,8 +146,19 @@ def _payment_create(
 ) -> Dict[str, Any]:
     """Create Paypal payment."""
     # https://developer.paypal.com/docs/api/orders/v2/#orders_create
-    access_token = _get_access_token()
-    payload: Dict[str, Any] = {
+    return paypal_client().post(
+        "/v2/checkout/orders", json=_payment_create_payload(amount, currency, return_url, cancel_url)
+    )
+
+
+def _payment_create_payload(
+    amount: str,
+    currency: str = "USD",
+    return_url: Optional[str] = None,
+    cancel_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Payload of Paypal order."""
+    return {
         "intent": "CAPTURE",
         "payment_source": {
             "paypal": {
@@ -119,71 +182,22 @@ def _payment_create(
         ],
     }
 
-    response = requests.post(
-        f"{settings.PAYPAL_BASE_URL}/v2/checkout/orders",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}",
-        },
-        json=payload,
-    )
-    response.raise_for_status()
-    return response.json()
-
 
 def _payment_capture(payment_id: str) -> Dict[str, Any]:
     """Capture/execute Paypal payment."""
     # https://developer.paypal.com/docs/api/orders/v2/#orders_capture
-    access_token = _get_access_token()
-    response = requests.post(
-        f"{settings.PAYPAL_BASE_URL}/v2/checkout/orders/{payment_id}/capture",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}",
-        },
-    )
-    response.raise_for_status()
-    return response.json()
+    return paypal_client().post(f"/v2/checkout/orders/{payment_id}/capture")
 
 
-def _payout_create(
-    *,
-    recipient_email: str,
-    amount: str,
-    currency: str,
-    note: str,
-    sender_item_id: Optional[str] = None,
-) -> Dict[str, Any]:
-    """Send money to user's PayPal email using PayPal Payouts API."""
-    # https://developer.paypal.com/docs/api/payments.payouts-batch/v1/#payouts_post
-    access_token = _get_access_token()
-
-    payload = {
-        "sender_batch_header": {
-            "sender_batch_id": sender_item_id or "batch_" + recipient_email,
-            "email_subject": "You have a payout!",
-        },
-        "items": [
-            {
-                "recipient_type": "EMAIL",
-                "amount": {
-                    "value": amount,
-                    "currency": currency,
-                },
-                "receiver": recipient_email,
-                "note": note,
-                "sender_item_id": sender_item_id or recipient_email,
-            }
-        ],
-    }
+def _payment_captured(*, payment_id: str, capture_payment_func: Callable[[User, Amount], Any]) -> None:
+    """Capture local payment of Paypal order captured."""
+    external_payment = payment_get(gateway_payment_id=payment_id)
 
-    response = requests.post(
-        f"{settings.PAYPAL_BASE_URL}/v1/payments/payouts",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}",
-        },
-        json=payload,
-    )
-    response.raise_for_status()
-    return response.json()
+    if external_payment:
+        external_payment_capture(
+            payment=external_payment,
+            capture_payment_func=capture_payment_func,
+        )
+
+    else:
+        raise ValueError("Payment not found for the given payment ID.")
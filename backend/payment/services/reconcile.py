@@ -0,0 +1,187 @@
+"""Reconciliation services."""
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterator, List
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from donation.services import donations_from_payments_create, donations_from_payments_delete
+
+from ..models import Payment
+from .paypal import paypal_transactions_list
+from .stripe import stripe_payment_intents_list, stripe_payment_intents_retrieve
+
+logger = logging.getLogger("payment")
+
+# Stripe payments are listed in windows of at most STRIPE_LIST_WINDOW, if
+# there are at least STRIPE_LIST_MIN_PAYMENTS of them in the window; sparse
+# payments are retrieved one by one, rather than paging through every
+# PaymentIntent around them.
+STRIPE_LIST_WINDOW = timedelta(hours=1)
+STRIPE_LIST_MIN_PAYMENTS = 5
+# Final statuses of Stripe PaymentIntents; other statuses leave payments pending.
+STRIPE_STATUSES = {
+    "succeeded": Payment.Status.COMPLETED,
+    "canceled": Payment.Status.CANCELED,
+}
+# Final statuses of PayPal transactions (S: success, D: denied, V: reversed).
+PAYPAL_STATUSES = {
+    "S": Payment.Status.COMPLETED,
+    "D": Payment.Status.FAILED,
+    "V": Payment.Status.REFUNDED,
+}
+
+
+def _pending_payments_chunks(*, created_before, chunk_size: int) -> Iterator[List[Payment]]:
+    """Pending payments created before `created_before`, in chunks of ascending id."""
+    queryset = (
+        Payment.objects.filter(status=Payment.Status.PENDING, created__lt=created_before)
+        .only("id", "platform", "gateway_payment_id", "created")
+        .order_by("id")
+    )
+    last_id = 0
+
+    while chunk := list(queryset.filter(id__gt=last_id)[:chunk_size]):
+        yield chunk
+        last_id = chunk[-1].id
+
+
+def _stripe_windows(payments: List[Payment]) -> Iterator[List[Payment]]:
+    """Payments grouped by creation time, in windows of at most STRIPE_LIST_WINDOW."""
+    window: List[Payment] = []
+
+    for payment in sorted(payments, key=lambda payment: payment.created):
+        if window and payment.created - window[0].created > STRIPE_LIST_WINDOW:
+            yield window
+            window = []
+        window.append(payment)
+
+    if window:
+        yield window
+
+
+def _stripe_statuses(payments: List[Payment]) -> Dict[str, str]:
+    """Final statuses on Stripe of payments, by gateway payment id."""
+    gateway_ids = {payment.gateway_payment_id for payment in payments}
+    statuses = {}
+
+    for window in _stripe_windows(payments):
+        if len(window) >= STRIPE_LIST_MIN_PAYMENTS:
+            payment_intents = stripe_payment_intents_list(start=window[0].created, end=window[-1].created)
+        else:
+            payment_intents = stripe_payment_intents_retrieve(payment.gateway_payment_id for payment in window)
+
+        statuses.update(
+            {
+                payment_intent["id"]: STRIPE_STATUSES[payment_intent["status"]]
+                for payment_intent in payment_intents
+                if payment_intent["id"] in gateway_ids and payment_intent["status"] in STRIPE_STATUSES
+            }
+        )
+
+    return statuses
+
+
+def _paypal_statuses(payments: List[Payment]) -> Dict[str, str]:
+    """Final statuses on PayPal of payments (orders), by gateway payment id."""
+    gateway_ids = {payment.gateway_payment_id for payment in payments}
+    transactions = paypal_transactions_list(
+        start=min(payment.created for payment in payments),
+        # Orders are captured after they are created.
+        end=min(max(payment.created for payment in payments) + timedelta(days=1), timezone.now()),
+    )
+
+    statuses = {}
+    for transaction_detail in transactions:
+        info = transaction_detail.get("transaction_info", {})
+        order_id = info.get("paypal_reference_id")
+
+        if order_id in gateway_ids and info.get("transaction_status") in PAYPAL_STATUSES:
+            statuses[order_id] = PAYPAL_STATUSES[info["transaction_status"]]
+
+    return statuses
+
+
+def payments_status_update(statuses: Dict[int, str]) -> Dict[int, str]:
+    """
+    Update statuses of pending payments by id, in one statement.
+
+    Payments no longer pending, i.e. updated by a webhook meanwhile, are
+    left as they are. Returns the statuses of payments updated.
+    """
+    if not statuses:
+        return {}
+
+    values = ", ".join(["(%s, %s)"] * len(statuses))
+    params = [param for payment_id, status in statuses.items() for param in (payment_id, status)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {Payment._meta.db_table} AS payment
+            SET status = v.status, modified = NOW()
+            FROM (VALUES {values}) AS v(id, status)
+            WHERE payment.id = v.id AND payment.status = %s
+            RETURNING payment.id, payment.status
+            """,
+            params + [Payment.Status.PENDING],
+        )
+        return dict(cursor.fetchall())
+
+
+def payments_reconcile(*, older_than: timedelta = timedelta(hours=1), chunk_size: int = 500) -> Counter:
+    """
+    Reconcile pending payments with their gateway.
+
+    Pending payments are read in keyset chunks. Per chunk, each gateway's
+    list endpoint is paged through over the time range of the chunk,
+    rather than retrieving payments one by one (Stripe payments too sparse
+    for their window to be worth listing are retrieved), and final
+    statuses are written in one UPDATE. Donations of payments completed
+    are created, and those of payments refunded deleted, in the same
+    transaction. Returns the number of payments per new status.
+    """
+    gateways = {
+        Payment.Platforms.STRIPE: _stripe_statuses,
+        Payment.Platforms.PAYPAL: _paypal_statuses,
+    }
+    updated = Counter()
+
+    for chunk in _pending_payments_chunks(created_before=timezone.now() - older_than, chunk_size=chunk_size):
+        statuses = {}
+
+        for platform, gateway_statuses in gateways.items():
+            payments = [payment for payment in chunk if payment.platform == platform]
+
+            if not payments:
+                continue
+
+            by_gateway_id = gateway_statuses(payments)
+            statuses.update(
+                {
+                    payment.id: by_gateway_id[payment.gateway_payment_id]
+                    for payment in payments
+                    if payment.gateway_payment_id in by_gateway_id
+                }
+            )
+
+        with transaction.atomic():
+            chunk_updated = payments_status_update(statuses)
+            donations_from_payments_create(
+                payment_ids=[
+                    payment_id for payment_id, status in chunk_updated.items() if status == Payment.Status.COMPLETED
+                ]
+            )
+            donations_from_payments_delete(
+                payment_ids=[
+                    payment_id for payment_id, status in chunk_updated.items() if status == Payment.Status.REFUNDED
+                ]
+            )
+
+        updated.update(chunk_updated.values())
+        logger.info("Reconciled %d of %d pending payments up to id %s.", len(chunk_updated), len(chunk), chunk[-1].id)
+
+    return updated
@@ -1,56 +1,62 @@
 """Stripe services."""
 
-from decimal import Decimal
-from typing import Any, Callable, Dict
+import logging
 import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import stripe
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
-from core.services import Amount, to_money
+from campaign.models import Campaign
+from core.services import Amount
+from donation.services import donations_from_payments_delete
 
-from ..models import Payment
+from ..clients import async_stripe_client
+from ..models import Payment, WebhookEvent
 from ..selectors import payment_get
 from .common import external_payment_capture, external_payment_create
-from typing import Optional
+from .webhook import webhook_event_create
 
 User = get_user_model()
+logger = logging.getLogger("payment")
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# Margin on PaymentIntent creation times, when listing those of payments.
+STRIPE_CREATED_MARGIN = timedelta(minutes=5)
+
 
 def stripe_payment_create(
     *,
     payer: User,
     amount: Decimal,
     currency: str = "usd",
-
+    campaign: Optional[Campaign] = None,
 ):
     """Create Stripe PaymentIntent and commit to database.
-    
+
     Args:
         payer: The user making the payment
         amount: Payment amount in decimal format
         currency: Currency code (default: 'usd')
-        
+        campaign: Campaign to donate the payment to once captured, if any
+
     Returns:
         stripe.PaymentIntent: The created PaymentIntent object with client_secret.
     """
 
-    print(f"DEBUG: payer type: {type(payer)}, payer: {payer}")
-    print(f"DEBUG: amount type: {type(amount)}, amount: {amount}")
-    
     idempotency_key = f"create-{payer.id}-{uuid.uuid4()}"
     try:
-        
         payment_intent = stripe.PaymentIntent.create(
-            amount=int(amount * 100),
-            currency=currency,
-            idempotency_key=idempotency_key
+            amount=int(amount * 100), currency=currency, idempotency_key=idempotency_key
         )
-        print(f"DEBUG: Stripe PaymentIntent created successfully: {payment_intent.get('id')}")
+        logger.debug("Stripe PaymentIntent %s created for user %s.", payment_intent.get("id"), payer.id)
     except stripe.StripeError as e:
-        print(f"DEBUG: Stripe API error: {str(e)}")
+        logger.warning("Stripe API error creating PaymentIntent for user %s: %s", payer.id, e)
         raise ValueError(f"Stripe API error: {str(e)}")
 
     external_payment_create(
@@ -59,6 +65,36 @@ def stripe_payment_create(
         gateway_payment_id=payment_intent.get("id"),
         platform=Payment.Platforms.STRIPE,
         status=Payment.Status.PENDING,
+        campaign=campaign,
+    )
+    return payment_intent
+
+
+async def stripe_payment_create_async(
+    *,
+    payer: User,
+    amount: Decimal,
+    currency: str = "usd",
+    campaign: Optional[Campaign] = None,
+):
+    """As `stripe_payment_create`, without holding a thread while Stripe responds."""
+    try:
+        payment_intent = await async_stripe_client().payment_intents.create_async(
+            params={"amount": int(amount * 100), "currency": currency},
+            options={"idempotency_key": f"create-{payer.id}-{uuid.uuid4()}"},
+        )
+        logger.debug("Stripe PaymentIntent %s created for user %s.", payment_intent.get("id"), payer.id)
+    except stripe.StripeError as e:
+        logger.warning("Stripe API error creating PaymentIntent for user %s: %s", payer.id, e)
+        raise ValueError(f"Stripe API error: {str(e)}")
+
+    await sync_to_async(external_payment_create)(
+        payer=payer,
+        amount=amount,
+        gateway_payment_id=payment_intent.get("id"),
+        platform=Payment.Platforms.STRIPE,
+        status=Payment.Status.PENDING,
+        campaign=campaign,
     )
     return payment_intent
 
@@ -67,28 +103,35 @@ def stripe_payment_capture(
     *,
     payment_id: str,
     capture_payment_func: Callable[[User, Amount], Any],
+    payment_intent: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Capture Stripe payment and commit to database.
-    
+
     Retrieves a PaymentIntent from Stripe, verifies it's succeeded,
     finds the corresponding payment in the local database, and marks
     it as captured.
-    
+
+    A PaymentIntent from a verified webhook event can be passed in, so that
+    it is not retrieved again; `stripe_captures_verify` checks such captures
+    against Stripe later on.
+
     Args:
         payment_id: Stripe PaymentIntent ID
         capture_payment_func: Callback function to execute after capture
-        
+        payment_intent: PaymentIntent of a verified webhook event, if any
+
     Returns:
         stripe.PaymentIntent: The created PaymentIntent object with client_secret.
-        
+
     Raises:
         ValueError: If payment hasn't succeeded or not found in database
     """
 
-    payment_intent = stripe.PaymentIntent.retrieve(payment_id)
+    if payment_intent is None:
+        payment_intent = stripe.PaymentIntent.retrieve(payment_id)
 
-    if payment_intent.status != "succeeded":
-        raise ValueError(f"PaymentIntent {payment_id} has not been paid yet (status={payment_intent.status}).")
+    if payment_intent["status"] != "succeeded":
+        raise ValueError(f"PaymentIntent {payment_id} has not been paid yet (status={payment_intent['status']}).")
 
     external_payment = payment_get(gateway_payment_id=payment_id)
 
@@ -102,12 +145,13 @@ def stripe_payment_capture(
 
     return payment_intent
 
+
 def stripe_payment_cancel(payment_id: str) -> Dict[str, Any]:
     """Cancel a Stripe PaymentIntent.
-    
+
     Args:
         payment_id: Stripe PaymentIntent ID to cancel
-        
+
     Returns:
         Dict[str, Any]: Stripe PaymentIntent object after cancellation
     """
@@ -117,31 +161,57 @@ def stripe_payment_cancel(payment_id: str) -> Dict[str, Any]:
     except stripe.StripeError as e:
         raise ValueError(f"Stripe API error: {str(e)}")
 
+    _payment_canceled(payment_id)
+
+    return payment_intent
+
+
+async def stripe_payment_cancel_async(payment_id: str) -> Dict[str, Any]:
+    """As `stripe_payment_cancel`, without holding a thread while Stripe responds."""
+    try:
+        payment_intent = await async_stripe_client().payment_intents.cancel_async(
+            payment_id, options={"idempotency_key": f"cancel-{payment_id}-{uuid.uuid4()}"}
+        )
+
+    except stripe.StripeError as e:
+        raise ValueError(f"Stripe API error: {str(e)}")
+
+    await sync_to_async(_payment_canceled)(payment_id)
+
+    return payment_intent
+
+
+def _payment_canceled(payment_id: str) -> None:
+    """Cancel local payment of PaymentIntent canceled."""
     external_payment = payment_get(gateway_payment_id=payment_id)
 
     if not external_payment:
         raise ValueError(f"Payment {payment_id} not found in local database.")
-    
+
     external_payment.status = Payment.Status.CANCELED
     external_payment.save(update_fields=["status"])
 
-    return payment_intent
 
-def stripe_refund_create(
-    *,
-    payment_id: str,
-    amount: Optional[Decimal] = None
-) -> Dict[str, Any]:
+@transaction.atomic
+def _payment_refunded(payment: Payment) -> None:
+    """Mark local payment refunded, and delete the donations it funded."""
+    payment.status = Payment.Status.REFUNDED
+    payment.save(update_fields=["status"])
+    donations_from_payments_delete(payment_ids=[payment.id])
+
+
+def stripe_refund_create(*, payment_id: str, amount: Optional[Decimal] = None) -> Dict[str, Any]:
     """
     Create a refund for a Stripe PaymentIntent and update local payment status.
 
-    This function requests a refund from Stripe for the specified PaymentIntent.  
-    If `amount` is not provided, a full refund is issued. After the refund is created,  
-    the corresponding local Payment record is updated to `REFUNDED`.
+    This function requests a refund from Stripe for the specified PaymentIntent.
+    If `amount` is not provided, a full refund is issued. After the refund is created,
+    the corresponding local Payment record is updated to `REFUNDED`, and
+    the donations it funded are deleted.
 
     Args:
         payment_id (str): The Stripe PaymentIntent ID to refund.
-        amount (Optional[Decimal]): Amount to refund (in decimal format).  
+        amount (Optional[Decimal]): Amount to refund (in decimal format).
             If None, the full payment amount will be refunded.
 
     Returns:
@@ -156,9 +226,9 @@ def stripe_refund_create(
 
     try:
         refund = stripe.Refund.create(
-            payment_intent=payment_id, 
-            amount=int(amount * 100) if amount else None, 
-            idempotency_key=f"refund-{payment_id}-{uuid.uuid4()}"
+            payment_intent=payment_id,
+            amount=int(amount * 100) if amount else None,
+            idempotency_key=f"refund-{payment_id}-{uuid.uuid4()}",
         )
     except stripe.StripeError as e:
         raise ValueError(f"Stripe API error: {str(e)}")
@@ -166,7 +236,128 @@ def stripe_refund_create(
     external_payment = payment_get(gateway_payment_id=payment_id)
     if not external_payment:
         raise ValueError(f"Payment {payment_id} not found in local database.")
-    
-    external_payment.status = Payment.Status.REFUNDED
-    external_payment.save(update_fields=["status"])
+
+    _payment_refunded(external_payment)
     return refund
+
+
+def stripe_webhook_event_create(*, payload: Dict[str, Any]) -> Tuple[WebhookEvent, bool]:
+    """
+    Persist verified Stripe event for later processing, unless redelivered.
+
+    Events are ordered by PaymentIntent, so that i.e. a refund is never
+    processed before the payment succeeded.
+    """
+    data = payload["data"]["object"]
+
+    return webhook_event_create(
+        provider=Payment.Platforms.STRIPE,
+        event_id=payload["id"],
+        event_type=payload["type"],
+        payload=payload,
+        ordering_key=data.get("payment_intent") or data.get("id") or "",
+    )
+
+
+def stripe_webhook_event_handle(event: WebhookEvent) -> None:
+    """Apply Stripe event to local payments."""
+    data = event.payload["data"]["object"]
+
+    if event.event_type == "payment_intent.succeeded":
+        payment_id = data["id"]
+        # The event is signed, so its PaymentIntent is trusted rather than retrieved again.
+        stripe_payment_capture(
+            payment_id=payment_id,
+            capture_payment_func=lambda user, amount: logger.info("Credited %s to %s", amount, user),
+            payment_intent=data,
+        )
+        logger.info("PaymentIntent %s succeeded.", payment_id)
+
+    elif event.event_type == "payment_intent.payment_failed":
+        payment_id = data["id"]
+        error_msg = data["last_payment_error"]["message"] if data.get("last_payment_error") else "Unknown error"
+        payment = payment_get(gateway_payment_id=payment_id)
+        if payment:
+            payment.status = Payment.Status.FAILED
+            payment.save(update_fields=["status"])
+            logger.warning("PaymentIntent %s failed: %s", payment_id, error_msg)
+        else:
+            logger.warning("PaymentIntent %s failed but not found in DB.", payment_id)
+
+    elif event.event_type == "charge.refunded":
+        # Payments are stored by PaymentIntent, not by charge.
+        payment_id = data.get("payment_intent") or data["id"]
+        payment = payment_get(gateway_payment_id=payment_id)
+        if payment:
+            _payment_refunded(payment)
+            logger.info("Charge %s refunded.", data["id"])
+        else:
+            logger.warning("Refund event for charge %s not found in DB.", data["id"])
+
+    else:
+        logger.debug("Unhandled Stripe event: %s", event.event_type)
+
+
+def stripe_captures_verify(*, since: datetime) -> List[str]:
+    """
+    Verify Stripe payments completed since `since` against Stripe.
+
+    Succeeded PaymentIntents are listed 100 per call, rather than retrieved
+    one by one. Completed payments whose PaymentIntent has not succeeded
+    are put on hold for review, and their donations deleted. Returns their
+    PaymentIntent ids.
+    """
+    payments = Payment.objects.filter(
+        platform=Payment.Platforms.STRIPE,
+        status=Payment.Status.COMPLETED,
+        created__gte=since,
+    )
+    payment_ids = set(payments.values_list("gateway_payment_id", flat=True))
+
+    if not payment_ids:
+        return []
+
+    succeeded_ids = {
+        payment_intent["id"]
+        for payment_intent in stripe_payment_intents_list(start=since)
+        if payment_intent["status"] == "succeeded"
+    }
+
+    unverified_ids = sorted(payment_ids - succeeded_ids)
+
+    if unverified_ids:
+        with transaction.atomic():
+            on_hold = payments.filter(gateway_payment_id__in=unverified_ids)
+            on_hold_ids = list(on_hold.values_list("id", flat=True))
+            on_hold.update(status=Payment.Status.ON_HOLD)
+            # Money not received is not counted, until the payment is reviewed.
+            donations_from_payments_delete(payment_ids=on_hold_ids)
+        logger.warning(
+            "Put %d Stripe payments on hold, not succeeded on Stripe: %s", len(unverified_ids), unverified_ids
+        )
+
+    return unverified_ids
+
+
+def stripe_payment_intents_list(*, start: datetime, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """
+    PaymentIntents of payments created between start and end, 100 per call.
+
+    PaymentIntents are created just before their payment, so the range is
+    widened by STRIPE_CREATED_MARGIN.
+    """
+    created = {"gte": int((start - STRIPE_CREATED_MARGIN).timestamp())}
+
+    if end is not None:
+        created["lte"] = int((end + STRIPE_CREATED_MARGIN).timestamp())
+
+    return stripe.PaymentIntent.list(created=created, limit=100).auto_paging_iter()
+
+
+def stripe_payment_intents_retrieve(payment_intent_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """PaymentIntents by id, one call each. PaymentIntents unknown to Stripe are skipped."""
+    for payment_intent_id in payment_intent_ids:
+        try:
+            yield stripe.PaymentIntent.retrieve(payment_intent_id)
+        except stripe.InvalidRequestError as e:
+            logger.warning("Stripe PaymentIntent %s not retrieved: %s", payment_intent_id, e.user_message)
@@ -0,0 +1,136 @@
+"""Webhook services."""
+
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ..log import correlation_id_reset, correlation_id_set
+from ..models import Payment, WebhookEvent
+
+# Attempts before an event is given up on, and marked as failed.
+WEBHOOK_MAX_ATTEMPTS = 10
+# Retries back off exponentially from WEBHOOK_RETRY_DELAY up to WEBHOOK_RETRY_MAX_DELAY.
+WEBHOOK_RETRY_DELAY = timedelta(seconds=30)
+WEBHOOK_RETRY_MAX_DELAY = timedelta(hours=1)
+
+
+def webhook_event_create(
+    *,
+    provider: str,
+    event_id: str,
+    event_type: str,
+    payload: Dict[str, Any],
+    ordering_key: str = "",
+) -> Tuple[WebhookEvent, bool]:
+    """
+    Persist webhook event for later processing, once per event id.
+
+    Returns the event, and whether it was created. A redelivered event is
+    found in one lookup on the unique index, and not queued again.
+    """
+    return WebhookEvent.objects.get_or_create(
+        provider=provider,
+        event_id=event_id,
+        defaults={
+            "event_type": event_type,
+            "payload": payload,
+            "ordering_key": ordering_key,
+        },
+    )
+
+
+def webhook_event_retry_delay(attempts: int) -> timedelta:
+    """Delay before retrying an event which failed `attempts` times."""
+    return min(WEBHOOK_RETRY_DELAY * 2 ** (attempts - 1), WEBHOOK_RETRY_MAX_DELAY)
+
+
+def _webhook_events_due():
+    """Pending events due, with no earlier pending event of the same ordering key."""
+    earlier = (
+        WebhookEvent.objects.filter(
+            status=WebhookEvent.Status.PENDING,
+            ordering_key=OuterRef("ordering_key"),
+            id__lt=OuterRef("id"),
+        )
+        .exclude(ordering_key="")
+        .values("id")
+    )
+
+    return (
+        WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING, next_attempt_at__lte=timezone.now())
+        .filter(~Exists(earlier))
+        .order_by("next_attempt_at", "id")
+    )
+
+
+def _webhook_event_handler(event: WebhookEvent) -> Callable[[WebhookEvent], Any]:
+    """Handler of event's provider."""
+    from .stripe import stripe_webhook_event_handle
+
+    handlers = {
+        Payment.Platforms.STRIPE: stripe_webhook_event_handle,
+    }
+    return handlers[event.provider]
+
+
+def webhook_event_process_next(*, handler: Optional[Callable[[WebhookEvent], Any]] = None) -> Optional[WebhookEvent]:
+    """
+    Process the next event due, if any.
+
+    The event is locked while it is handled, so that workers can process
+    events concurrently. A failed event is retried later with backoff,
+    until WEBHOOK_MAX_ATTEMPTS.
+    """
+    with transaction.atomic():
+        event = _webhook_events_due().select_for_update(skip_locked=True, of=("self",)).first()
+
+        if event is None:
+            return None
+
+        event.attempts += 1
+        # Tag logs of the handler with the event, as requests are tagged with theirs.
+        token = correlation_id_set(event.event_id)
+
+        try:
+            with transaction.atomic():
+                (handler or _webhook_event_handler(event))(event)
+        except Exception as e:
+            event.last_error = f"{type(e).__name__}: {e}"
+
+            if event.attempts >= WEBHOOK_MAX_ATTEMPTS:
+                event.status = WebhookEvent.Status.FAILED
+            else:
+                event.next_attempt_at = timezone.now() + webhook_event_retry_delay(event.attempts)
+        else:
+            event.status = WebhookEvent.Status.PROCESSED
+            event.processed_at = timezone.now()
+            event.processing_latency = event.processed_at - event.created
+        finally:
+            correlation_id_reset(token)
+
+        event.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "last_error",
+                "processed_at",
+                "processing_latency",
+                "modified",
+            ]
+        )
+
+    return event
+
+
+def webhook_events_process(*, handler: Optional[Callable[[WebhookEvent], Any]] = None) -> int:
+    """Process events until none is due, return the number processed."""
+    processed = 0
+
+    while webhook_event_process_next(handler=handler) is not None:
+        processed += 1
+
+    return processed
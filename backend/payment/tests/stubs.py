@@ -0,0 +1,237 @@
+"""
+Local stubs of payment gateway APIs, for tests.
+
+Usage:
+with PayPalStub() as stub:
+    client = PayPalClient(base_url=stub.url, ...)
+    ...
+    stub.requests -> [(method, path, headers, client_port), ...]
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+class GatewayStub:
+    """Serve canned gateway responses from a local HTTP server."""
+
+    def __init__(self):
+        self.requests: List[Tuple[str, str, Dict[str, str], int]] = []
+
+    @property
+    def url(self) -> str:  # noqa
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def paths(self, path: str) -> int:
+        """Number of requests to path."""
+        return sum(1 for _, request_path, _, _ in self.requests if urlsplit(request_path).path == path)
+
+    def respond(self, method: str, path: str, query: Dict[str, str], headers, body) -> Tuple[int, Dict[str, Any]]:
+        """Status and body of the response to a request, of JSON body if any."""
+        raise NotImplementedError
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def handle_request(self):
+                content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                body = (
+                    json.loads(content) if self.headers.get("Content-Type") == "application/json" and content else None
+                )
+                stub.requests.append((self.command, self.path, dict(self.headers), self.client_address[1]))
+
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, response = stub.respond(self.command, url.path, query, self.headers, body)
+                content = json.dumps(response).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = handle_request
+
+            def log_message(self, *args):  # noqa
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class PayPalStub(GatewayStub):
+    """Stub of the PayPal REST API."""
+
+    def __init__(self, *, expires_in: int = 32400, delay: float = 0):
+        super().__init__()
+        self.expires_in = expires_in
+        # Seconds orders take to be created or captured, as a slow gateway.
+        self.delay = delay
+        # Statuses to answer, in order, before answering normally.
+        self.failures: List[int] = []
+        self.tokens_issued = 0
+        self.orders_created = 0
+        self.revoked_tokens = set()
+        # Transactions listed by the transaction search API.
+        self.transactions: List[Dict[str, Any]] = []
+        # Payout batches sent, by payout_batch_id, and the status they are reported with.
+        self.payouts: Dict[str, Dict[str, Any]] = {}
+        self.payout_batch_status = "SUCCESS"
+        self.payout_item_statuses: Dict[str, str] = {}
+        # Responses to payout batches sent, by PayPal-Request-Id, replayed when sent again.
+        self.payout_responses: Dict[str, Dict[str, Any]] = {}
+        # Batches to create and then answer with 500, as a response lost on its way back.
+        self.payout_responses_lost = 0
+        self._lock = threading.Lock()
+
+    def respond(self, method, path, query, headers, body):  # noqa
+        with self._lock:
+            if self.failures:
+                return self.failures.pop(0), {"name": "INTERNAL_SERVER_ERROR"}
+
+            if path == "/v1/oauth2/token":
+                self.tokens_issued += 1
+                return 200, {
+                    "access_token": f"TOKEN-{self.tokens_issued}",
+                    "token_type": "Bearer",
+                    "expires_in": self.expires_in,
+                }
+
+            token = headers.get("Authorization", "").removeprefix("Bearer ")
+            if not token.startswith("TOKEN-") or token in self.revoked_tokens:
+                return 401, {"error": "invalid_token"}
+
+            if path == "/v2/checkout/orders":
+                self.orders_created += 1
+                # The first order keeps a well-known id, the next are numbered.
+                order_id = "PAYPAL_ORDER_ID" if self.orders_created == 1 else f"PAYPAL_ORDER_ID_{self.orders_created}"
+
+        if path.startswith("/v2/checkout/orders"):
+            time.sleep(self.delay)
+
+        if path == "/v2/checkout/orders":
+            return 201, {"id": order_id, "status": "PAYER_ACTION_REQUIRED"}
+
+        if path.startswith("/v2/checkout/orders/") and path.endswith("/capture"):
+            return 201, {"id": path.split("/")[4], "status": "COMPLETED"}
+
+        if path == "/v1/payments/payouts":
+            request_id = headers.get("PayPal-Request-Id")
+            if request_id in self.payout_responses:
+                return 201, self.payout_responses[request_id]
+
+            sender_batch_id = body["sender_batch_header"]["sender_batch_id"]
+            if any(
+                payout["sender_batch_header"]["sender_batch_id"] == sender_batch_id for payout in self.payouts.values()
+            ):
+                return 400, {
+                    "name": "USER_BUSINESS_ERROR",
+                    "message": "Batch with given sender_batch_id already exists",
+                }
+
+            payout_batch_id = f"PAYOUT_BATCH_{len(self.payouts) + 1}"
+            self.payouts[payout_batch_id] = body
+            self.payout_responses[request_id] = {
+                "batch_header": {"payout_batch_id": payout_batch_id, "batch_status": "PENDING"}
+            }
+
+            if self.payout_responses_lost:
+                self.payout_responses_lost -= 1
+                return 500, {"name": "INTERNAL_SERVER_ERROR"}
+
+            return 201, self.payout_responses[request_id]
+
+        if path.startswith("/v1/payments/payouts/"):
+            payout = self.payouts[path.split("/")[4]]
+            page, page_size = int(query.get("page", 1)), int(query.get("page_size", 1000))
+            items = payout["items"][(page - 1) * page_size : page * page_size]
+            return 200, {
+                "batch_header": {"batch_status": self.payout_batch_status},
+                "items": [
+                    {
+                        "payout_item_id": f"ITEM_{item['sender_item_id']}",
+                        "transaction_status": self.payout_item_statuses.get(item["receiver"], "SUCCESS"),
+                        "payout_item": item,
+                    }
+                    for item in items
+                ],
+                "total_pages": max(1, -(-len(payout["items"]) // page_size)),
+            }
+
+        if path == "/v1/reporting/transactions":
+            page, page_size = int(query.get("page", 1)), int(query.get("page_size", 100))
+            return 200, {
+                "transaction_details": self.transactions[(page - 1) * page_size : page * page_size],
+                "page": page,
+                "total_pages": max(1, -(-len(self.transactions) // page_size)),
+            }
+
+        return 404, {"name": "RESOURCE_NOT_FOUND"}
+
+
+class StripeStub(GatewayStub):
+    """Stub of the Stripe API, set `stripe.api_base` to its url."""
+
+    def __init__(self):
+        super().__init__()
+        # PaymentIntents listed, newest first as on Stripe.
+        self.payment_intents: List[Dict[str, Any]] = []
+
+    def respond(self, method, path, query, headers, body):  # noqa
+        if method == "POST" and path == "/v1/payment_intents":
+            payment_intent_id = f"pi_{len(self.payment_intents) + 1}"
+            self.payment_intents.insert(0, {"id": payment_intent_id, "status": "requires_payment_method"})
+            return 200, {
+                "object": "payment_intent",
+                "id": payment_intent_id,
+                "status": "requires_payment_method",
+                "client_secret": f"{payment_intent_id}_secret",
+            }
+
+        if method == "POST" and path.startswith("/v1/payment_intents/") and path.endswith("/cancel"):
+            return 200, {"object": "payment_intent", "id": path.split("/")[3], "status": "canceled"}
+
+        if method == "GET" and path.startswith("/v1/payment_intents/"):
+            for payment_intent in self.payment_intents:
+                if payment_intent["id"] == path.split("/")[3]:
+                    return 200, {"object": "payment_intent", **payment_intent}
+
+            return 404, {"error": {"type": "invalid_request_error", "message": "No such payment_intent."}}
+
+        if path == "/v1/payment_intents":
+            payment_intents = [
+                payment_intent
+                for payment_intent in self.payment_intents
+                if int(query.get("created[gte]", 0)) <= payment_intent["created"]
+                and payment_intent["created"] <= int(query.get("created[lte]", 2**32))
+            ]
+
+            if "starting_after" in query:
+                ids = [payment_intent["id"] for payment_intent in payment_intents]
+                payment_intents = payment_intents[ids.index(query["starting_after"]) + 1 :]
+
+            limit = int(query.get("limit", 10))
+            return 200, {
+                "object": "list",
+                "url": path,
+                "data": [{"object": "payment_intent", **intent} for intent in payment_intents[:limit]],
+                "has_more": len(payment_intents) > limit,
+            }
+
+        return 404, {"error": {"type": "invalid_request_error", "message": f"Unrecognized request URL ({path})."}}
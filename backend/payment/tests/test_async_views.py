@@ -0,0 +1,95 @@
+"""Test async payment views."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import stripe
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from payment.models import Payment
+
+from .stubs import PayPalStub, StripeStub
+
+User = get_user_model()
+
+
+class AsyncPaymentViewsTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="pass")
+        token = Token.objects.create(user=self.user)
+        # Headers given to AsyncClient() are not sent as ASGI headers by Django 4.2, so pass them per request.
+        self.client = AsyncClient()
+        self.headers = {"Authorization": f"Token {token.key}"}
+
+        self.paypal_stub = PayPalStub(delay=0.5).__enter__()
+        self.addCleanup(self.paypal_stub.__exit__)
+        settings_override = override_settings(PAYPAL_BASE_URL=self.paypal_stub.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.stripe_stub = StripeStub().__enter__()
+        self.addCleanup(self.stripe_stub.__exit__)
+        for attr, value in (("api_base", self.stripe_stub.url), ("api_key", "sk_test")):
+            stripe_patch = patch.object(stripe, attr, value)
+            stripe_patch.start()
+            self.addCleanup(stripe_patch.stop)
+
+    async def paypal_create(self):
+        return await self.client.post(
+            reverse("paypal-create"),
+            {"amount": "10.00", "payer_id": self.user.id},
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+    async def test_paypal_payment_is_created_and_captured(self):
+        """Test PayPal orders are created and captured through the async client."""
+        response = await self.paypal_create()
+        self.assertEqual(response.status_code, 201)
+
+        response = await self.client.get(reverse("paypal-capture"), {"token": "PAYPAL_ORDER_ID"}, headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "COMPLETED")
+        payment = await Payment.objects.aget(gateway_payment_id="PAYPAL_ORDER_ID")
+        self.assertEqual(payment.status, Payment.Status.COMPLETED)
+
+    async def test_stripe_payment_is_created_and_canceled(self):
+        """Test Stripe PaymentIntents are created and canceled through the async client."""
+        response = await self.client.post(
+            reverse("stripe-create"), {"amount": "20.00"}, content_type="application/json", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"client_secret": "pi_1_secret"})
+
+        response = await self.client.post(
+            reverse("stripe-cancel"), {"paymentId": "pi_1"}, content_type="application/json", headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 204)
+        payment = await Payment.objects.aget(gateway_payment_id="pi_1")
+        self.assertEqual(payment.status, Payment.Status.CANCELED)
+
+    async def test_slow_gateway_calls_overlap(self):
+        """Test requests waiting on a slow gateway wait together, rather than one after another."""
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(self.paypal_create() for _ in range(5)))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([response.status_code for response in responses], [201] * 5)
+        self.assertLess(elapsed, 5 * self.paypal_stub.delay)
+        self.assertEqual(await sync_to_async(Payment.objects.count)(), 5)
+
+    async def test_unauthenticated_requests_are_rejected(self):
+        """Test permissions are checked before the handler runs."""
+        response = await AsyncClient().post(
+            reverse("stripe-create"), {"amount": "20.00"}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.stripe_stub.requests, [])
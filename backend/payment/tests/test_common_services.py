@@ -2,13 +2,18 @@
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from djmoney.money import Money
 
+from campaign.services import campaign_create
 from core.services import to_money
+from donation.models import CampaignDonationSummary, Donation
+from donation.services import donations_from_payments_create
 from payment.models import Payment
 from payment.services.common import (
     external_payment_capture,
     external_payment_create,
 )
+from project.services import project_create
 
 User = get_user_model()
 
@@ -47,3 +52,66 @@ class ExternalPaymentServiceTests(TestCase):
         updated_payment = external_payment_capture(payment=payment, capture_payment_func=donation_capture)
 
         self.assertEqual(updated_payment.status, Payment.Status.COMPLETED)
+
+
+class PaymentDonationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="donor@example.com", password="pass")
+        project = project_create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        self.campaign = campaign_create(
+            title="Wells",
+            description="Wells",
+            project=project,
+            owner=self.user,
+            target=Money(500, "USD"),
+        )
+        self.payment = external_payment_create(
+            payer=self.user,
+            gateway_payment_id="PAYPAL123",
+            amount="25.00",
+            campaign=self.campaign,
+        )
+
+    def test_capture_creates_donation_of_payment(self):
+        """Test capturing a payment to a campaign creates its donation."""
+        credited = []
+
+        external_payment_capture(
+            payment=self.payment, capture_payment_func=lambda user, amount: credited.append((user, amount))
+        )
+
+        donation = Donation.objects.get()
+        self.assertEqual(donation.payment, self.payment)
+        self.assertEqual(donation.donor, self.user)
+        self.assertEqual(donation.campaign, self.campaign)
+        self.assertEqual(donation.amount, Money(25, "USD"))
+        self.assertEqual(credited, [(self.user, Money(25, "USD"))])
+        self.assertEqual(CampaignDonationSummary.objects.get(campaign=self.campaign).donations_count, 1)
+
+    def test_capture_twice_donates_once(self):
+        """Test a payment captured again, i.e. by a webhook, is donated once."""
+        for _ in range(2):
+            external_payment_capture(payment=self.payment, capture_payment_func=lambda user, amount: None)
+
+        self.assertEqual(self.payment.donations.count(), 1)
+
+    def test_failed_donation_rolls_back_capture(self):
+        """Test the payment stays pending when its donation cannot be created."""
+        self.user.groups.create(name="beneficiary")
+
+        with self.assertRaises(Exception):
+            external_payment_capture(payment=self.payment, capture_payment_func=lambda user, amount: None)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.PENDING)
+        self.assertFalse(Donation.objects.exists())
+
+    def test_donations_from_payments_create(self):
+        """Test donations of completed payments are created in bulk, once."""
+        Payment.objects.filter(id=self.payment.id).update(status=Payment.Status.COMPLETED)
+
+        self.assertEqual(donations_from_payments_create(payment_ids=[self.payment.id]), 1)
+        self.assertEqual(donations_from_payments_create(payment_ids=[self.payment.id]), 0)
+
+        self.assertEqual(self.payment.donations.get().amount, Money(25, "USD"))
+        self.assertEqual(CampaignDonationSummary.objects.get(campaign=self.campaign).donations_count, 1)
@@ -0,0 +1,82 @@
+"""Test payment logging."""
+
+import io
+import logging
+import threading
+
+from django.test import SimpleTestCase, TestCase
+
+from payment.log import (
+    CORRELATION_ID_HEADER,
+    correlation_id_get,
+    correlation_id_reset,
+    correlation_id_set,
+    queue_handlers,
+)
+
+
+class QueueHandlersTests(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.logger = logging.getLogger("payment.tests.log")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.writers = set()
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(logging.Formatter("%(correlation_id)s %(message)s"))
+        handler.addFilter(lambda record: self.writers.add(threading.current_thread()) or True)
+        self.logger.addHandler(handler)
+        self.listener = queue_handlers(self.logger)
+        self.addCleanup(self.cleanup)
+
+    def cleanup(self):
+        self.listener.stop()
+        self.logger.handlers.clear()
+
+    def test_records_are_written_by_listener_with_correlation_id_of_caller(self):
+        """Test records are queued with the caller's correlation id, and written by another thread."""
+        token = correlation_id_set("request-1")
+        try:
+            self.logger.info("Payment %s captured.", "pi_1")
+        finally:
+            correlation_id_reset(token)
+        self.logger.info("Outside of a request.")
+        self.listener.stop()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual([line.split(" ", 1)[0] for line in lines], ["request-1", "-"])
+        self.assertEqual(lines[0], "request-1 Payment pi_1 captured.")
+        self.assertNotIn(threading.current_thread(), self.writers)
+        self.listener.start()
+
+    def test_records_below_level_are_not_formatted(self):
+        """Test debug records are gated before their arguments are formatted."""
+
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError("formatted")
+
+        self.logger.debug("Payer %s", Unformattable())
+        self.listener.stop()
+
+        self.assertEqual(self.stream.getvalue(), "")
+        self.listener.start()
+
+
+class CorrelationIdMiddlewareTests(TestCase):
+    def test_request_id_is_returned(self):
+        """Test a request's X-Request-ID is kept, or a new one is made."""
+        response = self.client.get("/api/projects/", HTTP_X_REQUEST_ID="abc123")
+        self.assertEqual(response[CORRELATION_ID_HEADER], "abc123")
+
+        first, second = self.client.get("/api/projects/"), self.client.get("/api/projects/")
+        self.assertEqual(len(first[CORRELATION_ID_HEADER]), 32)
+        self.assertNotEqual(first[CORRELATION_ID_HEADER], second[CORRELATION_ID_HEADER])
+        self.assertEqual(correlation_id_get(), "-")
+
+    def test_unsafe_request_id_is_replaced(self):
+        """Test ids with other characters, or too long, are replaced by a new one."""
+        for request_id in ("abc\nforged log line", "a b", "x" * 65):
+            response = self.client.get("/api/projects/", HTTP_X_REQUEST_ID=request_id)
+
+            self.assertRegex(response[CORRELATION_ID_HEADER], r"^[0-9a-f]{32}$")
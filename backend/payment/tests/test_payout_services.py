@@ -0,0 +1,164 @@
+"""Test payout services."""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from djmoney.money import Money
+from requests import HTTPError
+
+from campaign.models import Campaign
+from donation.models import Donation
+from payment.models import Payment, Payout, PayoutItem
+from payment.services import payouts_create, payouts_owed, payouts_process
+from project.models import Project, ProjectAssignment
+from user.models import BankAccount, UserGroup
+
+from .stubs import PayPalStub
+
+User = get_user_model()
+
+
+class PayoutServiceTests(TestCase):
+    def setUp(self):
+        self.stub = PayPalStub().__enter__()
+        self.addCleanup(self.stub.__exit__)
+        settings_override = override_settings(PAYPAL_BASE_URL=self.stub.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.last_payout = timezone.now() - timedelta(days=30)
+        self.donor = User.objects.create_user(email="donor@example.com", password="pass")
+        self.project = Project.objects.create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        self.campaign = Campaign.objects.create(
+            title="Wells", description="Wells", project=self.project, owner=self.donor, target=Money(500, "USD")
+        )
+
+        self.user = User.objects.create_user(
+            email="beneficiary@example.com", password="pass", bank_account=self.bank_account("PAYPAL_USER")
+        )
+        self.group = UserGroup.objects.create(name="Farmers", bank_account=self.bank_account("PAYPAL_GROUP"))
+        self.assign("User", self.user.id)
+        self.assign("UserGroup", self.group.id)
+
+    def bank_account(self, token, status=BankAccount.AccountStatus.VERIFIED):
+        return BankAccount.objects.create(
+            bank_account_token_id=token, account_status=status, last_payout=self.last_payout
+        )
+
+    def assign(self, assignable_type, assignable_id, project=None):
+        ProjectAssignment.objects.create(
+            project=project or self.project, assignable_type=assignable_type, assignable_id=assignable_id
+        )
+
+    def donate(self, amount, created=None, status=Payment.Status.COMPLETED):
+        payment = status and Payment.objects.create(
+            user=self.donor,
+            platform=Payment.Platforms.PAYPAL,
+            gateway_payment_id=f"PAYPAL_ORDER_{Payment.objects.count()}",
+            amount=amount,
+            status=status,
+        )
+        donation = Donation.objects.create(
+            donor=self.donor, amount=Money(amount, "USD"), campaign=self.campaign, payment=payment
+        )
+        Donation.objects.filter(id=donation.id).update(created=created or timezone.now() - timedelta(days=1))
+
+    def owed(self):
+        return {account.bank_account_token_id: amount for account, amount in payouts_owed(until=timezone.now()).items()}
+
+    def test_donations_since_last_payout_are_split_between_beneficiaries(self):
+        """Test beneficiaries are owed an even share of donations since their last payout."""
+        self.donate("100.00")
+        self.donate("0.01")
+        self.donate("500.00", created=self.last_payout - timedelta(days=1))
+        unverified = User.objects.create_user(
+            email="unverified@example.com",
+            password="pass",
+            bank_account=self.bank_account("PAYPAL_UNVERIFIED", BankAccount.AccountStatus.PENDING),
+        )
+        self.assign("User", unverified.id)
+
+        self.assertEqual(self.owed(), {"PAYPAL_USER": Decimal("33.33"), "PAYPAL_GROUP": Decimal("33.33")})
+
+    def test_donations_without_completed_payment_are_not_owed(self):
+        """Test donations of refunded payments, and donations without a payment, are not owed."""
+        self.donate("100.00")
+        self.donate("500.00", status=Payment.Status.REFUNDED)
+        self.donate("700.00", status=None)
+
+        self.assertEqual(self.owed(), {"PAYPAL_USER": Decimal("50.00"), "PAYPAL_GROUP": Decimal("50.00")})
+
+    def test_owed_amounts_query_count(self):
+        """Test amounts owed take a fixed number of queries for accounts paid together."""
+        self.donate("100.00")
+        for i in range(10):
+            user = User.objects.create_user(
+                email=f"user{i}@example.com", password="pass", bank_account=self.bank_account(f"PAYPAL_{i}")
+            )
+            self.assign("User", user.id)
+
+        with self.assertNumQueries(4):
+            self.assertEqual(len(self.owed()), 12)
+
+    def test_payouts_are_batched_sent_and_polled(self):
+        """Test payouts are sent in batches, and paid accounts move their last payout."""
+        self.donate("100.00")
+        self.stub.payout_item_statuses["PAYPAL_GROUP"] = "FAILED"
+
+        with patch("payment.services.payout.PAYPAL_PAYOUT_BATCH_LIMIT", 1):
+            payouts = payouts_create()
+
+        self.assertEqual(len(payouts), 2)
+        self.assertEqual(payouts_process(), {"submitted": 2, "polled": 0})
+        self.assertEqual(
+            [[item["receiver"] for item in payout["items"]] for payout in self.stub.payouts.values()],
+            [["PAYPAL_USER"], ["PAYPAL_GROUP"]],
+        )
+        self.assertEqual(self.owed(), {})
+
+        self.assertEqual(payouts_process(), {"submitted": 0, "polled": 2})
+
+        self.assertEqual(
+            dict(PayoutItem.objects.values_list("bank_account__bank_account_token_id", "status")),
+            {"PAYPAL_USER": PayoutItem.Status.SUCCESS, "PAYPAL_GROUP": PayoutItem.Status.FAILED},
+        )
+        self.assertFalse(Payout.objects.exclude(status=Payout.Status.SUCCESS).exists())
+        self.user.bank_account.refresh_from_db()
+        self.assertEqual(self.user.bank_account.last_payout, payouts[0].period_end)
+        # Failed items are owed again.
+        self.assertEqual(self.owed(), {"PAYPAL_GROUP": Decimal("50.00")})
+
+    def test_polling_pages_through_items(self):
+        """Test batch items are polled a page at a time."""
+        self.donate("100.00")
+        payouts_create()
+        payouts_process()
+
+        with patch("payment.services.payout.PAYPAL_PAYOUT_PAGE_SIZE", 1):
+            payouts_process()
+
+        self.assertEqual(self.stub.paths("/v1/payments/payouts/PAYOUT_BATCH_1"), 2)
+        self.assertEqual(PayoutItem.objects.filter(status=PayoutItem.Status.SUCCESS).count(), 2)
+
+    @override_settings(PAYPAL_MAX_RETRIES=0)
+    def test_batch_sent_again_after_lost_response_is_updated(self):
+        """Test a batch whose response was lost is matched to the batch PayPal created, and not sent twice."""
+        self.donate("100.00")
+        payout = payouts_create()[0]
+        self.stub.payout_responses_lost = 1
+
+        with self.assertRaises(HTTPError):
+            payouts_process()
+
+        payout.refresh_from_db()
+        self.assertEqual(payout.status, Payout.Status.NEW)
+
+        self.assertEqual(payouts_process(), {"submitted": 1, "polled": 0})
+
+        payout.refresh_from_db()
+        self.assertEqual((payout.payout_batch_id, payout.status), ("PAYOUT_BATCH_1", Payout.Status.PENDING))
+        self.assertEqual(list(self.stub.payouts), ["PAYOUT_BATCH_1"])
@@ -0,0 +1,88 @@
+"""Test PayPal client against a local stub server."""
+
+import threading
+
+import requests
+from django.test import SimpleTestCase
+
+from payment.clients import PayPalClient
+
+from .stubs import PayPalStub
+
+
+class PayPalClientTests(SimpleTestCase):
+    def setUp(self):
+        self.stub = PayPalStub().__enter__()
+        self.addCleanup(self.stub.__exit__)
+
+    def paypal_client(self, **kwargs):
+        options = {"base_url": self.stub.url, "client_id": "id", "secret": "secret", "backoff_factor": 0}
+        options.update(kwargs)
+        return PayPalClient(**options)
+
+    def test_token_is_cached(self):
+        client = self.paypal_client()
+
+        client.post("/v2/checkout/orders", json={})
+        client.post("/v2/checkout/orders/ORDER/capture")
+
+        self.assertEqual(self.stub.paths("/v1/oauth2/token"), 1)
+
+    def test_token_is_refreshed_before_it_expires(self):
+        self.stub.expires_in = PayPalClient.TOKEN_EXPIRY_MARGIN
+        client = self.paypal_client()
+
+        client.post("/v2/checkout/orders", json={})
+        client.post("/v2/checkout/orders", json={})
+
+        self.assertEqual(self.stub.paths("/v1/oauth2/token"), 2)
+
+    def test_token_refresh_is_thread_safe(self):
+        client = self.paypal_client()
+        threads = [threading.Thread(target=client.access_token) for _ in range(10)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.stub.paths("/v1/oauth2/token"), 1)
+
+    def test_revoked_token_is_replaced(self):
+        client = self.paypal_client()
+        self.stub.revoked_tokens.add(client.access_token())
+
+        result = client.post("/v2/checkout/orders", json={})
+
+        self.assertEqual(result["id"], "PAYPAL_ORDER_ID")
+        self.assertEqual(self.stub.paths("/v1/oauth2/token"), 2)
+
+    def test_server_errors_are_retried_with_same_request_id(self):
+        client = self.paypal_client(max_retries=2)
+        client.access_token()
+        self.stub.failures = [503, 502]
+
+        result = client.post("/v2/checkout/orders", json={})
+
+        self.assertEqual(result["id"], "PAYPAL_ORDER_ID")
+        request_ids = {
+            headers["PayPal-Request-Id"] for _, path, headers, _ in self.stub.requests if path != "/v1/oauth2/token"
+        }
+        self.assertEqual(self.stub.paths("/v2/checkout/orders"), 3)
+        self.assertEqual(len(request_ids), 1)
+
+    def test_server_errors_raise_once_retries_are_exhausted(self):
+        client = self.paypal_client(max_retries=1)
+        client.access_token()
+        self.stub.failures = [503, 503]
+
+        with self.assertRaises(requests.HTTPError):
+            client.post("/v2/checkout/orders", json={})
+
+    def test_connections_are_kept_alive(self):
+        client = self.paypal_client()
+
+        for _ in range(5):
+            client.post("/v2/checkout/orders", json={})
+
+        self.assertEqual(len({port for _, _, _, port in self.stub.requests}), 1)
@@ -1,13 +1,15 @@
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from payment.services import (
     paypal_payment_capture,
     paypal_payment_create,
 )
 
+from .stubs import PayPalStub
+
 User = get_user_model()
 
 
@@ -16,12 +18,15 @@ class PayPalServiceTests(TestCase):
         self.user = User.objects.create_user(email="user@example.com", password="pass")
         self.amount = "10.00"
 
-    @patch("payment.services.paypal.external_payment_create")
-    @patch("payment.services.paypal.requests.post")
-    def test_paypal_payment_create_success(self, mock_post, mock_external_create):
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"id": "PAYPAL_ORDER_ID"}
+        self.stub = PayPalStub().__enter__()
+        self.addCleanup(self.stub.__exit__)
 
+        settings_override = override_settings(PAYPAL_BASE_URL=self.stub.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @patch("payment.services.paypal.external_payment_create")
+    def test_paypal_payment_create_success(self, mock_external_create):
         result = paypal_payment_create(
             payer=self.user,
             amount=self.amount,
@@ -34,15 +39,12 @@ class PayPalServiceTests(TestCase):
             payer=self.user,
             amount=self.amount,
             gateway_payment_id="PAYPAL_ORDER_ID",
+            campaign=None,
         )
 
     @patch("payment.services.paypal.external_payment_capture")
     @patch("payment.services.paypal.payment_get")
-    @patch("payment.services.paypal.requests.post")
-    def test_paypal_payment_capture_success(self, mock_post, mock_payment_get, mock_external_capture):
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"status": "COMPLETED"}
-
+    def test_paypal_payment_capture_success(self, mock_payment_get, mock_external_capture):
         mock_payment = MagicMock()
         mock_payment_get.return_value = mock_payment
 
@@ -53,3 +55,11 @@ class PayPalServiceTests(TestCase):
 
         self.assertEqual(result["status"], "COMPLETED")
         mock_external_capture.assert_called_once_with(payment=mock_payment, capture_payment_func=fake_capture)
+
+    @patch("payment.services.paypal.external_payment_create")
+    def test_paypal_checkout_requests_one_token(self, mock_external_create):
+        paypal_payment_create(payer=self.user, amount=self.amount)
+        paypal_payment_create(payer=self.user, amount=self.amount)
+
+        self.assertEqual(self.stub.paths("/v1/oauth2/token"), 1)
+        self.assertEqual(self.stub.paths("/v2/checkout/orders"), 2)
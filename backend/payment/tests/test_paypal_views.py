@@ -16,7 +16,7 @@ class PayPalViewsTests(TestCase):
         self.user = User.objects.create_user(email="test@example.com", password="pass")
         self.client.force_authenticate(user=self.user)
 
-    @patch("payment.views.paypal_payment_create")
+    @patch("payment.views.paypal_payment_create_async")
     @patch("payment.views.reverse")
     def test_create_paypal_payment_view(self, mock_reverse, mock_create_payment):
         mock_create_payment.return_value = {"id": "PAYPAL_ORDER_123"}
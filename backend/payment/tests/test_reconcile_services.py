@@ -0,0 +1,181 @@
+"""Test reconciliation services."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from djmoney.money import Money
+
+from campaign.models import Campaign
+from donation.models import ProjectDonationSummary
+from donation.services import donation_create
+from payment.models import Payment
+from payment.services import payments_reconcile, payments_status_update
+from project.models import Project
+
+from .stubs import PayPalStub, StripeStub
+
+User = get_user_model()
+
+
+class PaymentsReconcileTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="pass")
+        self.created = timezone.now() - timedelta(hours=2)
+
+        self.stripe_stub = StripeStub().__enter__()
+        self.addCleanup(self.stripe_stub.__exit__)
+        for attr, value in (("api_base", self.stripe_stub.url), ("api_key", "sk_test")):
+            stripe_patch = patch.object(stripe, attr, value)
+            stripe_patch.start()
+            self.addCleanup(stripe_patch.stop)
+
+        self.paypal_stub = PayPalStub().__enter__()
+        self.addCleanup(self.paypal_stub.__exit__)
+        settings_override = override_settings(PAYPAL_BASE_URL=self.paypal_stub.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def payment(self, platform, gateway_payment_id, status=Payment.Status.PENDING, created=None):
+        payment = Payment.objects.create(
+            user=self.user,
+            platform=platform,
+            gateway_payment_id=gateway_payment_id,
+            amount=10,
+            status=status,
+        )
+        Payment.objects.filter(id=payment.id).update(created=created or self.created)
+        return payment
+
+    def stripe_payment_intent(self, payment_intent_id, status):
+        self.stripe_stub.payment_intents.insert(
+            0, {"id": payment_intent_id, "status": status, "created": int(self.created.timestamp())}
+        )
+
+    def paypal_transaction(self, order_id, status):
+        self.paypal_stub.transactions.append(
+            {"transaction_info": {"paypal_reference_id": order_id, "transaction_status": status}}
+        )
+
+    def statuses(self):
+        return dict(Payment.objects.values_list("gateway_payment_id", "status"))
+
+    def test_pending_payments_are_reconciled(self):
+        """Test pending payments take their final status on the gateway."""
+        self.payment(Payment.Platforms.STRIPE, "pi_succeeded")
+        self.payment(Payment.Platforms.STRIPE, "pi_canceled")
+        self.payment(Payment.Platforms.STRIPE, "pi_processing")
+        self.payment(Payment.Platforms.PAYPAL, "ORDER_COMPLETED")
+        self.payment(Payment.Platforms.PAYPAL, "ORDER_DENIED")
+        self.payment(Payment.Platforms.PAYPAL, "ORDER_UNKNOWN")
+        self.stripe_payment_intent("pi_succeeded", "succeeded")
+        self.stripe_payment_intent("pi_canceled", "canceled")
+        self.stripe_payment_intent("pi_processing", "processing")
+        self.paypal_transaction("ORDER_COMPLETED", "S")
+        self.paypal_transaction("ORDER_DENIED", "D")
+
+        updated = payments_reconcile()
+
+        self.assertEqual(updated, {Payment.Status.COMPLETED: 2, Payment.Status.CANCELED: 1, Payment.Status.FAILED: 1})
+        self.assertEqual(
+            self.statuses(),
+            {
+                "pi_succeeded": Payment.Status.COMPLETED,
+                "pi_canceled": Payment.Status.CANCELED,
+                "pi_processing": Payment.Status.PENDING,
+                "ORDER_COMPLETED": Payment.Status.COMPLETED,
+                "ORDER_DENIED": Payment.Status.FAILED,
+                "ORDER_UNKNOWN": Payment.Status.PENDING,
+            },
+        )
+
+    def test_chunks_list_gateways_and_update_once(self):
+        """Test each chunk pages through the gateway list and runs a single UPDATE."""
+        for i in range(12):
+            self.payment(Payment.Platforms.STRIPE, f"pi_{i}")
+        for i in range(150):
+            self.stripe_payment_intent(f"pi_{i}", "succeeded")
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = payments_reconcile(chunk_size=6)
+
+        updates = [query for query in queries if query["sql"].lstrip().startswith("UPDATE")]
+        self.assertEqual(updated, {Payment.Status.COMPLETED: 12})
+        self.assertEqual(len(updates), 2)
+        # 150 PaymentIntents are listed in 2 pages, for each of 2 chunks.
+        self.assertEqual(self.stripe_stub.paths("/v1/payment_intents"), 4)
+
+    def test_sparse_payments_are_retrieved(self):
+        """Test payments too few for their time window are retrieved, rather than listing the window."""
+        self.payment(Payment.Platforms.STRIPE, "pi_old", created=self.created - timedelta(days=30))
+        self.payment(Payment.Platforms.STRIPE, "pi_new")
+        self.payment(Payment.Platforms.STRIPE, "pi_unknown")
+        self.stripe_payment_intent("pi_old", "succeeded")
+        self.stripe_payment_intent("pi_new", "canceled")
+        for i in range(150):
+            self.stripe_payment_intent(f"pi_other_{i}", "succeeded")
+
+        updated = payments_reconcile()
+
+        self.assertEqual(updated, {Payment.Status.COMPLETED: 1, Payment.Status.CANCELED: 1})
+        self.assertEqual(self.statuses()["pi_unknown"], Payment.Status.PENDING)
+        self.assertEqual(self.stripe_stub.paths("/v1/payment_intents"), 0)
+        self.assertEqual(
+            [self.stripe_stub.paths(f"/v1/payment_intents/{i}") for i in ("pi_old", "pi_new", "pi_unknown")],
+            [1, 1, 1],
+        )
+
+    def test_completed_payments_are_donated(self):
+        """Test payments completed by reconciliation create their donation."""
+        project = Project.objects.create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        campaign = Campaign.objects.create(
+            title="Wells", description="Wells", project=project, owner=self.user, target=Money(500, "USD")
+        )
+        payment = self.payment(Payment.Platforms.STRIPE, "pi_succeeded")
+        Payment.objects.filter(id=payment.id).update(campaign=campaign)
+        self.stripe_payment_intent("pi_succeeded", "succeeded")
+
+        payments_reconcile()
+
+        self.assertEqual(payment.donations.get().campaign, campaign)
+
+    def test_reversed_payments_lose_their_donations(self):
+        """Test payments reversed on PayPal are refunded, and their donations deleted."""
+        project = Project.objects.create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        campaign = Campaign.objects.create(
+            title="Wells", description="Wells", project=project, owner=self.user, target=Money(500, "USD")
+        )
+        payment = self.payment(Payment.Platforms.PAYPAL, "ORDER_REVERSED")
+        donation_create(donor=self.user, amount=10, campaign=campaign, payment=payment)
+        self.paypal_transaction("ORDER_REVERSED", "V")
+
+        self.assertEqual(payments_reconcile(), {Payment.Status.REFUNDED: 1})
+        self.assertFalse(payment.donations.exists())
+        self.assertEqual(ProjectDonationSummary.objects.get(project=project).donations_count, 0)
+
+    def test_recent_and_settled_payments_are_skipped(self):
+        """Test recent payments and payments no longer pending are not reconciled."""
+        self.payment(Payment.Platforms.STRIPE, "pi_recent", created=timezone.now())
+        self.payment(Payment.Platforms.STRIPE, "pi_refunded", status=Payment.Status.REFUNDED)
+        self.stripe_payment_intent("pi_recent", "succeeded")
+        self.stripe_payment_intent("pi_refunded", "succeeded")
+
+        self.assertEqual(payments_reconcile(), {})
+        self.assertEqual(self.stripe_stub.paths("/v1/payment_intents"), 0)
+
+    def test_status_update_leaves_settled_payments(self):
+        """Test payments settled meanwhile, i.e. by a webhook, are not overwritten."""
+        pending = self.payment(Payment.Platforms.STRIPE, "pi_pending")
+        refunded = self.payment(Payment.Platforms.STRIPE, "pi_refunded", status=Payment.Status.REFUNDED)
+
+        updated = payments_status_update({pending.id: Payment.Status.COMPLETED, refunded.id: Payment.Status.COMPLETED})
+
+        self.assertEqual(updated, {pending.id: Payment.Status.COMPLETED})
+        self.assertEqual(
+            self.statuses(), {"pi_pending": Payment.Status.COMPLETED, "pi_refunded": Payment.Status.REFUNDED}
+        )
@@ -0,0 +1,146 @@
+"""Test Stripe services."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from djmoney.money import Money
+
+from campaign.services import campaign_create
+from donation.models import ProjectDonationSummary
+from donation.services import donation_create
+from payment.models import Payment
+from payment.services import stripe_captures_verify, stripe_payment_capture, stripe_webhook_event_create
+from payment.services.webhook import webhook_events_process
+from project.services import project_create
+
+User = get_user_model()
+
+
+class StripeCaptureTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="pass")
+        self.payment = Payment.objects.create(
+            user=self.user,
+            platform=Payment.Platforms.STRIPE,
+            gateway_payment_id="pi_1",
+            amount=10,
+        )
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.retrieve")
+    def test_capture_from_webhook_payload(self, mock_retrieve):
+        """Test a succeeded event captures its payment without calling Stripe."""
+        stripe_webhook_event_create(
+            payload={
+                "id": "evt_1",
+                "type": "payment_intent.succeeded",
+                "data": {"object": {"id": "pi_1", "status": "succeeded"}},
+            }
+        )
+
+        webhook_events_process()
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.COMPLETED)
+        mock_retrieve.assert_not_called()
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.retrieve")
+    def test_capture_retrieves_payment_intent_without_payload(self, mock_retrieve):
+        """Test capture retrieves the PaymentIntent when none is passed in."""
+        mock_retrieve.return_value = {"id": "pi_1", "status": "requires_payment_method"}
+
+        with self.assertRaises(ValueError):
+            stripe_payment_capture(payment_id="pi_1", capture_payment_func=lambda user, amount: None)
+
+        mock_retrieve.assert_called_once_with("pi_1")
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.PENDING)
+
+
+class StripeRefundTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="user@example.com", password="pass")
+        self.project = project_create(name="Water", target=Money(1000, "USD"), city="Gulu", country="Uganda")
+        campaign = campaign_create(
+            title="Wells", description="Wells", project=self.project, owner=user, target=Money(500, "USD")
+        )
+        self.payment = Payment.objects.create(
+            user=user,
+            platform=Payment.Platforms.STRIPE,
+            gateway_payment_id="pi_1",
+            amount=10,
+            status=Payment.Status.COMPLETED,
+        )
+        donation_create(donor=user, amount=10, campaign=campaign, payment=self.payment)
+
+    def test_refund_deletes_donations(self):
+        """Test a refunded payment's donations no longer count in summaries."""
+        stripe_webhook_event_create(
+            payload={
+                "id": "evt_1",
+                "type": "charge.refunded",
+                "data": {"object": {"id": "ch_1", "payment_intent": "pi_1"}},
+            }
+        )
+
+        webhook_events_process()
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.REFUNDED)
+        self.assertFalse(self.payment.donations.exists())
+        self.assertEqual(ProjectDonationSummary.objects.get(project=self.project).donations_total, Money(0, "USD"))
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.list")
+    def test_hold_deletes_donations(self, mock_list):
+        """Test a payment put on hold no longer counts in summaries."""
+        mock_list.return_value = MagicMock(auto_paging_iter=lambda: iter([]))
+
+        stripe_captures_verify(since=timezone.now() - timedelta(hours=1))
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.ON_HOLD)
+        self.assertFalse(self.payment.donations.exists())
+        self.assertEqual(ProjectDonationSummary.objects.get(project=self.project).donations_count, 0)
+
+
+class StripeCapturesVerifyTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="user@example.com", password="pass")
+        for gateway_payment_id in ("pi_1", "pi_2", "pi_3"):
+            Payment.objects.create(
+                user=user,
+                platform=Payment.Platforms.STRIPE,
+                gateway_payment_id=gateway_payment_id,
+                amount=10,
+                status=Payment.Status.COMPLETED,
+            )
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.list")
+    def test_unverified_captures_are_put_on_hold(self, mock_list):
+        """Test completed payments not succeeded on Stripe are put on hold."""
+        mock_list.return_value = MagicMock(
+            auto_paging_iter=lambda: iter(
+                [
+                    {"id": "pi_1", "status": "succeeded"},
+                    {"id": "pi_2", "status": "canceled"},
+                    {"id": "pi_other", "status": "succeeded"},
+                ]
+            )
+        )
+
+        unverified_ids = stripe_captures_verify(since=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(unverified_ids, ["pi_2", "pi_3"])
+        self.assertEqual(
+            dict(Payment.objects.values_list("gateway_payment_id", "status")),
+            {"pi_1": Payment.Status.COMPLETED, "pi_2": Payment.Status.ON_HOLD, "pi_3": Payment.Status.ON_HOLD},
+        )
+        mock_list.assert_called_once()
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.list")
+    def test_nothing_to_verify(self, mock_list):
+        """Test Stripe is not called without recent captures."""
+        self.assertEqual(stripe_captures_verify(since=timezone.now() + timedelta(hours=1)), [])
+        mock_list.assert_not_called()
@@ -0,0 +1,187 @@
+"""Test webhook services."""
+
+import hashlib
+import hmac
+import json
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from payment.models import Payment, WebhookEvent
+from payment.services import (
+    WEBHOOK_MAX_ATTEMPTS,
+    stripe_webhook_event_create,
+    webhook_event_process_next,
+    webhook_events_process,
+)
+
+User = get_user_model()
+
+
+def stripe_event(event_id, event_type, payment_intent_id, **data):
+    """Stripe event payload."""
+    obj = {"id": payment_intent_id, **data}
+    return {"id": event_id, "type": event_type, "data": {"object": obj}}
+
+
+def stripe_signature(payload: bytes, secret: str) -> str:
+    """Stripe-Signature header of payload."""
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+class StripeWebhookViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse("stripe-webhook")
+
+    def post(self, payload, signature=None):
+        body = json.dumps(payload).encode()
+        return self.client.post(
+            self.url,
+            data=body,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature or stripe_signature(body, settings.STRIPE_WEBHOOK_SECRET),
+        )
+
+    @patch("payment.services.stripe.stripe.PaymentIntent.retrieve")
+    def test_event_is_queued_without_processing(self, mock_retrieve):
+        """Test the webhook persists the event and returns before processing it."""
+        response = self.post(stripe_event("evt_1", "payment_intent.succeeded", "pi_1"))
+
+        self.assertEqual(response.status_code, 200)
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.event_id, "evt_1")
+        self.assertEqual(event.ordering_key, "pi_1")
+        self.assertEqual(event.status, WebhookEvent.Status.PENDING)
+        mock_retrieve.assert_not_called()
+
+    def test_redelivered_event_is_one_lookup(self):
+        """Test a redelivered event is acknowledged after a single query."""
+        payload = stripe_event("evt_1", "payment_intent.succeeded", "pi_1")
+        self.post(payload)
+
+        with self.assertNumQueries(1):
+            response = self.post(payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+    def test_invalid_signature_is_rejected(self):
+        """Test events failing signature verification are not queued."""
+        response = self.post(stripe_event("evt_1", "payment_intent.succeeded", "pi_1"), signature="t=1,v1=invalid")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+
+class WebhookEventProcessTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com", password="pass")
+        self.payment = Payment.objects.create(
+            user=self.user,
+            platform=Payment.Platforms.STRIPE,
+            gateway_payment_id="pi_1",
+            amount=10,
+        )
+
+    def test_events_update_payments(self):
+        """Test processing applies Stripe events to payments."""
+        stripe_webhook_event_create(
+            payload=stripe_event("evt_1", "payment_intent.payment_failed", "pi_1", last_payment_error={"message": "no"})
+        )
+
+        self.assertEqual(webhook_events_process(), 1)
+
+        self.payment.refresh_from_db()
+        event = WebhookEvent.objects.get()
+        self.assertEqual(self.payment.status, Payment.Status.FAILED)
+        self.assertEqual(event.status, WebhookEvent.Status.PROCESSED)
+        self.assertIsNotNone(event.processed_at)
+
+    def test_refund_is_applied_to_payment_intent(self):
+        """Test charge events find their payment by PaymentIntent."""
+        stripe_webhook_event_create(payload=stripe_event("evt_1", "charge.refunded", "ch_1", payment_intent="pi_1"))
+
+        webhook_events_process()
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.Status.REFUNDED)
+
+    def test_events_of_a_payment_are_processed_in_order(self):
+        """Test an event waits for earlier events of the same payment, but not for other payments."""
+        first, _ = stripe_webhook_event_create(payload=stripe_event("evt_1", "payment_intent.succeeded", "pi_1"))
+        second, _ = stripe_webhook_event_create(
+            payload=stripe_event("evt_2", "charge.refunded", "ch_1", payment_intent="pi_1")
+        )
+        other, _ = stripe_webhook_event_create(payload=stripe_event("evt_3", "payment_intent.succeeded", "pi_2"))
+        # First event is not due yet, i.e. it is being retried.
+        WebhookEvent.objects.filter(id=first.id).update(next_attempt_at=timezone.now() + timedelta(minutes=1))
+        handled = []
+
+        webhook_events_process(handler=lambda event: handled.append(event.event_id))
+        self.assertEqual(handled, [other.event_id])
+
+        WebhookEvent.objects.filter(id=first.id).update(next_attempt_at=timezone.now())
+        webhook_events_process(handler=lambda event: handled.append(event.event_id))
+        self.assertEqual(handled, [other.event_id, first.event_id, second.event_id])
+
+    def test_redelivered_event_is_queued_once(self):
+        """Test an event id already received is not queued, nor handled, again."""
+        handled = []
+
+        for _ in range(2):
+            stripe_webhook_event_create(payload=stripe_event("evt_1", "payment_intent.succeeded", "pi_1"))
+            webhook_events_process(handler=lambda event: handled.append(event.event_id))
+
+        self.assertEqual(handled, ["evt_1"])
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+    def test_processing_latency_is_recorded(self):
+        """Test processed events record the time from receipt."""
+        event, _ = stripe_webhook_event_create(payload=stripe_event("evt_1", "payment_intent.succeeded", "pi_1"))
+
+        webhook_events_process(handler=lambda event: None)
+
+        event.refresh_from_db()
+        self.assertEqual(event.processing_latency, event.processed_at - event.created)
+
+    def test_failed_event_is_retried_with_backoff(self):
+        """Test failures are rescheduled with growing delays, then given up on."""
+        stripe_webhook_event_create(payload=stripe_event("evt_1", "payment_intent.succeeded", "pi_1"))
+
+        def fail(event):
+            raise ValueError("gateway down")
+
+        delays = []
+        for _ in range(WEBHOOK_MAX_ATTEMPTS):
+            now = timezone.now()
+            WebhookEvent.objects.update(next_attempt_at=now)
+            event = webhook_event_process_next(handler=fail)
+            delays.append(event.next_attempt_at - now)
+
+        self.assertEqual(event.status, WebhookEvent.Status.FAILED)
+        self.assertEqual(event.attempts, WEBHOOK_MAX_ATTEMPTS)
+        self.assertEqual(event.last_error, "ValueError: gateway down")
+        self.assertLess(delays[0], delays[1])
+        self.assertIsNone(webhook_event_process_next(handler=fail))
+
+
+class WebhookEventsProcessCommandTests(TransactionTestCase):
+    def test_workers_process_each_event_once(self):
+        """Test concurrent workers process every event exactly once."""
+        for i in range(20):
+            stripe_webhook_event_create(payload=stripe_event(f"evt_{i}", "unhandled.event", f"pi_{i % 5}"))
+
+        call_command("webhook_events_process", "--workers", "4", "--once", stdout=StringIO())
+
+        self.assertEqual(WebhookEvent.objects.filter(status=WebhookEvent.Status.PROCESSED).count(), 20)
+        self.assertTrue(all(event.attempts == 1 for event in WebhookEvent.objects.all()))
@@ -2,6 +2,7 @@
 
 import logging
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
@@ -17,13 +18,16 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
+from campaign.models import Campaign
+from core.views import AsyncAPIView
+
 from .models import Payment
 from .services import (
     paypal_payment_cancel,
-    paypal_payment_capture,
-    paypal_payment_create,
-    stripe_payment_create,
-    stripe_payment_cancel,
+    paypal_payment_capture_async,
+    paypal_payment_create_async,
+    stripe_payment_cancel_async,
+    stripe_payment_create_async,
 )
 
 logger = logging.getLogger("payment")
@@ -31,7 +35,7 @@ User = get_user_model()
 
 
 @extend_schema_serializer(component_name="CreatePayPalPayment")
-class CreatePayPalPaymentView(APIView):
+class CreatePayPalPaymentView(AsyncAPIView):
     """Create PayPal Payment View."""
 
     class InputSerializer(serializers.Serializer):
@@ -40,6 +44,7 @@ class CreatePayPalPaymentView(APIView):
         amount = serializers.CharField()
         currency = serializers.CharField(default="USD", required=False)
         payer_id = serializers.IntegerField()
+        campaign_id = serializers.IntegerField(required=False, help_text="Campaign to donate to once captured.")
 
     class OutputSerializer(serializers.Serializer):
         """PayPal Payment Output Serializer."""
@@ -57,7 +62,7 @@ class CreatePayPalPaymentView(APIView):
         examples=[
             OpenApiExample(
                 name="Valid Request",
-                value={"amount": "10.00", "currency": "USD", "payer_id": 1},
+                value={"amount": "10.00", "currency": "USD", "payer_id": 1, "campaign_id": 1},
                 request_only=True,
             ),
             OpenApiExample(
@@ -83,31 +88,34 @@ class CreatePayPalPaymentView(APIView):
             ),
         ],
     )
-    def post(self, request):
+    async def post(self, request):
         """Create PayPal Payment."""
         amount = request.data.get("amount")
         currency = request.data.get("currency", "USD")
         payer_id = request.data.get("payer_id")
+        campaign_id = request.data.get("campaign_id")
         return_url = request.build_absolute_uri(reverse("paypal-capture"))
         cancel_url = request.build_absolute_uri(reverse("paypal-cancel"))
 
         if not amount:
             return Response({"amount": "Amount is required."}, status=400)
 
-        payer = get_object_or_404(User, pk=payer_id)
-        paypal_payment_data = paypal_payment_create(
+        payer = await sync_to_async(get_object_or_404)(User, pk=payer_id)
+        campaign = await sync_to_async(get_object_or_404)(Campaign, pk=campaign_id) if campaign_id else None
+        paypal_payment_data = await paypal_payment_create_async(
             payer=payer,
             amount=amount,
             currency=currency,
             return_url=return_url,
             cancel_url=cancel_url,
+            campaign=campaign,
         )
 
         return Response(paypal_payment_data, status=201)
 
 
 @extend_schema_serializer(component_name="CapturePayPalPayment")
-class CapturePayPalPaymentView(APIView):
+class CapturePayPalPaymentView(AsyncAPIView):
     """Execute PayPal Payment View."""
 
     class InputSerializer(serializers.Serializer):
@@ -249,11 +257,11 @@ class CapturePayPalPaymentView(APIView):
             )
         ],
     )
-    def get(self, request):
+    async def get(self, request):
         """Capture PayPal Payment."""
         try:
             token = request.GET.get("token")
-            paypal_payment_capture_data = paypal_payment_capture(
+            paypal_payment_capture_data = await paypal_payment_capture_async(
                 payment_id=token,
                 capture_payment_func=lambda user, amount: None,
             )
@@ -318,7 +326,7 @@ class CancelPayPalPaymentView(APIView):
 
 
 @extend_schema_serializer(component_name="CreateStripePayment")
-class CreateStripePaymentView(APIView):
+class CreateStripePaymentView(AsyncAPIView):
     """Create Stripe Payment View."""
 
     permission_classes = [IsAuthenticated]  # Temporarily disabled for testing
@@ -330,6 +338,7 @@ class CreateStripePaymentView(APIView):
             help_text="Payment amount in decimal format (e.g. 10.50)",
         )
         currency = serializers.CharField(default="usd", required=False)
+        campaign_id = serializers.IntegerField(required=False, help_text="Campaign to donate to once captured.")
 
     class OutputSerializer(serializers.Serializer):  # noqa
         client_secret = serializers.CharField()
@@ -343,7 +352,7 @@ class CreateStripePaymentView(APIView):
         examples=[
             OpenApiExample(
                 name="Valid Request",
-                value={"amount": "20.00", "currency": "usd"},
+                value={"amount": "20.00", "currency": "usd", "campaign_id": 1},
                 request_only=True,
             ),
             OpenApiExample(
@@ -353,7 +362,7 @@ class CreateStripePaymentView(APIView):
             ),
         ],
     )
-    def post(self, request):
+    async def post(self, request):
         """Create Stripe Payment.
         
         Creates a new Stripe PaymentIntent and stores the payment record
@@ -369,27 +378,30 @@ class CreateStripePaymentView(APIView):
         Raises:
             400: If validation fails or Stripe payment creation fails
         """
-        logger.info(f"Starting Stripe payment process: amount={request.data.get('amount')}, "
-                    f"currency={request.data.get('currency', 'usd')}")
-        
         serializer = self.InputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
 
         amount = serializer.validated_data.get("amount")
         currency = serializer.validated_data.get("currency", "usd")
+        campaign_id = serializer.validated_data.get("campaign_id")
+        campaign = await sync_to_async(get_object_or_404)(Campaign, pk=campaign_id) if campaign_id else None
         user = request.user
 
         try:
-            stripe_payment_data = stripe_payment_create(
+            stripe_payment_data = await stripe_payment_create_async(
                 amount=amount,
                 currency=currency,
-                payer=user
+                payer=user,
+                campaign=campaign,
             )
 
             logger.info(
-                f"Stripe PaymentIntent criado: id={stripe_payment_data.id}, "
-                f"amount={amount}, currency={currency}, user={request.user}"
+                "Stripe PaymentIntent created: id=%s amount=%s currency=%s user=%s",
+                stripe_payment_data.id,
+                amount,
+                currency,
+                user.id,
             )
 
             output_serializer = self.OutputSerializer(data={"client_secret": stripe_payment_data.get("client_secret")})
@@ -403,7 +415,7 @@ class CreateStripePaymentView(APIView):
             return Response({"error": "Stripe payment failed"}, status=400)
         
 @extend_schema_serializer(component_name="CancelStripePayment")
-class CancelStripePaymentView(APIView):
+class CancelStripePaymentView(AsyncAPIView):
     """Cancel Stripe Payment View."""
 
     permission_classes = [IsAuthenticated]
@@ -441,7 +453,7 @@ class CancelStripePaymentView(APIView):
         ],
 
     )
-    def post(self, request):
+    async def post(self, request):
         """Cancel Stripe Payment.
 
         Cancels a Stripe PaymentIntent that is in a cancelable state and 
@@ -473,13 +485,13 @@ class CancelStripePaymentView(APIView):
 
         user = request.user
 
-        logger.info(f"[Stripe] User {user.id} requested cancel of PaymentIntent {payment_id}")
+        logger.info("[Stripe] User %s requested cancel of PaymentIntent %s", user.id, payment_id)
 
         if not payment_id:
             return Response({"error": "paymentId is required."}, status=400)
 
         try:
-            stripe_payment_cancel(payment_id=payment_id)
+            await stripe_payment_cancel_async(payment_id=payment_id)
             return Response(status=204)
         except Payment.DoesNotExist:
             return Response({"error": "Payment not found."}, status=404)
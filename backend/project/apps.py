@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ProjectConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "project"
+
+    def ready(self):
+        from core.conditional import CATALOG_CAUSES, CATALOG_PROJECTS, catalog_invalidate
+        from core.renditions import renditions_register
+
+        from .models import Cause, Project
+
+        # Projects show their causes' icons.
+        renditions_register(Cause, "icon", on_generated=lambda: catalog_invalidate(CATALOG_CAUSES, CATALOG_PROJECTS))
+        renditions_register(Project, "img", on_generated=lambda: catalog_invalidate(CATALOG_PROJECTS))
@@ -2,7 +2,9 @@
 
 import django_filters
 
-from .models import Cause, Project, ProjectAssignment
+from core.search import search
+
+from .models import PROJECT_SEARCH_FIELDS, PROJECT_SEARCH_VECTOR, Cause, Project, ProjectAssignment
 
 
 class CauseFilter(django_filters.FilterSet):
@@ -24,6 +26,7 @@ class ProjectFilter(django_filters.FilterSet):
     city = django_filters.CharFilter(lookup_expr="icontains")
     country = django_filters.CharFilter(lookup_expr="icontains")
     description = django_filters.CharFilter(lookup_expr="icontains")
+    q = django_filters.CharFilter(method="filter_search")
 
     class Meta:  # noqa
         model = Project
@@ -39,6 +42,9 @@ class ProjectFilter(django_filters.FilterSet):
             "country",
         )
 
+    def filter_search(self, queryset, name, value):  # noqa
+        return search(queryset, value, vector=PROJECT_SEARCH_VECTOR, fields=PROJECT_SEARCH_FIELDS)
+
 
 class ProjectAssignmentFilter(django_filters.FilterSet):
     """ProjectAssignment Filter."""
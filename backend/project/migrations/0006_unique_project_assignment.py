@@ -0,0 +1,36 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+def delete_duplicate_assignments(apps, schema_editor):
+    ProjectAssignment = apps.get_model("project", "ProjectAssignment")
+
+    duplicates = (
+        ProjectAssignment.objects.order_by()
+        .values("project", "assignable_type", "assignable_id")
+        .annotate(keep=models.Min("id"), count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        ProjectAssignment.objects.filter(
+            project=duplicate["project"],
+            assignable_type=duplicate["assignable_type"],
+            assignable_id=duplicate["assignable_id"],
+        ).exclude(id=duplicate["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0005_alter_cause_options_alter_project_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_assignments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='projectassignment',
+            constraint=models.UniqueConstraint(fields=('project', 'assignable_type', 'assignable_id'), name='unique_project_assignment'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-18 12:58
+
+from django.db import migrations
+
+from core.search import search_index, search_vector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0006_unique_project_assignment'),
+    ]
+
+    operations = [
+        # PostgreSQL only, so not in the model's Meta.
+        search_index("project", "Project", "project_search_idx", search_vector(["name"], ["city", "country"], ["description"])),
+    ]
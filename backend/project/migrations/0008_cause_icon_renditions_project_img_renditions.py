@@ -0,0 +1,23 @@
+# Generated by Django 4.2.19 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0007_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cause',
+            name='icon_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='WebP thumbnails of icon, by size (see core.renditions).'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='img_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='WebP thumbnails of img, by size (see core.renditions).'),
+        ),
+    ]
@@ -8,8 +8,14 @@ from djmoney.models.fields import MoneyField
 from djmoney.models.validators import MinMoneyValidator
 from model_utils.models import TimeStampedModel
 
+from core.search import search_vector
+
 User = get_user_model()
 
+# Full-text search of projects, see core.search; indexed by migration 0007_search_indexes.
+PROJECT_SEARCH_FIELDS = ("name", "city", "country", "description")
+PROJECT_SEARCH_VECTOR = search_vector(["name"], ["city", "country"], ["description"])
+
 
 class Cause(TimeStampedModel):
     """
@@ -34,6 +40,12 @@ class Cause(TimeStampedModel):
         null=True,
         help_text="Optional image or icon representing the cause.",
     )
+    icon_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="WebP thumbnails of icon, by size (see core.renditions).",
+    )
 
     def __str__(self):
         """Represent Cause as string."""
@@ -79,6 +91,12 @@ class Project(TimeStampedModel):
         null=True,
         help_text="Optional main image representing the project.",
     )
+    img_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="WebP thumbnails of img, by size (see core.renditions).",
+    )
     causes = models.ManyToManyField(
         Cause,
         related_name="projects",
@@ -165,3 +183,11 @@ class ProjectAssignment(models.Model):
     def __str__(self):
         """Represent ProjectAssignment as string."""
         return f"ProjectAssignment: '{self.project.name}'"
+
+    class Meta:  # noqa
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "assignable_type", "assignable_id"],
+                name="unique_project_assignment",
+            ),
+        ]
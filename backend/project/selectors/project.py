@@ -1,21 +1,26 @@
 """Project selectors."""
 
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
-from django.db.models import Sum
 from django.db.models.query import QuerySet
 
 from campaign.models import Campaign
+from core.cache import cache_get_or_set
 from core.services import Amount, to_money
 from core.utils import get_object
-from donation.models import Donation
+from donation.models import Donation, ProjectDonationSummary
 from project.filters import ProjectAssignmentFilter, ProjectFilter
 from project.models import Project, ProjectAssignment
+from user.models import User, UserGroup
+
+# Invalidated whenever donation summaries or targets of projects change.
+PROJECT_DONATIONS_PERCENTAGE_CACHE = "project_donations_total_percentage"
+PROJECT_DONATIONS_PERCENTAGE_CACHE_TIMEOUT = 60 * 60 * 24
 
 
 def project_get(project_id: int) -> Optional[Project]:
     """Retrieve project."""
-    c = get_object(Project, id=project_id)
+    c = get_object(Project.objects.select_related("donation_summary"), id=project_id)
 
     return c
 
@@ -23,7 +28,7 @@ def project_get(project_id: int) -> Optional[Project]:
 def project_list(*, filters=None) -> QuerySet[Project]:
     """Retrieve projects."""
     filters = filters or {}
-    qs = Project.objects.all()
+    qs = Project.objects.select_related("donation_summary").prefetch_related("causes")
     return ProjectFilter(filters, qs).qs
 
 
@@ -43,6 +48,44 @@ def project_beneficiary_list(project_id: int, filters=None) -> QuerySet[ProjectA
     return ProjectAssignmentFilter(filters, qs).qs
 
 
+# Model and serialized columns of every beneficiary type.
+BENEFICIARY_VALUES = {
+    "User": (User, ("id", "first_name", "last_name", "email", "img", "is_group_leader")),
+    "UserGroup": (UserGroup, ("id", "name", "img", "interest")),
+}
+
+
+def project_beneficiaries_resolve(assignments: Iterable[Dict]) -> List[Dict]:
+    """
+    Resolve beneficiaries of assignments, i.e. of a page of project_beneficiary_list.
+
+    Assignments are dicts with assignable_type and assignable_id. Users and
+    UserGroups are fetched with one query per type, loading only serialized
+    columns, and returned as dicts under "beneficiary" (None if deleted).
+    """
+    assignments = list(assignments)
+    ids_by_type: Dict[str, set] = {}
+
+    for assignment in assignments:
+        ids_by_type.setdefault(assignment["assignable_type"], set()).add(assignment["assignable_id"])
+
+    beneficiaries = {}
+
+    for assignable_type, ids in ids_by_type.items():
+        model, fields = BENEFICIARY_VALUES[assignable_type]
+        for values in model.objects.filter(id__in=ids).values(*fields):
+            beneficiaries[(assignable_type, values["id"])] = values
+
+    return [
+        {
+            "assignable_type": assignment["assignable_type"],
+            "assignable_id": assignment["assignable_id"],
+            "beneficiary": beneficiaries.get((assignment["assignable_type"], assignment["assignable_id"])),
+        }
+        for assignment in assignments
+    ]
+
+
 def project_campaigns(project: Project) -> QuerySet[Campaign]:
     """Campaigns for project."""
     return project.campaigns.all()
@@ -53,15 +96,30 @@ def project_donations(project: Project) -> QuerySet[Donation]:
     return Donation.objects.filter(campaign__project=project)
 
 
+def project_donation_summary(project: Project) -> ProjectDonationSummary:
+    """Donation summary for project, empty if it has no donations."""
+    try:
+        return project.donation_summary
+    except ProjectDonationSummary.DoesNotExist:
+        return ProjectDonationSummary(project=project)
+
+
 def project_donations_total(project: Project) -> Amount:
     """Total donations for project."""
-    total = project_donations(project).aggregate(total=Sum("amount"))["total"] or 0
-
-    return to_money(total)
+    return to_money(project_donation_summary(project).donations_total)
 
 
 def project_donations_total_percentage(project: Project) -> int:
-    """Total donations percentage of project target."""
+    """Total donations percentage of project target, cached per project."""
+    return cache_get_or_set(
+        PROJECT_DONATIONS_PERCENTAGE_CACHE,
+        project.pk,
+        lambda: _project_donations_total_percentage(project),
+        timeout=PROJECT_DONATIONS_PERCENTAGE_CACHE_TIMEOUT,
+    )
+
+
+def _project_donations_total_percentage(project: Project) -> int:
     total_donated = project_donations_total(project)
 
     if total_donated:
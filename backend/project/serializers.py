@@ -1,13 +1,14 @@
 """Project Serializers."""
 
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from drf_spectacular.utils import PolymorphicProxySerializer, extend_schema_field
 from rest_framework import serializers
 
 from campaign.models import Campaign
 from user.models import UserGroup
 
 from .models import ProjectAssignment
-from .services import BENEFICIARY_MODEL_MAP
 
 User = get_user_model()
 
@@ -21,7 +22,12 @@ class CampaignSerializer(serializers.ModelSerializer):
 
 
 class BeneficiarySerializer(serializers.Serializer):
-    """Beneficiary Serializer."""
+    """
+    Beneficiary Serializer.
+
+    Serializes the plain dicts of `project_beneficiaries_resolve`, without
+    a nested serializer per row.
+    """
 
     assignable_type = serializers.ChoiceField(
         choices=ProjectAssignment.ASSIGNABLE_TYPE_CHOICES,
@@ -45,7 +51,7 @@ class BeneficiarySerializer(serializers.Serializer):
                 "is_group_leader",
             ]
 
-        def get_name(self, obj):  # noqa
+        def get_name(self, obj) -> str:  # noqa
             return obj.first_name + obj.last_name
 
     class UserGroupSerializer(serializers.ModelSerializer):
@@ -59,19 +65,43 @@ class BeneficiarySerializer(serializers.Serializer):
                 "interest",
             ]
 
-    def get_beneficiary(self, obj):  # noqa
-        """WARNING: Extremely inefficient for large lists."""
-        beneficiary_model = BENEFICIARY_MODEL_MAP.get(obj.assignable_type)
-
-        BENEFICIARY_SERIALIZER_MAP = {
-            "User": self.UserSerializer,
-            "UserGroup": self.UserGroupSerializer,
+    def to_representation(self, instance):  # noqa
+        return {
+            "assignable_type": instance["assignable_type"],
+            "assignable_id": instance["assignable_id"],
+            "beneficiary": self.get_beneficiary(instance),
         }
 
-        if beneficiary_model:
-            beneficiary = self.context[f"{obj.assignable_type}_map"].get(obj.assignable_id)
+    @extend_schema_field(
+        PolymorphicProxySerializer(
+            component_name="BeneficiaryDetail",
+            serializers=[UserSerializer, UserGroupSerializer],
+            resource_type_field_name=None,
+        )
+    )
+    def get_beneficiary(self, instance):  # noqa
+        values = instance["beneficiary"]
+
+        if values is None:
+            return None
+
+        beneficiary = {field: value for field, value in values.items() if field != "id"}
+        beneficiary["img"] = self._image_url(beneficiary["img"])
+
+        if instance["assignable_type"] == "User":
+            beneficiary["name"] = beneficiary["first_name"] + beneficiary["last_name"]
+
+        return beneficiary
+
+    def _image_url(self, name):
+        """URL of image as ImageField serializes it, absolute given a request."""
+        if not name:
+            return None
 
-            return BENEFICIARY_SERIALIZER_MAP.get(obj.assignable_type)(beneficiary).data
+        url = default_storage.url(name)
+        request = self.context.get("request")
+
+        return request.build_absolute_uri(url) if request else url
 
 
 class ProjectAssignmentSerializer(serializers.ModelSerializer):
@@ -84,3 +114,21 @@ class ProjectAssignmentSerializer(serializers.ModelSerializer):
         model = ProjectAssignment
         fields = ["id", "project", "assignable_type", "assignable_id"]
         read_only_fields = ["id", "project"]
+
+
+class BeneficiariesBulkSerializer(serializers.Serializer):
+    """Serializer for assigning or unassigning many beneficiaries at once."""
+
+    class BeneficiaryRefSerializer(serializers.Serializer):
+        """Beneficiary Reference Serializer."""
+
+        assignable_type = serializers.ChoiceField(choices=ProjectAssignment.ASSIGNABLE_TYPE_CHOICES)
+        assignable_id = serializers.IntegerField()
+
+    beneficiaries = BeneficiaryRefSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def get_beneficiary_refs(self):  # noqa
+        return [
+            (beneficiary["assignable_type"], beneficiary["assignable_id"])
+            for beneficiary in self.validated_data["beneficiaries"]
+        ]
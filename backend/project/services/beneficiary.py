@@ -1,9 +1,10 @@
 """ProjectAssignment services."""
 
-from typing import Optional, Tuple, Union
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
 
 from django.apps import apps
-from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 
 from project.models import Project, ProjectAssignment
 from user.models import User, UserGroup
@@ -13,6 +14,10 @@ BENEFICIARY_MODEL_MAP = {
     "User": User,
     "UserGroup": apps.get_model("user", "UserGroup"),
 }
+# (assignable_type, assignable_id) of a beneficiary, i.e. ("User", 5).
+BeneficiaryRef = Tuple[str, int]
+# Assignments inserted per statement by assign_beneficiaries_bulk.
+ASSIGN_BATCH_SIZE = 1000
 
 
 def _parse_beneficiary(beneficiary: Beneficiary) -> Tuple[str, int]:
@@ -77,3 +82,95 @@ def reassign_beneficiary(
         return assignment
     except ProjectAssignment.DoesNotExist:
         return None
+
+
+def _group_beneficiary_refs(beneficiaries: Iterable[BeneficiaryRef]) -> Dict[str, Set[int]]:
+    """Group beneficiary ids by assignable_type."""
+    ids_by_type: Dict[str, Set[int]] = {}
+
+    for assignable_type, assignable_id in beneficiaries:
+        if assignable_type not in BENEFICIARY_MODEL_MAP:
+            raise ValidationError({"beneficiaries": f"Invalid assignable_type: {assignable_type}."})
+        ids_by_type.setdefault(assignable_type, set()).add(assignable_id)
+
+    return ids_by_type
+
+
+def _validate_beneficiary_ids(ids_by_type: Dict[str, Set[int]]) -> None:
+    """Check that all beneficiaries exist, with one query per assignable_type."""
+    missing = []
+
+    for assignable_type, ids in ids_by_type.items():
+        model = BENEFICIARY_MODEL_MAP[assignable_type]
+        found = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        missing += [f"{assignable_type} {assignable_id}" for assignable_id in sorted(ids - found)]
+
+    if missing:
+        raise ValidationError({"beneficiaries": f"Beneficiaries not found: {', '.join(missing)}."})
+
+
+@transaction.atomic
+def assign_beneficiaries_bulk(
+    *,
+    project: Project,
+    beneficiaries: Iterable[BeneficiaryRef],
+) -> int:
+    """
+    Assign many beneficiaries to a project, given as (assignable_type, assignable_id).
+
+    Raise ValidationError, and assign none, if any beneficiary does not exist.
+    Beneficiaries already assigned are skipped. Return number of new assignments.
+    """
+    ids_by_type = _group_beneficiary_refs(beneficiaries)
+    _validate_beneficiary_ids(ids_by_type)
+
+    refs = [
+        (assignable_type, assignable_id)
+        for assignable_type, ids in ids_by_type.items()
+        for assignable_id in sorted(ids)
+    ]
+    table = connection.ops.quote_name(ProjectAssignment._meta.db_table)
+    assigned = 0
+
+    # Conflicting rows, i.e. assigned already or concurrently, are skipped, and not returned, so not counted.
+    for start in range(0, len(refs), ASSIGN_BATCH_SIZE):
+        batch = refs[start : start + ASSIGN_BATCH_SIZE]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (project_id, assignable_type, assignable_id) "
+                f"VALUES {', '.join(['(%s, %s, %s)'] * len(batch))} "
+                "ON CONFLICT DO NOTHING RETURNING id",
+                [
+                    value
+                    for assignable_type, assignable_id in batch
+                    for value in (project.pk, assignable_type, assignable_id)
+                ],
+            )
+            assigned += len(cursor.fetchall())
+
+    return assigned
+
+
+@transaction.atomic
+def unassign_beneficiaries_bulk(
+    *,
+    project: Project,
+    beneficiaries: Iterable[BeneficiaryRef],
+) -> int:
+    """
+    Remove assignments of many beneficiaries from a project.
+
+    Beneficiaries need not exist anymore, so that assignments of deleted
+    users and groups can be removed. Return number of removed assignments.
+    """
+    deleted = 0
+
+    for assignable_type, ids in _group_beneficiary_refs(beneficiaries).items():
+        count, _ = ProjectAssignment.objects.filter(
+            project=project,
+            assignable_type=assignable_type,
+            assignable_id__in=ids,
+        ).delete()
+        deleted += count
+
+    return deleted
@@ -5,6 +5,7 @@ from typing import Iterable, List, Optional, Union
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 
+from core.conditional import CATALOG_CAUSES, CATALOG_PROJECTS, catalog_invalidate
 from core.services import model_update
 from project.models import Cause
 
@@ -26,6 +27,8 @@ def cause_create(
     cause.full_clean()
     cause.save()
 
+    catalog_invalidate(CATALOG_CAUSES)
+
     return cause
 
 
@@ -54,6 +57,7 @@ def causes_resolve(causes: Iterable[Union[Cause, str]]) -> List[Cause]:
     if new_causes:
         Cause.objects.bulk_create(new_causes, batch_size=50)
         resolved.extend(new_causes)
+        catalog_invalidate(CATALOG_CAUSES)
 
     return resolved
 
@@ -69,4 +73,16 @@ def cause_update(*, cause: Cause, data) -> Cause:
 
     cause, has_updated = model_update(instance=cause, fields=non_side_effect_fields, data=data)
 
+    if has_updated:
+        # Projects show the causes they are for.
+        catalog_invalidate(CATALOG_CAUSES, CATALOG_PROJECTS)
+
     return cause
+
+
+@transaction.atomic
+def cause_delete(*, cause: Cause) -> None:
+    """Delete Cause, removing it from its projects."""
+    cause.delete()
+
+    catalog_invalidate(CATALOG_CAUSES, CATALOG_PROJECTS)
@@ -5,8 +5,11 @@ from typing import Iterable, List, Optional, Union
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 
+from core.cache import cache_invalidate
+from core.conditional import CATALOG_CAMPAIGNS, CATALOG_PROJECTS, catalog_invalidate
 from core.services import Amount, model_update, to_money
 from project.models import Cause, Project
+from project.selectors.project import PROJECT_DONATIONS_PERCENTAGE_CACHE
 
 from .cause import causes_resolve
 
@@ -42,6 +45,8 @@ def project_create(
     if causes:
         project.causes.set(causes_resolve(causes))
 
+    catalog_invalidate(CATALOG_PROJECTS)
+
     return project
 
 
@@ -66,4 +71,24 @@ def project_update(*, project: Project, data) -> Project:
         data=data,
     )
 
+    if has_updated and "target" in data:
+        project_donations_total_percentage_invalidate(project_ids=[project.pk])
+
+    # Causes are set even when no other field changed.
+    if has_updated or "causes" in data:
+        catalog_invalidate(CATALOG_PROJECTS)
+
     return project
+
+
+@transaction.atomic
+def project_delete(*, project: Project) -> None:
+    """Delete Project, along with its campaigns."""
+    project.delete()
+
+    catalog_invalidate(CATALOG_PROJECTS, CATALOG_CAMPAIGNS)
+
+
+def project_donations_total_percentage_invalidate(*, project_ids: Iterable[int]) -> None:
+    """Invalidate cached donations percentage of projects."""
+    cache_invalidate(PROJECT_DONATIONS_PERCENTAGE_CACHE, *project_ids)
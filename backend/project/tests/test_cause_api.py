@@ -2,6 +2,7 @@
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -20,6 +21,8 @@ class CauseAPITestCase(TestCase):
 
         Including admin and non-admin users, and API client.
         """
+        # Causes are created without services, which would invalidate the cached list.
+        cache.clear()
         self.client = APIClient()
 
         # Create an admin user
@@ -1,11 +1,19 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from djmoney.money import Money
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from campaign.services import campaign_create
+from donation.services import donation_create
+
 from ..models import Cause, Project
+from ..services import cause_update, project_create, project_update
 
 User = get_user_model()
 
@@ -19,6 +27,8 @@ class ProjectAPITestCase(TestCase):
 
         Include admin and non-admin users, and API client.
         """
+        # Projects are created without services, which would invalidate the cached list.
+        cache.clear()
         self.client = APIClient()
 
         # Create an admin user
@@ -173,6 +183,38 @@ class ProjectAPITestCase(TestCase):
         for project in response.data["results"]:
             self.assertEqual(project["status"], Project.StatusChoices.ACTIVE)
 
+    def test_get_projects_search(self):
+        """Test full-text search ranks name matches above description matches."""
+        Project.objects.create(
+            name="Borehole Drilling",
+            description="Safe water for schools.",
+            target=5000,
+            city="Gulu",
+            country="Uganda",
+        )
+        Project.objects.create(
+            name="Water Tanks",
+            description="Rainwater harvesting.",
+            target=5000,
+            city="Moshi",
+            country="Tanzania",
+        )
+
+        response = self.client.get(reverse("projects:list-create"), {"q": "water"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [project["name"] for project in response.data["results"]],
+            ["Water Tanks", "Clean Water Project", "Borehole Drilling"],
+        )
+
+    def test_get_projects_search_location(self):
+        """Test full-text search matches city and country."""
+        response = self.client.get(reverse("projects:list-create"), {"q": "kenya"})
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["name"], "Clean Water Project")
+
     def test_get_project_detail(self):
         """Test retrieving a single project by ID."""
         response = self.client.get(f"/api/projects/{self.project.id}/")
@@ -235,3 +277,85 @@ class ProjectAPITestCase(TestCase):
         response = self.client.delete(f"/api/projects/{self.project.id}/")
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectCatalogCacheTestCase(TestCase):
+    """Test conditional, cached responses of the public project list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("projects:list-create")
+        self.project = project_create(name="Water", target=1000, city="Gulu", country="Uganda", causes=["water"])
+
+    def test_unchanged_list_is_not_modified(self):
+        """Test a client sending back the ETag gets a 304, without any query."""
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("s-maxage=5", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_list_is_served_without_queries(self):
+        """Test the same URL is served from cache, other URLs have their own data and ETag."""
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+
+        other = self.client.get(self.url, {"name": "nothing"})
+
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(other.data["count"], 0)
+        self.assertNotEqual(other["ETag"], response["ETag"])
+
+    def test_writes_through_services_invalidate(self):
+        """Test project, cause and donation writes change the list and its ETag."""
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        campaign = campaign_create(
+            title="Wells", description="Wells", project=self.project, owner=owner, target=Money(500, "USD")
+        )
+        etags = [self.client.get(self.url)["ETag"]]
+
+        project_update(project=self.project, data={"name": "Clean Water"})
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["name"], "Clean Water")
+        etags.append(response["ETag"])
+
+        cause_update(cause=Cause.objects.get(name="water"), data={"name": "wells"})
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["causes"][0]["name"], "wells")
+        etags.append(response["ETag"])
+
+        donation_create(donor=owner, amount=Money(500, "USD"), campaign=campaign)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["donation_percentage"], 50)
+        etags.append(response["ETag"])
+
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_donations_do_not_scan_donations(self):
+        """Test the list is validated against donation summaries after a donation, not donations."""
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        campaign = campaign_create(
+            title="Wells", description="Wells", project=self.project, owner=owner, target=Money(500, "USD")
+        )
+        donation_create(donor=owner, amount=Money(100, "USD"), campaign=campaign)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data["results"][0]["donation_percentage"], 10)
+        self.assertFalse([query for query in queries if '"donation_donation"' in query["sql"]])
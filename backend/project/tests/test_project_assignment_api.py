@@ -93,9 +93,38 @@ class ProjectAssignmentAPITestCase(TestCase):
         response = self.client.get(f"/api/projects/{self.project.id}/assignments/")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["assignable_type"], "User")
-        self.assertEqual(response.data[0]["assignable_id"], self.beneficiary_user.id)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["assignable_type"], "User")
+        self.assertEqual(response.data["results"][0]["assignable_id"], self.beneficiary_user.id)
+        self.assertEqual(response.data["results"][0]["beneficiary"]["email"], "beneficiary@example.com")
+
+    def test_list_project_assignments_query_count(self):
+        """Test listing assignments fetches one page, and beneficiaries in one query per type."""
+        users = User.objects.bulk_create([User(email=f"user{i}@example.com", password="!") for i in range(60)])
+        groups = UserGroup.objects.bulk_create([UserGroup(name=f"Group {i}") for i in range(60)])
+        ProjectAssignment.objects.bulk_create(
+            [ProjectAssignment(project=self.project, assignable_type="User", assignable_id=u.id) for u in users]
+            + [ProjectAssignment(project=self.project, assignable_type="UserGroup", assignable_id=g.id) for g in groups]
+        )
+
+        # Count, page, users and groups.
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/projects/{self.project.id}/assignments/?limit=50&offset=40")
+
+        self.assertEqual(response.data["count"], 120)
+        self.assertEqual(len(response.data["results"]), 50)
+        self.assertEqual(response.data["results"][0]["beneficiary"]["email"], "user40@example.com")
+        self.assertEqual(response.data["results"][-1]["beneficiary"]["name"], "Group 29")
+
+    def test_list_project_assignments_deleted_beneficiary(self):
+        """Test assignments of deleted beneficiaries list without beneficiary."""
+        assign_beneficiary(self.project, self.beneficiary_group)
+        self.beneficiary_group.delete()
+
+        response = self.client.get(f"/api/projects/{self.project.id}/assignments/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["results"][0]["beneficiary"])
 
     def test_unassign_user_from_project(self):
         """Test unassigning a User from a Project."""
@@ -211,3 +240,64 @@ class ProjectAssignmentAPITestCase(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_assign_beneficiaries_bulk(self):
+        """Test assigning many beneficiaries to a Project at once."""
+        assign_beneficiary(self.project, self.beneficiary_user)
+        other_user = User.objects.create_user(email="other@example.com", password="testpass")
+
+        payload = {
+            "beneficiaries": [
+                {"assignable_type": "User", "assignable_id": self.beneficiary_user.id},
+                {"assignable_type": "User", "assignable_id": other_user.id},
+                {"assignable_type": "UserGroup", "assignable_id": self.beneficiary_group.id},
+            ]
+        }
+        response = self.client.post(f"/api/projects/{self.project.id}/assign/bulk/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["assigned"], 2)
+        self.assertEqual(ProjectAssignment.objects.filter(project=self.project).count(), 3)
+
+    def test_assign_beneficiaries_bulk_not_found(self):
+        """Test no beneficiary is assigned if any does not exist."""
+        payload = {
+            "beneficiaries": [
+                {"assignable_type": "User", "assignable_id": self.beneficiary_user.id},
+                {"assignable_type": "User", "assignable_id": 999999},
+            ]
+        }
+        response = self.client.post(f"/api/projects/{self.project.id}/assign/bulk/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ProjectAssignment.objects.filter(project=self.project).exists())
+
+    def test_unassign_beneficiaries_bulk(self):
+        """Test unassigning many beneficiaries from a Project at once."""
+        assign_beneficiary(self.project, self.beneficiary_user)
+        assign_beneficiary(self.project, self.beneficiary_group)
+
+        payload = {
+            "beneficiaries": [
+                {"assignable_type": "User", "assignable_id": self.beneficiary_user.id},
+                {"assignable_type": "UserGroup", "assignable_id": self.beneficiary_group.id},
+            ]
+        }
+        response = self.client.delete(
+            f"/api/projects/{self.project.id}/unassign/bulk/",
+            payload,
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["unassigned"], 2)
+        self.assertFalse(ProjectAssignment.objects.filter(project=self.project).exists())
+
+    def test_non_admin_cannot_assign_bulk(self):
+        """Test that a non-admin user cannot assign beneficiaries in bulk."""
+        self.client.force_authenticate(user=self.non_admin_user)
+
+        payload = {"beneficiaries": [{"assignable_type": "User", "assignable_id": self.beneficiary_user.id}]}
+        response = self.client.post(f"/api/projects/{self.project.id}/assign/bulk/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,11 +1,13 @@
 """Project selector tests."""
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from djmoney.money import Money
 
-from campaign.services import campaign_create
-from donation.services import donation_create
+from campaign.services import campaign_create, campaign_update
+from core.cache import cache_stats, cache_stats_reset
+from donation.services import donation_create, donation_delete
 from project.selectors import (
     cause_get,
     cause_list,
@@ -20,6 +22,7 @@ from project.services import (
     assign_beneficiary,
     cause_create,
     project_create,
+    project_update,
 )
 from user.models import UserGroup
 
@@ -28,6 +31,7 @@ User = get_user_model()
 
 class ProjectSelectorTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.cause = cause_create(name="education")
         self.project = project_create(
             name="School Build",
@@ -109,6 +113,68 @@ class ProjectSelectorTest(TestCase):
         self.assertEqual(percent, 50)
 
 
+class ProjectDonationsPercentageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache_stats_reset()
+
+        self.project = project_create(name="School Build", target=1000, city="Kigali", country="Rwanda")
+        self.other_project = project_create(name="Well", target=1000, city="Kigali", country="Rwanda")
+        self.fundraiser = User.objects.create_user(email="fundraiser@example.com", password="fundpass")
+        self.donor = User.objects.create_user(email="donor@example.com", password="donorpass")
+        self.campaign = campaign_create(
+            title="Phase 1",
+            description="Phase 1.",
+            owner=self.fundraiser,
+            project=self.project,
+            target=200,
+            end_date=None,
+        )
+
+    def percentage(self, project):
+        return project_donations_total_percentage(project_get(project.pk))
+
+    def test_percentage_is_cached(self):
+        self.assertEqual(self.percentage(self.project), 0)
+        self.assertEqual(self.percentage(self.project), 0)
+
+        stats = cache_stats()["project_donations_total_percentage"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_donation_create_invalidates(self):
+        self.assertEqual(self.percentage(self.project), 0)
+
+        donation_create(campaign=self.campaign, amount=100, donor=self.donor)
+
+        self.assertEqual(self.percentage(self.project), 10)
+
+    def test_donation_delete_invalidates(self):
+        donation = donation_create(campaign=self.campaign, amount=100, donor=self.donor)
+        self.assertEqual(self.percentage(self.project), 10)
+
+        donation_delete(donation=donation)
+
+        self.assertEqual(self.percentage(self.project), 0)
+
+    def test_campaign_reassignment_invalidates(self):
+        donation_create(campaign=self.campaign, amount=100, donor=self.donor)
+        self.assertEqual(self.percentage(self.project), 10)
+        self.assertEqual(self.percentage(self.other_project), 0)
+
+        campaign_update(campaign=self.campaign, data={"project": self.other_project})
+
+        self.assertEqual(self.percentage(self.project), 0)
+        self.assertEqual(self.percentage(self.other_project), 10)
+
+    def test_project_target_update_invalidates(self):
+        donation_create(campaign=self.campaign, amount=100, donor=self.donor)
+        self.assertEqual(self.percentage(self.project), 10)
+
+        project_update(project=self.project, data={"target": Money(500, "USD")})
+
+        self.assertEqual(self.percentage(self.project), 20)
+
+
 class CauseSelectorTest(TestCase):
     def setUp(self):
         self.cause = cause_create(name="health")
@@ -7,6 +7,7 @@ from djmoney.money import Money
 
 from project.models import ProjectAssignment
 from project.services import (
+    assign_beneficiaries_bulk,
     assign_beneficiary,
     cause_create,
     cause_update,
@@ -14,6 +15,7 @@ from project.services import (
     project_create,
     project_update,
     reassign_beneficiary,
+    unassign_beneficiaries_bulk,
     unassign_beneficiary,
 )
 from user.models import UserGroup
@@ -181,3 +183,36 @@ class ProjectAssignmentServiceTest(TestCase):
     def test_invalid_beneficiary_raises(self):
         with self.assertRaises(ValueError):
             assign_beneficiary(project=self.project, beneficiary="invalid")
+
+    def test_assign_beneficiaries_bulk(self):
+        assign_beneficiary(project=self.project, beneficiary=self.user1)
+
+        with self.assertNumQueries(5):
+            assigned = assign_beneficiaries_bulk(
+                project=self.project,
+                beneficiaries=[("User", self.user1.pk), ("User", self.user2.pk), ("UserGroup", self.group.pk)],
+            )
+
+        self.assertEqual(assigned, 2)
+        self.assertEqual(ProjectAssignment.objects.filter(project=self.project).count(), 3)
+
+    def test_assign_beneficiaries_bulk_missing_beneficiary(self):
+        with self.assertRaises(ValidationError):
+            assign_beneficiaries_bulk(
+                project=self.project,
+                beneficiaries=[("User", self.user1.pk), ("UserGroup", self.group.pk + 1000)],
+            )
+
+        self.assertFalse(ProjectAssignment.objects.exists())
+
+    def test_unassign_beneficiaries_bulk(self):
+        assign_beneficiary(project=self.project, beneficiary=self.user1)
+        assign_beneficiary(project=self.project, beneficiary=self.group)
+
+        unassigned = unassign_beneficiaries_bulk(
+            project=self.project,
+            beneficiaries=[("User", self.user1.pk), ("User", self.user2.pk), ("UserGroup", self.group.pk)],
+        )
+
+        self.assertEqual(unassigned, 2)
+        self.assertFalse(ProjectAssignment.objects.exists())
@@ -3,6 +3,7 @@
 from django.urls import include, path
 
 from .views import (
+    AssignBeneficiariesBulkAPI,
     AssignBeneficiaryAPI,
     CauseListCreateAPI,
     CauseRetrieveUpdateDestroyAPI,
@@ -10,6 +11,7 @@ from .views import (
     ProjectCampaignListAPI,
     ProjectListCreateAPI,
     ProjectRetrieveUpdateDestroyAPI,
+    UnassignBeneficiariesBulkAPI,
     UnassignBeneficiaryAPI,
 )
 
@@ -38,11 +40,21 @@ project_patterns = [
         AssignBeneficiaryAPI.as_view(),
         name="assign-beneficiary",
     ),
+    path(
+        "<int:project_id>/assign/bulk/",
+        AssignBeneficiariesBulkAPI.as_view(),
+        name="assign-beneficiaries-bulk",
+    ),
     path(
         "<int:project_id>/unassign/",
         UnassignBeneficiaryAPI.as_view(),
         name="unassign-beneficiary",
     ),
+    path(
+        "<int:project_id>/unassign/bulk/",
+        UnassignBeneficiariesBulkAPI.as_view(),
+        name="unassign-beneficiaries-bulk",
+    ),
     path(
         "<int:project_id>/campaigns/",
         ProjectCampaignListAPI.as_view(),
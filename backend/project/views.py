@@ -1,5 +1,7 @@
 """Project Views."""
 
+from typing import Dict
+
 from django.contrib.auth import get_user_model
 from django.http import Http404
 from drf_spectacular.utils import (
@@ -16,14 +18,19 @@ from rest_framework.generics import (
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.conditional import CATALOG_CAUSES, CATALOG_PROJECTS, catalog_response
 from core.pagination import LimitOffsetPagination, get_paginated_response
 from core.permissions import IsAdminUser
+from core.renditions import renditions_urls
+from donation.models import ProjectDonationSummary
+from donation.selectors import donation_summary_list
 
-from .mixins import BeneficiaryResolutionMixin, PrefetchBeneficiaryMixin
+from .mixins import BeneficiaryResolutionMixin
 from .models import Cause, Project
 from .selectors import (
     cause_get,
     cause_list,
+    project_beneficiaries_resolve,
     project_beneficiary_list,
     project_campaigns,
     project_donations_total_percentage,
@@ -31,17 +38,22 @@ from .selectors import (
     project_list,
 )
 from .serializers import (
+    BeneficiariesBulkSerializer,
     BeneficiarySerializer,
     CampaignSerializer,
     ProjectAssignmentSerializer,
 )
 from .services import (
+    assign_beneficiaries_bulk,
     assign_beneficiary,
     cause_create,
+    cause_delete,
     cause_update,
     causes_resolve,
     project_create,
+    project_delete,
     project_update,
+    unassign_beneficiaries_bulk,
     unassign_beneficiary,
 )
 
@@ -70,9 +82,14 @@ class CauseListCreateAPI(ListCreateAPIView):
     class CauseOutputSerializer(serializers.ModelSerializer):
         """Cause Output Serializer."""
 
+        icon_renditions = serializers.SerializerMethodField()
+
         class Meta:  # noqa
             model = Cause
-            fields = ["id", "name", "description", "icon"]
+            fields = ["id", "name", "description", "icon", "icon_renditions"]
+
+        def get_icon_renditions(self, cause) -> Dict[str, str]:  # noqa
+            return renditions_urls(cause, "icon")
 
     def get_serializer_class(self):
         """Dynamically choose which serializer class to use."""
@@ -86,6 +103,14 @@ class CauseListCreateAPI(ListCreateAPIView):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsAdminUser()]
 
+    def list(self, request, *args, **kwargs):  # noqa
+        return catalog_response(
+            request,
+            catalog=CATALOG_CAUSES,
+            querysets=[Cause.objects.all()],
+            data=lambda: super(CauseListCreateAPI, self).list(request, *args, **kwargs).data,
+        )
+
 
 @extend_schema_serializer(component_name="CauseRetrieveUpdateDestroyAPI")
 class CauseRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
@@ -117,6 +142,9 @@ class CauseRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
 
         return Response(data)
 
+    def perform_destroy(self, instance):  # noqa
+        cause_delete(cause=instance)
+
 
 @extend_schema_serializer(component_name="ProjectListCreateAPI")
 class ProjectListCreateAPI(ListCreateAPIView):
@@ -162,21 +190,19 @@ class ProjectListCreateAPI(ListCreateAPIView):
         def update(self, instance, validated_data):  # noqa
             causes_names = validated_data.pop("causes_names", None)
 
-            instance = project_update(
+            if causes_names:
+                validated_data["causes"] = causes_resolve(causes_names)
+
+            return project_update(
                 project=instance,
                 data=validated_data,
             )
 
-            if causes_names:
-                causes_objects = causes_resolve(causes_names)
-                instance.causes.set(causes_objects)
-
-            return instance
-
     class ProjectOutputSerializer(serializers.ModelSerializer):
         """Project Output Serializer."""
 
         donation_percentage = serializers.SerializerMethodField()
+        img_renditions = serializers.SerializerMethodField()
         causes = CauseListCreateAPI.CauseOutputSerializer(
             many=True,
             read_only=True,
@@ -188,6 +214,7 @@ class ProjectListCreateAPI(ListCreateAPIView):
                 "id",
                 "name",
                 "img",
+                "img_renditions",
                 "causes",
                 "target",
                 "campaign_limit",
@@ -201,6 +228,9 @@ class ProjectListCreateAPI(ListCreateAPIView):
         def get_donation_percentage(self, project) -> int:  # noqa
             return project_donations_total_percentage(project)
 
+        def get_img_renditions(self, project) -> Dict[str, str]:  # noqa
+            return renditions_urls(project, "img")
+
     class ProjectFilterSerializer(serializers.Serializer):  # noqa
         name = serializers.CharField(max_length=200, required=False)
         status = serializers.ChoiceField(
@@ -209,6 +239,11 @@ class ProjectListCreateAPI(ListCreateAPIView):
         )
         city = serializers.CharField(max_length=200, required=False)
         country = serializers.CharField(max_length=200, required=False)
+        q = serializers.CharField(
+            max_length=200,
+            required=False,
+            help_text="Full-text search of name, location and description, best match first.",
+        )
 
     class Pagination(LimitOffsetPagination):  # noqa
         pass
@@ -228,6 +263,7 @@ class ProjectListCreateAPI(ListCreateAPIView):
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsAdminUser()]
 
+    @extend_schema(parameters=[ProjectFilterSerializer])
     def get(self, request, *args, **kwargs):  # noqa
         filters_serializer = self.ProjectFilterSerializer(
             data=request.query_params,
@@ -236,12 +272,20 @@ class ProjectListCreateAPI(ListCreateAPIView):
 
         projects = project_list(filters=filters_serializer.validated_data)
 
-        return get_paginated_response(
-            pagination_class=self.pagination_class,
-            serializer_class=self.ProjectOutputSerializer,
-            queryset=projects,
-            request=request,
-            view=self,
+        # Projects show their causes and donations percentage, so those are part of the catalog.
+        return catalog_response(
+            request,
+            catalog=CATALOG_PROJECTS,
+            querysets=[Project.objects.all(), Cause.objects.all(), donation_summary_list(ProjectDonationSummary)],
+            data=lambda: (
+                get_paginated_response(
+                    pagination_class=self.pagination_class,
+                    serializer_class=self.ProjectOutputSerializer,
+                    queryset=projects,
+                    request=request,
+                    view=self,
+                ).data
+            ),
         )
 
 
@@ -275,6 +319,9 @@ class ProjectRetrieveUpdateDestroyAPI(RetrieveUpdateDestroyAPIView):
 
         return Response(data)
 
+    def perform_destroy(self, instance):  # noqa
+        project_delete(project=instance)
+
 
 @extend_schema_serializer(component_name="ProjectCampaignListAPI")
 class ProjectCampaignListAPI(ListAPIView):
@@ -288,14 +335,21 @@ class ProjectCampaignListAPI(ListAPIView):
 
 
 @extend_schema_serializer(component_name="ProjectBeneficiaryListAPI")
-class ProjectBeneficiaryListAPI(PrefetchBeneficiaryMixin, ListAPIView):
+class ProjectBeneficiaryListAPI(ListAPIView):
     """List all beneficiaries for a given Project."""
 
     serializer_class = BeneficiarySerializer
+    pagination_class = LimitOffsetPagination
 
     def get_queryset(self):  # noqa
         project_id = self.kwargs["project_id"]
-        return project_beneficiary_list(project_id)
+        return project_beneficiary_list(project_id).order_by("id").values("assignable_type", "assignable_id")
+
+    def list(self, request, *args, **kwargs):  # noqa
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(project_beneficiaries_resolve(page), many=True)
+
+        return self.get_paginated_response(serializer.data)
 
 
 @extend_schema_serializer(component_name="AssignBeneficiaryAPI")
@@ -368,3 +422,73 @@ class UnassignBeneficiaryAPI(BeneficiaryResolutionMixin, APIView):
             )
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_serializer(component_name="AssignBeneficiariesBulkAPI")
+class AssignBeneficiariesBulkAPI(BeneficiaryResolutionMixin, APIView):
+    """Assign many Users and UserGroups to a Project at once."""
+
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+
+    @extend_schema(
+        request=BeneficiariesBulkSerializer,
+        responses={
+            201: OpenApiResponse(description="Beneficiaries assigned successfully."),
+            200: OpenApiResponse(description="Beneficiaries already assigned."),
+            400: OpenApiResponse(description="Beneficiaries not found or validation error."),
+        },
+    )
+    def post(self, request, project_id):
+        """Create project assignments for beneficiaries, skipping existing ones."""
+        project = self.get_project(project_id)
+        serializer = BeneficiariesBulkSerializer(data=request.data)
+
+        if serializer.is_valid():
+            assigned = assign_beneficiaries_bulk(
+                project=project,
+                beneficiaries=serializer.get_beneficiary_refs(),
+            )
+
+            return Response(
+                {
+                    "message": (
+                        "Beneficiaries assigned successfully." if assigned else "Beneficiaries already assigned."
+                    ),
+                    "assigned": assigned,
+                },
+                status=(status.HTTP_201_CREATED if assigned else status.HTTP_200_OK),
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_serializer(component_name="UnassignBeneficiariesBulkAPI")
+class UnassignBeneficiariesBulkAPI(BeneficiaryResolutionMixin, APIView):
+    """Unassign many Users and UserGroups from a Project at once."""
+
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+
+    @extend_schema(
+        request=BeneficiariesBulkSerializer,
+        responses={
+            200: OpenApiResponse(description="Beneficiaries unassigned successfully."),
+            400: OpenApiResponse(description="Validation error."),
+        },
+    )
+    def delete(self, request, project_id):
+        """Delete project assignments for beneficiaries."""
+        project = self.get_project(project_id)
+        serializer = BeneficiariesBulkSerializer(data=request.data)
+
+        if serializer.is_valid():
+            unassigned = unassign_beneficiaries_bulk(
+                project=project,
+                beneficiaries=serializer.get_beneficiary_refs(),
+            )
+
+            return Response(
+                {"message": "Beneficiaries unassigned successfully.", "unassigned": unassigned},
+                status=status.HTTP_200_OK,
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self):
+        from core.renditions import renditions_register
+
+        from . import signals  # noqa
+        from .models import User, UserGroup
+
+        renditions_register(User, "img")
+        renditions_register(UserGroup, "img")
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.19 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_bankaccount_user_bank_account_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='img_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='WebP thumbnails of img, by size (see core.renditions).'),
+        ),
+        migrations.AddField(
+            model_name='usergroup',
+            name='img_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='WebP thumbnails of img, by size (see core.renditions).'),
+        ),
+    ]
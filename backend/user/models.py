@@ -43,6 +43,12 @@ class UserGroup(models.Model):
         blank=True,
         null=True,
     )
+    img_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="WebP thumbnails of img, by size (see core.renditions).",
+    )
 
     bank_account = models.OneToOneField(
         BankAccount,
@@ -72,6 +78,12 @@ class User(AbstractUser):
     is_group_leader = models.BooleanField(default=False)
 
     img = models.ImageField(upload_to="user_images/", blank=True, null=True)
+    img_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="WebP thumbnails of img, by size (see core.renditions).",
+    )
 
     bank_account = models.OneToOneField(
         BankAccount,
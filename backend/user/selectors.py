@@ -0,0 +1,35 @@
+"""User selectors."""
+
+from typing import FrozenSet
+
+from core.cache import cache_get_or_set
+
+# Invalidated whenever group memberships change, see user.signals.
+USER_ROLES_CACHE = "user_roles"
+USER_ROLES_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def user_roles(user) -> FrozenSet[str]:
+    """
+    Names of the groups of user, i.e. "admin" or "beneficiary".
+
+    Cached per user, and kept on the user instance once read, so that
+    role checks of a request cost no query in steady state.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    if "_roles" not in user.__dict__:
+        user._roles = cache_get_or_set(
+            USER_ROLES_CACHE,
+            user.pk,
+            lambda: frozenset(user.groups.values_list("name", flat=True)),
+            timeout=USER_ROLES_CACHE_TIMEOUT,
+        )
+
+    return user._roles
+
+
+def user_has_role(user, role: str) -> bool:
+    """Whether user is in the group named role."""
+    return role in user_roles(user)
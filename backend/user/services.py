@@ -0,0 +1,12 @@
+"""User services."""
+
+from typing import Iterable
+
+from core.cache import cache_invalidate
+
+from .selectors import USER_ROLES_CACHE
+
+
+def user_roles_invalidate(*, user_ids: Iterable[int]) -> None:
+    """Invalidate cached roles of users."""
+    cache_invalidate(USER_ROLES_CACHE, *user_ids)
@@ -0,0 +1,33 @@
+"""User signals."""
+
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import User
+from .services import user_roles_invalidate
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate roles of users whose groups changed, from either side of the relation."""
+    if action == "pre_clear" and reverse:
+        # pk_set is not given on clear, so read the members before they are removed.
+        user_roles_invalidate(user_ids=list(instance.user_set.values_list("pk", flat=True)))
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        user_roles_invalidate(user_ids=pk_set or [])
+    else:
+        instance.__dict__.pop("_roles", None)
+        user_roles_invalidate(user_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    """Invalidate roles of members of a group renamed or deleted."""
+    user_roles_invalidate(user_ids=list(instance.user_set.values_list("pk", flat=True)))
@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser, Group
+from django.core.cache import cache
 from django.test import TestCase
 
+from user.selectors import user_has_role, user_roles
+
 
 class UsersManagersTests(TestCase):
     def test_create_user(self):
@@ -38,3 +42,47 @@ class UsersManagersTests(TestCase):
             pass
         with self.assertRaises(ValueError):
             User.objects.create_superuser(email="super@user.com", password="foo", is_superuser=False)
+
+
+class UserRolesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email="user@example.com", password="foo")
+        self.admin_group = Group.objects.create(name="admin")
+
+    def fresh_user(self):
+        """User as loaded by a new request."""
+        return get_user_model().objects.get(pk=self.user.pk)
+
+    def test_roles_are_cached(self):
+        """Test role checks cost no query once roles are cached."""
+        self.user.groups.add(self.admin_group)
+        self.assertTrue(user_has_role(self.fresh_user(), "admin"))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_role(user, "admin"))
+            self.assertFalse(user_has_role(user, "beneficiary"))
+            self.assertEqual(user_roles(AnonymousUser()), frozenset())
+
+    def test_roles_are_invalidated_when_groups_change(self):
+        """Test adding, removing and clearing groups, from users or groups, invalidates roles."""
+        self.assertFalse(user_has_role(self.fresh_user(), "admin"))
+
+        self.admin_group.user_set.add(self.user)
+        self.assertTrue(user_has_role(self.fresh_user(), "admin"))
+
+        self.user.groups.remove(self.admin_group)
+        self.assertFalse(user_has_role(self.user, "admin"))
+
+        self.user.groups.add(self.admin_group)
+        self.assertTrue(user_has_role(self.fresh_user(), "admin"))
+
+        self.admin_group.user_set.clear()
+        self.assertFalse(user_has_role(self.fresh_user(), "admin"))
+
+        self.user.groups.add(self.admin_group)
+        self.assertTrue(user_has_role(self.fresh_user(), "admin"))
+
+        self.admin_group.delete()
+        self.assertFalse(user_has_role(self.fresh_user(), "admin"))
@@ -122,12 +122,33 @@ export const updateProject = async (
   }
 };
 
-export const fetchProjectBeneficiaries = async (projectId: number) => {
+// Beneficiaries are paginated; fetch every page, at the largest page size.
+const BENEFICIARIES_PAGE_SIZE = 50;
+
+export const fetchProjectBeneficiaries = async (
+  projectId: number
+): Promise<ProjectBeneficiary[]> => {
   try {
-    const response = await api.get<ProjectBeneficiary[]>(
-      `/projects/${projectId}/assignments/`
-    );
-    return response.data;
+    const beneficiaries: ProjectBeneficiary[] = [];
+    let count = 0;
+
+    do {
+      const response = await api.get<IPaginatedResponse<ProjectBeneficiary>>(
+        `/projects/${projectId}/assignments/`,
+        {
+          params: {
+            limit: BENEFICIARIES_PAGE_SIZE,
+            offset: beneficiaries.length,
+          },
+        }
+      );
+      count = response.data.count;
+      beneficiaries.push(...response.data.results);
+
+      if (!response.data.results.length) break;
+    } while (beneficiaries.length < count);
+
+    return beneficiaries;
   } catch (error: any) {
     console.error(
       "Failed to fetch project beneficiaries:",